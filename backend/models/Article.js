@@ -67,14 +67,21 @@ const articleSchema = new mongoose.Schema({
   image: {
     type: String,
     trim: true
+  },
+  // URL of the first stored copy when this article is a near-duplicate of it
+  duplicateOf: {
+    type: String,
+    default: null
   }
 }, {
   timestamps: true
 });
 
 // Indexes for better query performance
-articleSchema.index({ source: 1, scrapedAt: -1 });
-articleSchema.index({ 'sentiment.label': 1 });
+// Newest-first list queries, optionally by source or label (same as db_handler.py)
+articleSchema.index({ scrapedAt: -1, _id: -1 });
+articleSchema.index({ source: 1, scrapedAt: -1, _id: -1 });
+articleSchema.index({ 'sentiment.label': 1, scrapedAt: -1, _id: -1 });
 articleSchema.index({ publishedDate: -1 });
 articleSchema.index({ keywords: 1 });
 articleSchema.index({ title: 'text', description: 'text' });
@@ -0,0 +1,64 @@
+const mongoose = require('mongoose');
+
+// Per-source article/sentiment counters, one document per source. The
+// scraper $inc's them as it inserts and deletes articles (db_handler.py);
+// `python main.py --rebuild-stats` recomputes them if they drift.
+const labelCounterSchema = new mongoose.Schema({
+  count: { type: Number, default: 0 },
+  scoreSum: { type: Number, default: 0 }
+}, { _id: false });
+
+const articleStatsSchema = new mongoose.Schema({
+  _id: String, // source name
+  count: { type: Number, default: 0 },
+  scoreSum: { type: Number, default: 0 },
+  labels: {
+    type: Map,
+    of: labelCounterSchema,
+    default: {}
+  }
+}, {
+  collection: 'article_stats',
+  versionKey: false
+});
+
+const round4 = value => Math.round(value * 10000) / 10000;
+
+// Same shape as the $group on sentiment.label: [{ label, count, avgScore }]
+articleStatsSchema.statics.sentimentDistribution = async function (source) {
+  const docs = await this.find(source ? { _id: source } : {}).lean();
+  const totals = {};
+  for (const doc of docs) {
+    for (const [label, counter] of Object.entries(doc.labels || {})) {
+      const total = totals[label] || (totals[label] = { count: 0, scoreSum: 0 });
+      total.count += counter.count || 0;
+      total.scoreSum += counter.scoreSum || 0;
+    }
+  }
+  return Object.entries(totals)
+    .filter(([, total]) => total.count > 0)
+    .map(([label, total]) => ({ label, count: total.count, avgScore: round4(total.scoreSum / total.count) }));
+};
+
+// Same shape as the $group on source: [{ source, count, positive, negative, neutral, avgSentiment }]
+articleStatsSchema.statics.sourceDistribution = async function (source) {
+  const docs = await this.find(source ? { _id: source } : {}).lean();
+  return docs
+    .filter(doc => doc.count > 0)
+    .map(doc => {
+      const labels = doc.labels || {};
+      return {
+        source: doc._id,
+        count: doc.count,
+        positive: (labels.positive || {}).count || 0,
+        negative: (labels.negative || {}).count || 0,
+        neutral: (labels.neutral || {}).count || 0,
+        avgSentiment: round4(doc.scoreSum / doc.count)
+      };
+    })
+    .sort((a, b) => b.count - a.count);
+};
+
+const ArticleStats = mongoose.model('ArticleStats', articleStatsSchema);
+
+module.exports = ArticleStats;
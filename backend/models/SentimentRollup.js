@@ -0,0 +1,29 @@
+const mongoose = require('mongoose');
+
+// Hourly and daily sentiment buckets per source and label, maintained by the
+// scraper as it inserts articles (db_handler.py roll_up). Hourly buckets
+// expire through the TTL index on expiresAt; daily buckets are kept.
+const sentimentRollupSchema = new mongoose.Schema({
+  _id: String,
+  resolution: {
+    type: String,
+    enum: ['hour', 'day']
+  },
+  start: Date,
+  source: String,
+  label: String,
+  count: Number,
+  scoreSum: Number,
+  min: Number,
+  max: Number,
+  expiresAt: Date
+}, {
+  collection: 'sentiment_rollups',
+  versionKey: false
+});
+
+sentimentRollupSchema.index({ resolution: 1, start: 1, source: 1 });
+
+const SentimentRollup = mongoose.model('SentimentRollup', sentimentRollupSchema);
+
+module.exports = SentimentRollup;
@@ -1,6 +1,8 @@
 const express = require('express');
 const router = express.Router();
 const Article = require('../models/Article');
+const ArticleStats = require('../models/ArticleStats');
+const SentimentRollup = require('../models/SentimentRollup');
 
 // @route   GET /api/articles
 // @desc    Get all articles with filtering and pagination
@@ -97,6 +99,24 @@ router.get('/stats', async (req, res) => {
       if (endDate) matchQuery.scrapedAt.$lte = new Date(endDate);
     }
 
+    // Without a date range the maintained counters answer in one small read
+    if (!startDate && !endDate) {
+      const sentimentStats = await ArticleStats.sentimentDistribution(source);
+      const sourceStats = await ArticleStats.sourceDistribution(source);
+      const total = sourceStats.reduce((sum, stat) => sum + stat.count, 0);
+      return res.json({
+        success: true,
+        data: {
+          sentimentDistribution: sentimentStats.map(stat => ({
+            ...stat,
+            percentage: total > 0 ? Math.round((stat.count / total) * 100) : 0
+          })),
+          sourceDistribution: sourceStats,
+          totalArticles: total
+        }
+      });
+    }
+
     // Get total count first to check if there's any data
     const totalCount = await Article.countDocuments(matchQuery);
 
@@ -214,7 +234,8 @@ router.get('/stats/sentiment', async (req, res) => {
       if (endDate) matchQuery.scrapedAt.$lte = new Date(endDate);
     }
 
-    const stats = await Article.aggregate([
+    // Without a date range the maintained counters answer in one small read
+    const stats = (!startDate && !endDate) ? await ArticleStats.sentimentDistribution(source) : await Article.aggregate([
       { $match: matchQuery },
       {
         $group: {
@@ -261,42 +282,7 @@ router.get('/stats/sentiment', async (req, res) => {
 // @access  Public
 router.get('/stats/sources', async (req, res) => {
   try {
-    const stats = await Article.aggregate([
-      {
-        $group: {
-          _id: '$source',
-          count: { $sum: 1 },
-          positive: {
-            $sum: {
-              $cond: [{ $eq: ['$sentiment.label', 'positive'] }, 1, 0]
-            }
-          },
-          negative: {
-            $sum: {
-              $cond: [{ $eq: ['$sentiment.label', 'negative'] }, 1, 0]
-            }
-          },
-          neutral: {
-            $sum: {
-              $cond: [{ $eq: ['$sentiment.label', 'neutral'] }, 1, 0]
-            }
-          },
-          avgSentiment: { $avg: '$sentiment.score' }
-        }
-      },
-      {
-        $project: {
-          source: '$_id',
-          count: 1,
-          positive: 1,
-          negative: 1,
-          neutral: 1,
-          avgSentiment: { $round: ['$avgSentiment', 4] },
-          _id: 0
-        }
-      },
-      { $sort: { count: -1 } }
-    ]);
+    const stats = await ArticleStats.sourceDistribution();
 
     res.json({
       success: true,
@@ -321,10 +307,13 @@ router.get('/stats/trends', async (req, res) => {
     const startDate = new Date();
     startDate.setDate(startDate.getDate() - parseInt(days));
 
-    const trends = await Article.aggregate([
+    // Daily rollup buckets: a few documents per day instead of every article
+    const trends = await SentimentRollup.aggregate([
       {
         $match: {
-          scrapedAt: { $gte: startDate }
+          resolution: 'day',
+          label: { $ne: null },
+          start: { $gte: new Date(Date.UTC(startDate.getUTCFullYear(), startDate.getUTCMonth(), startDate.getUTCDate())) }
         }
       },
       {
@@ -333,12 +322,12 @@ router.get('/stats/trends', async (req, res) => {
             date: {
               $dateToString: {
                 format: '%Y-%m-%d',
-                date: '$scrapedAt'
+                date: '$start'
               }
             },
-            sentiment: '$sentiment.label'
+            sentiment: '$label'
           },
-          count: { $sum: 1 }
+          count: { $sum: '$count' }
         }
       },
       {
@@ -371,6 +360,68 @@ router.get('/stats/trends', async (req, res) => {
   }
 });
 
+// @route   GET /api/articles/stats/rollups
+// @desc    Get hourly or daily sentiment buckets for a time range
+// @access  Public
+router.get('/stats/rollups', async (req, res) => {
+  try {
+    const { resolution = 'hour', source, startDate, endDate, bySource = 'true' } = req.query;
+
+    if (!['hour', 'day'].includes(resolution)) {
+      return res.status(400).json({
+        success: false,
+        error: 'resolution must be hour or day'
+      });
+    }
+
+    const start = startDate ? new Date(startDate) : new Date(Date.now() - (resolution === 'hour' ? 1 : 30) * 86400000);
+    // label null buckets count unanalyzed articles (for the stats counters), not a sentiment
+    const query = { resolution, label: { $ne: null }, start: { $gte: start } };
+    if (endDate) query.start.$lt = new Date(endDate);
+    if (source) query.source = source;
+
+    const groupId = { start: '$start', label: '$label' };
+    if (bySource !== 'false') groupId.source = '$source';
+
+    const rollups = await SentimentRollup.aggregate([
+      { $match: query },
+      {
+        $group: {
+          _id: groupId,
+          count: { $sum: '$count' },
+          scoreSum: { $sum: '$scoreSum' },
+          min: { $min: '$min' },
+          max: { $max: '$max' }
+        }
+      },
+      {
+        $project: {
+          start: '$_id.start',
+          source: '$_id.source',
+          label: '$_id.label',
+          count: 1,
+          avgScore: { $round: [{ $divide: ['$scoreSum', '$count'] }, 4] },
+          min: 1,
+          max: 1,
+          _id: 0
+        }
+      },
+      { $sort: { start: 1, source: 1, label: 1 } }
+    ]);
+
+    res.json({
+      success: true,
+      data: rollups
+    });
+  } catch (error) {
+    console.error('Error fetching rollups:', error);
+    res.status(500).json({
+      success: false,
+      error: 'Server error while fetching sentiment rollups'
+    });
+  }
+});
+
 // @route   GET /api/articles/keywords/top
 // @desc    Get top keywords
 // @access  Public
@@ -38,6 +38,7 @@ app.get('/', (req, res) => {
       sentimentStats: '/api/articles/stats/sentiment',
       sourceStats: '/api/articles/stats/sources',
       trends: '/api/articles/stats/trends',
+      rollups: '/api/articles/stats/rollups',
       keywords: '/api/articles/keywords/top'
     }
   });
@@ -0,0 +1,118 @@
+"""Insert round trips and throughput: one insert_one per article vs. DatabaseHandler.insert_articles.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.bench_insert                          # mongomock, 2000 articles
+    python -m benchmarks.bench_insert --latency 40             # add 40 ms per round trip (a remote cluster)
+    python -m benchmarks.bench_insert --mongo-uri mongodb://localhost:27017 --articles 20000
+
+Each run inserts the same synthetic articles, a --duplicates share of them
+repeating URLs already stored, into an empty collection. Every write call
+that reaches the collection counts as one round trip and, with --latency,
+sleeps that long, so the table shows what the per-article loop costs
+against a remote cluster. Both ways must end with the same documents and
+counts.
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from db_handler import DatabaseHandler
+
+DB_NAME = 'bench_insert'
+
+
+class RoundTripCounter:
+    """Collection proxy counting (and optionally delaying) every write call"""
+
+    def __init__(self, collection, latency):
+        self._collection = collection
+        self.latency = latency
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in ('insert_one', 'insert_many', 'bulk_write'):
+            return attr
+
+        def call(*args, **kwargs):
+            self.round_trips += 1
+            if self.latency:
+                time.sleep(self.latency)
+            return attr(*args, **kwargs)
+        return call
+
+
+def make_articles(count, duplicates):
+    now = datetime.now(timezone.utc).isoformat()
+    unique = count - int(count * duplicates)
+    return [{
+        'title': f'Benchmark article {i % unique}',
+        'url': f'https://example.com/bench/{i % unique}',
+        'description': 'A synthetic article for the insert benchmark.',
+        'source': 'Benchmark',
+        'publishedDate': now,
+        'scrapedAt': now,
+        'sentiment': {'score': 0.1, 'label': 'neutral'},
+        'keywords': ['benchmark', 'insert'],
+    } for i in range(count)]
+
+
+def per_article_inserts(db, articles):
+    """The former insert_articles: one insert_one round trip per article"""
+    inserted = 0
+    for article in articles:
+        try:
+            db.articles.insert_one(article)
+            inserted += 1
+        except Exception:
+            pass
+    return inserted
+
+
+def run(db, articles, latency, insert):
+    db.articles.delete_many({})
+    db.articles = RoundTripCounter(db.articles, latency)
+    try:
+        start = time.perf_counter()
+        inserted = insert(db, [dict(a) for a in articles])
+        elapsed = time.perf_counter() - start
+        return inserted, db.articles.round_trips, elapsed, db.articles.count_documents({})
+    finally:
+        db.articles = db.articles._collection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--duplicates', type=float, default=0.1, help='share of articles repeating a stored URL')
+    parser.add_argument('--latency', type=float, default=0.0, help='ms added to every round trip')
+    parser.add_argument('--batch-size', type=int, default=None, help='insert_many batch size')
+    parser.add_argument('--mongo-uri', help='benchmark a real mongod instead of mongomock')
+    args = parser.parse_args()
+
+    if args.mongo_uri:
+        db = DatabaseHandler(mongo_uri=args.mongo_uri, db_name=DB_NAME, insert_batch_size=args.batch_size)
+    else:
+        import mongomock
+        db = DatabaseHandler(db_name=DB_NAME, client=mongomock.MongoClient(), insert_batch_size=args.batch_size)
+
+    articles = make_articles(args.articles, args.duplicates)
+    latency = args.latency / 1000
+    results = {
+        'insert_one loop': run(db, articles, latency, per_article_inserts),
+        'insert_articles': run(db, articles, latency, lambda db, batch: db.insert_articles(batch)),
+    }
+    db.articles.delete_many({})
+    db.close_connection()
+
+    print(f"\n{len(articles)} articles ({args.duplicates:.0%} duplicate URLs), "
+          f"batch size {db.insert_batch_size}, {args.latency:.0f} ms per round trip")
+    print(f"{'':17} {'inserted':>9} {'round trips':>12} {'stored':>7} {'seconds':>8} {'articles/s':>11}")
+    for name, (inserted, round_trips, elapsed, stored) in results.items():
+        print(f"{name:17} {inserted:9d} {round_trips:12d} {stored:7d} {elapsed:8.2f} "
+              f"{len(articles) / elapsed:11.0f}")
+    if len({(r[0], r[3]) for r in results.values()}) != 1:
+        print("❌ Both ways should insert the same articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Per-article sentiment latency as content grows: whole-document vs. paragraph mode.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.bench_long_articles                       # 100 to 50000 word bodies
+    python -m benchmarks.bench_long_articles --sizes 500 5000 --budget 800 --repeat 5
+    python -m benchmarks.bench_long_articles --corpus CORPUS_DIR   # also compare labels on recorded articles
+
+Each synthetic article has a headline, a lead and a body of paragraphs of
+sentences built from benchmarks.bench_sentiment.WORDS. The table shows the
+best-of-repeat time of analyze_article per article in 'document' mode (the
+whole text scored at once) and in 'paragraphs' mode (token budget); the
+paragraph column should stay flat once the body is longer than the budget.
+With --corpus, both modes are run on the recorded articles and the share of
+matching labels is printed.
+"""
+import argparse
+import random
+import time
+from sentiment_analyzer import SentimentAnalyzer
+from benchmarks.bench_sentiment import WORDS, corpus_articles
+
+
+def long_article(words, rng):
+    def sentence(n):
+        return ' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + '.'
+
+    paragraphs, count = [], 0
+    while count < words:
+        paragraph = ' '.join(sentence(rng.randint(8, 25)) for _ in range(rng.randint(2, 6)))
+        paragraphs.append(paragraph)
+        count += len(paragraph.split())
+    return {'title': sentence(10), 'description': sentence(25), 'content': '\n\n'.join(paragraphs)}
+
+
+def best_time(analyzer, article, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analyzer.analyze_article(dict(article))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 400, 1000, 3000, 10000, 50000],
+                        help='body lengths in words')
+    parser.add_argument('--budget', type=int, default=400, help='paragraph mode token budget')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--corpus', help='harness corpus directory to compare labels on')
+    args = parser.parse_args()
+
+    document = SentimentAnalyzer(workers=1, use_cache=False, mode='document', keyword_ranking='frequency')
+    paragraphs = SentimentAnalyzer(workers=1, use_cache=False, mode='paragraphs', token_budget=args.budget,
+                                   keyword_ranking='frequency')
+    document.warm_up()
+    paragraphs.warm_up()
+    rng = random.Random(0)
+
+    print(f"{'words':>7} {'document ms':>12} {'paragraphs ms':>14} {'scored':>7}  label")
+    for size in args.sizes:
+        article = long_article(size, rng)
+        doc_time = best_time(document, article, args.repeat)
+        para_time = best_time(paragraphs, article, args.repeat)
+        whole = document.analyze_article(dict(article))['sentiment']
+        budgeted = paragraphs.analyze_article(dict(article))['sentiment']
+        print(f"{size:7d} {doc_time * 1000:12.1f} {para_time * 1000:14.1f} {budgeted['tokens']:7d}  "
+              f"{whole['label']} / {budgeted['label']}")
+
+    if args.corpus:
+        articles = corpus_articles(args.corpus)
+        same = sum(document.analyze_article(dict(a))['sentiment']['label']
+                   == paragraphs.analyze_article(dict(a))['sentiment']['label'] for a in articles)
+        print(f"Corpus: {same}/{len(articles)} articles get the same label in both modes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Parse-time and memory benchmark: full html.parser tree vs. the strained fast path.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.bench_parsing                 # synthetic BBC/NDTV pages
+    python -m benchmarks.bench_parsing PAGES_DIR       # saved pages
+    python -m benchmarks.bench_parsing --repeat 20 PAGES_DIR
+
+Saved pages are picked up by file name: bbc-listing*.html, bbc-article*.html,
+ndtv-listing*.html and ndtv-article*.html. Every page is parsed both ways and
+the extracted fields are compared, so a selector/strainer mismatch shows up
+as a FIELD MISMATCH line rather than as a silent speed-up.
+"""
+import os
+os.environ.setdefault('SCRAPER_HTTP_CACHE', '0')
+
+import argparse
+import glob
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+from scrapers import bbc_scraper, ndtv_scraper
+from scrapers.parsing import make_soup, HTML_PARSER
+
+VOLATILE_FIELDS = ('publishedDate', 'scrapedAt')
+
+
+def _listing_fields(scraper, selector, soup):
+    items = []
+    for element in soup.select(selector):
+        data = scraper.extract_article_data(element)
+        if data:
+            items.append({k: v for k, v in data.items() if k not in VOLATILE_FIELDS})
+    return items
+
+
+def page_kinds():
+    """Map page kind -> (strainer, extractor(soup) returning comparable fields)"""
+    bbc = bbc_scraper.BBCScraper()
+    ndtv = ndtv_scraper.NDTVScraper()
+    return {
+        'bbc-listing': (
+            bbc_scraper.LISTING_STRAINER,
+            lambda soup: _listing_fields(bbc, bbc_scraper.LISTING_SELECTOR, soup),
+        ),
+        'bbc-article': (bbc_scraper.ARTICLE_STRAINER, bbc.extract_paragraphs),
+        'ndtv-listing': (
+            ndtv_scraper.LISTING_STRAINER,
+            lambda soup: _listing_fields(ndtv, ndtv_scraper.LISTING_SELECTOR, soup),
+        ),
+        'ndtv-article': (ndtv_scraper.ARTICLE_STRAINER, ndtv.extract_full_article),
+    }
+
+
+def synthetic_pages():
+    """Pages shaped like the real ones: heavy head/scripts/navigation around the extracted regions"""
+    script = '<script>window.__DATA__ = {%s};</script>' % ','.join(f'"k{i}": "{"v" * 80}"' for i in range(1500))
+    nav = '<nav>' + ''.join(f'<a href="/section/{i}"><span>Section {i}</span></a>' for i in range(200)) + '</nav>'
+    para = 'The minister said the plan would be reviewed by the committee before the vote next week. '
+    footer = '<footer>' + ''.join(f'<div class="ftr"><a href="/f{i}">Link {i}</a></div>' for i in range(150)) + '</footer>'
+
+    def page(body, head=''):
+        return f'<html><head>{head}{script}<style>{"." * 20000}</style></head><body>{nav}{body}{footer}</body></html>'
+
+    bbc_cards = ''.join(
+        f'<div data-testid="dundee-card"><a href="/news/articles/c{i}"><img src="//ichef.bbci.co.uk/{i}.jpg">'
+        f'<h2 data-testid="card-headline">Headline {i}</h2>'
+        f'<p data-testid="card-description">Summary for story {i}</p></a><time datetime="2024-01-01T00:00:00Z"></time></div>'
+        for i in range(40)
+    )
+    bbc_article = '<main><article>' + ''.join(
+        f'<div data-component="text-block"><p>{para * 3}</p></div><aside><p>Related {i}</p></aside>' for i in range(30)
+    ) + '</article></main>'
+    ndtv_cards = '<ul>' + ''.join(
+        f'<li class="NwsLstPg-a-li"><div class="NwsLstPg-a"><a class="NwsLstPg_img" href="/india-news/story-{i}">'
+        f'<img class="NwsLstPg_img-full" src="https://c.ndtvimg.com/{i}.jpg"></a>'
+        f'<h2 class="NwsLstPg_ttl"><a class="NwsLstPg_ttl-lnk" href="/india-news/story-{i}">Story {i}</a></h2>'
+        f'<p class="NwsLstPg_txt">Summary {i}</p></div></li>'
+        for i in range(40)
+    ) + '</ul>'
+    ndtv_article = (
+        '<div class="sp-hd"><span class="pst-by_lnk"><a class="auth-nm">Press Trust of India</a></span></div>'
+        '<div id="TxSS_selct" class="Art-exp_cn">' + ''.join(f'<p>{para * 2}</p>' for i in range(40)) + '</div>'
+    )
+    ndtv_head = (
+        '<meta name="author" content="Press Trust of India">'
+        '<meta property="article:published_time" content="2024-01-01T10:00:00+05:30">'
+    )
+    return {
+        'bbc-listing': [('synthetic', page(bbc_cards))],
+        'bbc-article': [('synthetic', page(bbc_article))],
+        'ndtv-listing': [('synthetic', page(ndtv_cards))],
+        'ndtv-article': [('synthetic', page(ndtv_article, ndtv_head))],
+    }
+
+
+def saved_pages(directory):
+    pages = {}
+    for kind in ('bbc-listing', 'bbc-article', 'ndtv-listing', 'ndtv-article'):
+        for path in sorted(glob.glob(os.path.join(directory, f'{kind}*.html'))):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.setdefault(kind, []).append((os.path.basename(path), f.read()))
+    return pages
+
+
+def measure(parse, html, repeat):
+    """Return (best seconds, peak traced bytes, soup) for parse(html)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    soup = parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, soup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages_dir', nargs='?', help='directory of saved pages (default: synthetic pages)')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    pages = saved_pages(args.pages_dir) if args.pages_dir else synthetic_pages()
+    kinds = page_kinds()
+
+    print(f"Baseline: BeautifulSoup(html.parser), full tree | Fast: {HTML_PARSER} + SoupStrainer")
+    print(f"{'page':<34} {'KB':>7} {'base ms':>9} {'fast ms':>9} {'speedup':>8} {'base MB':>8} {'fast MB':>8}  fields")
+    for kind, entries in pages.items():
+        strainer, extract = kinds[kind]
+        for name, html in entries:
+            base_t, base_mem, base_soup = measure(lambda h: BeautifulSoup(h, 'html.parser'), html, args.repeat)
+            fast_t, fast_mem, fast_soup = measure(lambda h: make_soup(h, strainer), html, args.repeat)
+            same = extract(base_soup) == extract(fast_soup)
+            print(f"{(kind + ':' + name)[:34]:<34} {len(html) / 1024:7.0f} {base_t * 1000:9.1f} {fast_t * 1000:9.1f} "
+                  f"{base_t / fast_t:7.1f}x {base_mem / 2**20:8.1f} {fast_mem / 2**20:8.1f}  "
+                  f"{'same' if same else 'FIELD MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
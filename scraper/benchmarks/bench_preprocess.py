@@ -0,0 +1,126 @@
+"""Preprocessing benchmark: per-article cost of the old clean/tokenize/score path vs. the shared one.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.bench_preprocess                      # synthetic articles of growing length
+    python -m benchmarks.bench_preprocess --corpus CORPUS_DIR  # articles from a harness corpus
+    python -m benchmarks.bench_preprocess --sizes 200 2000 10000 --repeat 5
+
+The old path is reproduced here as it was: three re.sub passes per clean_text
+call, clean_text run twice, NLTK word_tokenize for keywords and VADER's own
+tokenizer for scoring. The new path is SentimentAnalyzer.analyze_article,
+which cleans and tokenizes once. Before timing, both paths are run on a set of
+edge-case texts and on every benchmark article; any difference in scores or
+keywords is printed as a MISMATCH line and makes the script exit non-zero.
+The edge cases, with their expected results pinned, are also checked by
+tests/test_preprocessing.py.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+from nltk.tokenize import word_tokenize
+from sentiment_analyzer import SentimentAnalyzer
+from benchmarks.bench_sentiment import WORDS, corpus_articles
+
+EDGE_CASES = [
+    "This is wonderful news! Amazing breakthrough in technology.",
+    "Terrible disaster strikes the city, causing massive damage.",
+    "The meeting was held yesterday to discuss the budget.",
+    "We cannot accept this. They're gonna win, gotta see it, wanna go? Gimme a break, lemme think.",
+    "Read more at https://www.bbc.com/news/articles/c123?at=rss or www.ndtv.com/latest...http://x.y",
+    "It was kind of good, kind of bad; VERY good, very GOOD, extremely bad but not terrible.",
+    "good good good bad good bad bad not good never bad",
+    "Ünïcödé café naïve résumé — “quoted” ‘text’ İstanbul straße ﬁnance",
+    "snake_case words_with_underscores and 123 numbers 4th 2024-01-01 $100 50%",
+    "The minister said: 'no comment'. Without doubt, the plan isn't perfect... but it works!!!",
+    "",
+    "   ",
+    "a b c d e f",
+]
+
+
+def legacy_clean_text(text):
+    if not text:
+        return ""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def legacy_analyze(analyzer, text):
+    """(scores, keywords) exactly as analyze_article computed them before the shared preprocessing"""
+    scores = analyzer.sia.polarity_scores(legacy_clean_text(text)) if text else None
+    try:
+        tokens = word_tokenize(legacy_clean_text(text).lower())
+        keywords = [w for w in tokens if w not in analyzer.stop_words and len(w) > 3 and w.isalpha()]
+        keywords = [w for w, _ in Counter(keywords).most_common(5)]
+    except Exception:
+        keywords = []
+    return scores, keywords
+
+
+def new_analyze(analyzer, text):
+    prepared = analyzer.prepare_text(text)
+    scores = analyzer.polarity_scores(prepared) if text else None
+    return scores, analyzer.extract_keywords(text, prepared=prepared)
+
+
+def synthetic_text(words, rng):
+    sentences = []
+    while words > 0:
+        n = min(words, rng.randint(8, 25))
+        sentences.append(' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + rng.choice('.!?,;'))
+        words -= n
+    return ' '.join(sentences)
+
+
+def check_parity(analyzer, texts):
+    mismatches = 0
+    for text in texts:
+        old, new = legacy_analyze(analyzer, text), new_analyze(analyzer, text)
+        if old != new:
+            mismatches += 1
+            print(f"MISMATCH on {text[:60]!r}:\n   old {old}\n   new {new}")
+    return mismatches
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='harness corpus directory to take articles from')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000, 20000], help='content length in words')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(workers=1, use_cache=False, keyword_ranking='frequency')
+    rng = random.Random(0)
+    if args.corpus:
+        texts = [(f"corpus #{i}", analyzer.text_to_analyze(a)) for i, a in enumerate(corpus_articles(args.corpus))]
+    else:
+        texts = [(f"{size} words", synthetic_text(size, rng)) for size in args.sizes]
+
+    mismatches = check_parity(analyzer, EDGE_CASES + [text for _, text in texts])
+    print(f"Parity: {len(EDGE_CASES) + len(texts)} texts, {mismatches} mismatches")
+
+    print(f"{'article':<14} {'words':>7} {'old ms':>9} {'new ms':>9} {'saved ms':>9} {'speedup':>8}")
+    for name, text in texts:
+        old = best_time(lambda: legacy_analyze(analyzer, text), args.repeat)
+        new = best_time(lambda: new_analyze(analyzer, text), args.repeat)
+        print(f"{name[:14]:<14} {len(text.split()):7d} {old * 1000:9.1f} {new * 1000:9.1f} "
+              f"{(old - new) * 1000:9.1f} {old / new:7.1f}x")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
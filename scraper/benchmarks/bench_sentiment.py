@@ -0,0 +1,115 @@
+"""Sentiment throughput benchmark: SentimentAnalyzer.batch_analyze across worker counts.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.bench_sentiment                       # 200 synthetic articles, 1/2/4 workers
+    python -m benchmarks.bench_sentiment --articles 500 --workers 1 2 4 8 --chunk-size 8
+    python -m benchmarks.bench_sentiment --corpus CORPUS_DIR   # articles from a harness corpus
+
+Pool start-up (spawning workers and loading the lexicon) is timed separately
+from scoring. Every run's sentiment and keywords are compared with the
+single-process run, so a parallel mode that reorders or drops results shows
+up as a MISMATCH line.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+from sentiment_analyzer import SentimentAnalyzer
+
+WORDS = (
+    'government announced plan budget growth crisis attack peace rescue victory loss '
+    'minister economy market inflation record celebrate protest disaster breakthrough '
+    'hospital court election storm flood injured praised criticised hope fear'
+).split()
+
+
+def synthetic_articles(count, seed=0):
+    rng = random.Random(seed)
+
+    def sentence(n):
+        return ' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + '.'
+
+    return [{
+        'title': sentence(10),
+        'description': sentence(25),
+        'content': ' '.join(sentence(20) for _ in range(rng.randint(10, 40))),
+    } for _ in range(count)]
+
+
+def corpus_articles(corpus_dir):
+    """Title/description/content of every article page in a harness corpus"""
+    from benchmarks.harness import load_manifest, PAGES_DIR
+    from scrapers.parsing import make_soup
+    from scrapers import bbc_scraper, ndtv_scraper
+    bbc = bbc_scraper.BBCScraper()
+    ndtv = ndtv_scraper.NDTVScraper()
+    extractors = {
+        'bbc': (bbc_scraper.ARTICLE_STRAINER, lambda soup: '\n\n'.join(bbc.extract_paragraphs(soup))),
+        'ndtv': (ndtv_scraper.ARTICLE_STRAINER, lambda soup: ndtv.extract_full_article(soup).get('content', '')),
+    }
+
+    articles = []
+    for entry in load_manifest(corpus_dir).values():
+        name = entry.get('file', '')
+        source, _, rest = name.partition('-')
+        if not rest.startswith('article-') or source not in extractors:
+            continue
+        with open(os.path.join(corpus_dir, PAGES_DIR, name), encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        strainer, extract = extractors[source]
+        soup = make_soup(html, strainer)
+        title = soup.find('h1')
+        articles.append({'title': title.get_text(strip=True) if title else name, 'description': '',
+                         'content': extract(soup) or ''})
+    return articles
+
+
+def run(articles, workers, chunk_size):
+    """Return (start-up seconds, scoring seconds, results) for one worker count"""
+    batch = [dict(article) for article in articles]
+    analyzer = SentimentAnalyzer(workers=workers, chunk_size=chunk_size, use_cache=False,
+                                 keyword_ranking='frequency')
+    try:
+        start = time.perf_counter()
+        if workers > 1:
+            # Start the pool and let every worker load its lexicon before timing
+            list(analyzer._get_pool().map(abs, range(workers * 4)))
+        startup = time.perf_counter() - start
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            analyzed = analyzer.batch_analyze(batch)
+            elapsed = time.perf_counter() - start
+    finally:
+        analyzer.close()
+    return startup, elapsed, [(a.get('sentiment'), a.get('keywords')) for a in analyzed]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=200, help='number of synthetic articles')
+    parser.add_argument('--corpus', help='harness corpus directory to take articles from')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--chunk-size', type=int, default=4)
+    args = parser.parse_args()
+
+    articles = corpus_articles(args.corpus) if args.corpus else synthetic_articles(args.articles)
+    words = sum(len(' '.join(a.values()).split()) for a in articles)
+    print(f"{len(articles)} articles, {words / max(len(articles), 1):.0f} words each, "
+          f"chunk size {args.chunk_size}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'startup s':>10} {'score s':>8} {'articles/s':>11} {'speedup':>8}  results")
+
+    baseline = None
+    for workers in args.workers:
+        startup, elapsed, results = run(articles, workers, args.chunk_size)
+        if baseline is None:
+            baseline = (elapsed, results)
+        same = results == baseline[1]
+        print(f"{workers:7d} {startup:10.2f} {elapsed:8.2f} {len(articles) / elapsed:11.1f} "
+              f"{baseline[0] / elapsed:7.1f}x  {'same' if same else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Vectorized VADER backend: conformance with NLTK and batch throughput.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.bench_vader                        # conformance + 2000 synthetic articles
+    python -m benchmarks.bench_vader --docs 500 --words 800 --tolerance 1e-4
+    python -m benchmarks.bench_vader --corpus CORPUS_DIR    # also check/measure recorded articles
+
+Conformance runs NLTK's SentimentIntensityAnalyzer.polarity_scores and
+BatchVaderScorer.score on the same cleaned texts. The texts are the
+preprocessing edge cases plus randomly generated documents that mix lexicon
+words with boosters, negations, "never so", "least", "but", "kind of", idioms,
+ALL CAPS and repeated words. Any compound/pos/neg/neu difference above the
+tolerance is printed, and the script exits non-zero. A fixed set of rule
+cases with pinned scores is checked by tests/test_vader_batch.py.
+"""
+import argparse
+import random
+import sys
+import time
+from sentiment_analyzer import SentimentAnalyzer
+from vader_batch import BatchVaderScorer
+from benchmarks.bench_preprocess import EDGE_CASES, synthetic_text
+from benchmarks.bench_sentiment import corpus_articles
+
+KEYS = ('compound', 'pos', 'neg', 'neu')
+RULE_WORDS = (
+    'not never no nor without very extremely slightly barely so this least at but kind of sort '
+    'the shit bomb bad ass yeah right kiss death to die for cut mustard hand mouth upper break leg '
+    'just enough isnt dont'
+).split()
+
+
+def rule_heavy_texts(analyzer, count, rng):
+    lexicon = list(analyzer.sia.lexicon)
+    vocabulary = [w for w in lexicon if w.isalpha()][:4000]
+    texts = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(0, 120)):
+            roll = rng.random()
+            word = rng.choice(vocabulary) if roll < 0.45 else rng.choice(RULE_WORDS) if roll < 0.8 else 'meeting'
+            if rng.random() < 0.1:
+                word = word.upper()
+            elif rng.random() < 0.05:
+                word = word.capitalize()
+            words.append(word)
+        texts.append(' '.join(words))
+    return texts
+
+
+def check(analyzer, scorer, texts, tolerance):
+    prepared = [analyzer.prepare_text(text) for text in texts]
+    batch = scorer.score([[t for t in p.tokens if len(t) > 1] for p in prepared], [p.cleaned for p in prepared])
+    worst, failures = 0.0, 0
+    for text, p, got in zip(texts, prepared, batch):
+        expected = analyzer.sia.polarity_scores(p.cleaned)
+        diff = max(abs(expected[key] - got[key]) for key in KEYS)
+        worst = max(worst, diff)
+        if diff > tolerance:
+            failures += 1
+            if failures <= 10:
+                print(f"MISMATCH on {p.cleaned[:70]!r}\n   nltk  {expected}\n   numpy {got}")
+    return worst, failures
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='harness corpus directory to take articles from')
+    parser.add_argument('--docs', type=int, default=2000, help='synthetic articles for the throughput run')
+    parser.add_argument('--words', type=int, default=600, help='words per synthetic article')
+    parser.add_argument('--fuzz', type=int, default=3000, help='random rule-heavy documents to check')
+    parser.add_argument('--tolerance', type=float, default=1e-3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(workers=1, use_cache=False)
+    scorer = BatchVaderScorer(analyzer.sia)
+    rng = random.Random(0)
+
+    articles = [synthetic_text(args.words, rng) for _ in range(args.docs)]
+    if args.corpus:
+        articles += [analyzer.text_to_analyze(a) for a in corpus_articles(args.corpus)]
+
+    texts = EDGE_CASES + rule_heavy_texts(analyzer, args.fuzz, rng) + articles
+    worst, failures = check(analyzer, scorer, texts, args.tolerance)
+    print(f"Conformance: {len(texts)} documents, max difference {worst:.2g}, "
+          f"{failures} above tolerance {args.tolerance:g}")
+
+    prepared = [analyzer.prepare_text(text) for text in articles]
+    documents = [[t for t in p.tokens if len(t) > 1] for p in prepared]
+    cleaned = [p.cleaned for p in prepared]
+    nltk_time = best_time(lambda: [analyzer.sia.polarity_scores(text) for text in cleaned], args.repeat)
+    tokens_time = best_time(lambda: [analyzer.polarity_scores(p) for p in prepared], args.repeat)
+    batch_time = best_time(lambda: scorer.score(documents, cleaned), args.repeat)
+    print(f"Throughput on {len(articles)} articles (~{args.words} words):")
+    for name, elapsed in (('nltk polarity_scores', nltk_time), ('pre-tokenized nltk', tokens_time),
+                          ('numpy batch', batch_time)):
+        print(f"   {name:<22} {elapsed:7.2f}s  {len(articles) / elapsed:8.0f} articles/s  "
+              f"{nltk_time / elapsed:5.1f}x")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Record/replay harness: benchmark the full pipeline without touching the live sites.
+
+Usage (from the scraper/ directory):
+    python -m benchmarks.harness record CORPUS_DIR [--max-articles 15]
+    python -m benchmarks.harness serve CORPUS_DIR [--port 8799] [--latency 50] [--jitter 20] [--error-rate 0.05]
+    python -m benchmarks.harness replay CORPUS_DIR [--latency 50] [--error-rate 0.05] [--mock-db | --mongo-uri URI]
+
+record fetches every source's feed/listing and articles through the shared
+HttpClient (cache disabled) and saves each response body to
+CORPUS_DIR/pages/{source}-{feed|listing|article}-{hash}.{xml|html}, with
+CORPUS_DIR/manifest.json mapping each URL to its file, status and
+content type. Pages only reachable through the Selenium fallbacks are not
+recorded; replay runs with the browser pool disabled, so those fallbacks fail
+fast instead of reaching the live site. The saved listing/article pages can
+also be fed to benchmarks.bench_parsing (point it at CORPUS_DIR/pages).
+
+serve starts the stand-in server on its own; replay starts it in-process,
+points the HttpClient at it (SCRAPER_REPLAY_URL) and runs one
+NewsAggregator cycle against a scratch database (emptied first unless
+--keep-db), then reports articles/second, per-stage times and peak RSS.
+Latency (ms, +- jitter) and error injection (a random 503 for that fraction of
+requests) are applied per request; --seed makes the injected errors repeatable.
+"""
+import os
+# Record full bodies, and never let replay revalidate against a cache filled by live runs
+os.environ.setdefault('SCRAPER_HTTP_CACHE', '0')
+# Replays score every article instead of reusing results from earlier runs
+os.environ.setdefault('SENTIMENT_CACHE', '0')
+# ... and start from empty keyword document frequencies, kept in memory only
+os.environ.setdefault('KEYWORD_DF_PATH', '')
+# ... and an empty near-duplicate index, so every replay links the same copies
+os.environ.setdefault('NEAR_DUP_INDEX_PATH', ':memory:')
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+MANIFEST = 'manifest.json'
+PAGES_DIR = 'pages'
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if it can't be read)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2**20
+    except ImportError:
+        return None
+
+
+def load_manifest(corpus_dir):
+    with open(os.path.join(corpus_dir, MANIFEST), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Recorder:
+    def __init__(self, corpus_dir):
+        """Saves every response of the shared session into corpus_dir"""
+        self.corpus_dir = corpus_dir
+        self.source = None
+        self.kinds = {}
+        self.manifest = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(corpus_dir, PAGES_DIR), exist_ok=True)
+
+    def use_source(self, source_name, scraper):
+        """Name pages after source_name; its feed and listing URLs get their own kinds"""
+        self.source = source_name
+        self.kinds = {scraper.feed_url: 'feed', scraper.base_url: 'listing'}
+
+    def hook(self, response, *args, **kwargs):
+        url = response.request.url
+        if response.is_redirect:
+            # Replay resolves the redirect itself and serves the final page
+            entry = {'redirect': urljoin(url, response.headers['Location'])}
+            if url in self.kinds:
+                self.kinds[entry['redirect']] = self.kinds[url]
+        else:
+            kind = self.kinds.get(url, 'article')
+            content_type = response.headers.get('Content-Type', 'text/html')
+            ext = 'xml' if kind == 'feed' or 'xml' in content_type else 'html'
+            name = f"{self.source}-{kind}-{hashlib.sha1(url.encode()).hexdigest()[:12]}.{ext}"
+            with open(os.path.join(self.corpus_dir, PAGES_DIR, name), 'wb') as f:
+                f.write(response.content)
+            entry = {'file': name, 'status': response.status_code, 'content_type': content_type}
+        with self._lock:
+            self.manifest[url] = entry
+        return response
+
+    def save(self):
+        path = os.path.join(self.corpus_dir, MANIFEST)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        return path
+
+
+def record(args):
+    from scrapers.bbc_scraper import BBCScraper
+    from scrapers.ndtv_scraper import NDTVScraper
+    from scrapers.http_client import get_http_client
+    from scrapers.browser_pool import get_browser_pool
+
+    http = get_http_client()
+    recorder = Recorder(args.corpus_dir)
+    http.session.hooks['response'].append(recorder.hook)
+    try:
+        # One source at a time, so every response is named after the right source
+        for source_name, ScraperClass in (('bbc', BBCScraper), ('ndtv', NDTVScraper)):
+            scraper = ScraperClass()
+            recorder.use_source(source_name, scraper)
+            print(f"\n📼 Recording {source_name.upper()}...")
+            articles = scraper.scrape_articles(max_articles=args.max_articles)
+            print(f"✅ Got {len(articles)} articles from {source_name}")
+    finally:
+        http.session.hooks['response'].remove(recorder.hook)
+        get_browser_pool().close()
+    path = recorder.save()
+    print(f"\n💾 Recorded {len(recorder.manifest)} responses to {path}")
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, corpus_dir, port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        """Local HTTP/1.1 stand-in serving a recorded corpus.
+
+        A request for /https/host/path?q is answered with the page recorded
+        for https://host/path?q, after latency +- jitter seconds; error_rate
+        of the requests get a 503 instead. Unknown URLs get a 404.
+        """
+        super().__init__(('127.0.0.1', port), _ReplayHandler)
+        self.corpus_dir = corpus_dir
+        self.manifest = load_manifest(corpus_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'served': 0, 'errors': 0, 'missing': 0}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def resolve(self, url):
+        """Follow recorded redirects to the entry holding a body"""
+        entry = self.manifest.get(url)
+        for _ in range(10):
+            if not entry or 'redirect' not in entry:
+                break
+            entry = self.manifest.get(entry['redirect'])
+        return entry if entry and 'file' in entry else None
+
+    def draw(self):
+        """Return (delay in seconds, inject an error?) for one request"""
+        with self._lock:
+            delay = max(self.latency + self.random.uniform(-self.jitter, self.jitter), 0.0)
+            return delay, self.random.random() < self.error_rate
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name='replay-server', daemon=True)
+        thread.start()
+        return thread
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        scheme, _, rest = self.path.lstrip('/').partition('/')
+        entry = server.resolve(f"{scheme}://{rest}")
+
+        delay, fail = server.draw()
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            server.count('errors')
+            self._send(503, b'injected error', 'text/plain')
+        elif entry is None:
+            server.count('missing')
+            self._send(404, b'not recorded', 'text/plain')
+        else:
+            server.count('served')
+            with open(os.path.join(server.corpus_dir, PAGES_DIR, entry['file']), 'rb') as f:
+                self._send(entry['status'], f.read(), entry['content_type'])
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(args):
+    return ReplayServer(args.corpus_dir, port=args.port, latency=args.latency / 1000,
+                        jitter=args.jitter / 1000, error_rate=args.error_rate, seed=args.seed)
+
+
+def serve(args):
+    server = make_server(args)
+    print(f"📼 Replaying {len(server.manifest)} recorded URLs on {server.url} "
+          f"(export SCRAPER_REPLAY_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def bench_database(args):
+    from db_handler import DatabaseHandler
+    if args.mock_db:
+        import mongomock
+        return DatabaseHandler(db_name=args.db_name, client=mongomock.MongoClient())
+    return DatabaseHandler(mongo_uri=args.mongo_uri, db_name=args.db_name)
+
+
+def clear_database(db):
+    """Empty the articles and everything derived from them: the stats
+    counters, the rollups and the counters' expiry marker (kept with the rollups)"""
+    db.articles.delete_many({})
+    db.stats.delete_many({})
+    db.rollups.delete_many({})
+
+
+def replay(args):
+    server = make_server(args)
+    server.start()
+    os.environ['SCRAPER_REPLAY_URL'] = server.url
+    os.environ['SCRAPER_BROWSER_DISABLED'] = '1'
+
+    from main import NewsAggregator
+    from scrapers.http_client import get_http_client
+    from scrapers.browser_pool import get_browser_pool
+
+    db = bench_database(args)
+    if not args.keep_db:
+        clear_database(db)
+    aggregator = NewsAggregator(db=db)
+    aggregator.pipeline.max_articles = args.max_articles
+
+    get_http_client().reset_stats()
+    get_browser_pool().reset_stats()
+    aggregator.sentiment_analyzer.reset_stats()
+    try:
+        aggregator.pipeline.run()
+        get_http_client().report()
+        aggregator.sentiment_analyzer.report()
+    finally:
+        get_http_client().close()
+        aggregator.sentiment_analyzer.close()
+        server.shutdown()
+        server.server_close()
+
+    run = aggregator.pipeline.last_run
+    rate = run['scraped'] / run['elapsed'] if run['elapsed'] else 0.0
+    rss = peak_rss_mb()
+    print("\n" + "="*60)
+    print("📈 REPLAY BENCHMARK")
+    print("="*60)
+    print(f"   Corpus: {len(server.manifest)} URLs, latency {args.latency:.0f}±{args.jitter:.0f} ms, "
+          f"error rate {args.error_rate:.0%}")
+    print(f"   Server: {server.stats['served']} served, {server.stats['errors']} injected errors, "
+          f"{server.stats['missing']} not recorded")
+    print(f"   Articles: {run['scraped']} scraped, {run['inserted']} inserted in {run['elapsed']:.2f}s "
+          f"({rate:.1f} articles/s)")
+    for stage in run['stages'].values():
+        print(f"   {stage.summary()}")
+    print(f"   Peak RSS: {rss:.0f} MB" if rss is not None else "   Peak RSS: unavailable")
+    print("="*60)
+    if not args.keep_db:
+        clear_database(db)
+    db.close_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rec = commands.add_parser('record', help='capture live feeds, listings and articles')
+    rec.add_argument('corpus_dir')
+    rec.add_argument('--max-articles', type=int, default=15)
+
+    for name, help_text in (('serve', 'only run the stand-in server'),
+                            ('replay', 'run the pipeline against the stand-in server')):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument('corpus_dir')
+        sub.add_argument('--port', type=int, default=8799 if name == 'serve' else 0)
+        sub.add_argument('--latency', type=float, default=0.0, help='per-request delay in ms')
+        sub.add_argument('--jitter', type=float, default=0.0, help='+- random delay in ms')
+        sub.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+        sub.add_argument('--seed', type=int, default=None)
+        if name == 'replay':
+            sub.add_argument('--max-articles', type=int, default=15)
+            sub.add_argument('--mock-db', action='store_true', help='use an in-memory mongomock database')
+            sub.add_argument('--mongo-uri', default=os.getenv('BENCH_MONGO_URI', 'mongodb://localhost:27017'))
+            sub.add_argument('--db-name', default='news_aggregator_bench')
+            sub.add_argument('--keep-db', action='store_true', help="don't empty the bench database")
+
+    args = parser.parse_args()
+    {'record': record, 'serve': serve, 'replay': replay}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
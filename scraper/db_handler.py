@@ -1,6 +1,7 @@
-from pymongo import MongoClient, DESCENDING
-from pymongo.errors import DuplicateKeyError
-from datetime import datetime, timezone
+from pymongo import MongoClient, DESCENDING, ASCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
 import os
 from dotenv import load_dotenv
 import pathlib
@@ -32,20 +33,100 @@ if not loaded:
     print("⚠️  No .env found at repo root or backend/.env; attempted automatic load (may use system env vars)")
 
 
+# Sentiment rollup resolutions: bucket start of a (naive UTC) datetime
+ROLLUP_RESOLUTIONS = {
+    'hour': lambda t: t.replace(minute=0, second=0, microsecond=0),
+    'day': lambda t: t.replace(hour=0, minute=0, second=0, microsecond=0),
+}
+ROLLUP_STEPS = {'hour': timedelta(hours=1), 'day': timedelta(days=1)}
+
+
+def as_utc_datetime(value):
+    """Naive UTC datetime of a stored date (datetime, ISO or RFC 822 string), or None"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            # Feed dates the scrapers could not convert are left as RFC 822
+            try:
+                value = parsedate_to_datetime(value)
+            except (TypeError, ValueError, IndexError):
+                return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def floor_hour(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def native_dates(article):
+    """Convert the article's ISO date strings to datetimes in place (unparseable publishedDate -> scrapedAt)"""
+    scraped_at = as_utc_datetime(article.get('scrapedAt')) or datetime.utcnow()
+    article['scrapedAt'] = scraped_at
+    if 'publishedDate' in article:
+        article['publishedDate'] = as_utc_datetime(article['publishedDate']) or scraped_at
+    return article
+
+
+# Fields list views need: everything but the full content body
+LIST_FIELDS = ('title', 'url', 'description', 'source', 'category', 'publishedDate', 'scrapedAt',
+               'sentiment', 'keywords', 'image', 'duplicateOf', 'analyzerVersion')
+
+# Stored as BSON dates; the scrapers produce ISO strings
+DATE_FIELDS = ('publishedDate', 'scrapedAt')
+
+# Counters stay in step with TTL deletions through this marker (see expire_counters)
+EXPIRY_MARKER = 'counters-expired-until'
+
+# Newest first, _id breaking scrapedAt ties, so (scrapedAt, _id) is a unique keyset cursor
+LIST_SORT = [('scrapedAt', DESCENDING), ('_id', DESCENDING)]
+
+# Indexes replaced by the (..., scrapedAt, _id) list indexes below
+SUPERSEDED_INDEXES = ('source_1_scrapedAt_-1', 'sentiment.label_1')
+
+
 class DatabaseHandler:
-    def __init__(self):
-        """Initialize MongoDB connection"""
+    def __init__(self, mongo_uri=None, db_name=None, client=None, insert_batch_size=None):
+        """Initialize MongoDB connection (or use an already created client)"""
         # Support both MONGO_URL and MONGODB_URI environment variable names
-        self.mongo_uri = os.getenv('MONGO_URL') or os.getenv('MONGODB_URI') 
-        self.db_name = os.getenv('DB_NAME', 'news_aggregator')
+        self.mongo_uri = mongo_uri or os.getenv('MONGO_URL') or os.getenv('MONGODB_URI') 
+        self.db_name = db_name or os.getenv('DB_NAME', 'news_aggregator')
+        # Articles sent per insert_many round trip
+        self.insert_batch_size = insert_batch_size or int(os.getenv('DB_INSERT_BATCH_SIZE', '500'))
+        # Articles fetched per keyset page by the iter_articles* readers
+        self.read_batch_size = int(os.getenv('DB_READ_BATCH_SIZE', '200'))
 
         try:
-            self.client = MongoClient(self.mongo_uri)
+            self.client = client or MongoClient(self.mongo_uri)
             self.db = self.client[self.db_name]
             self.articles = self.db['articles']
+            # Per-source article/sentiment counters kept up to date on insert
+            self.stats = self.db['article_stats']
+            # Hourly/daily sentiment buckets per source and label, for trends
+            self.rollups = self.db['sentiment_rollups']
+            # Articles expire this many days after scrapedAt through a TTL index (0: kept)
+            self.retention_days = float(os.getenv('ARTICLE_RETENTION_DAYS', '0'))
+            # Hourly buckets must outlive the articles for expire_counters()
+            self.hourly_retention_days = max(float(os.getenv('ROLLUP_HOURLY_RETENTION_DAYS', '90')),
+                                             self.retention_days + 1)
 
             # Create indexes
             self.setup_indexes()
+            # Dates stored as strings by older versions escape the TTL index and
+            # the keyset readers; convert them before anything else runs
+            if self.articles.find_one({'$or': [{field: {'$type': 'string'}} for field in DATE_FIELDS]},
+                                      {'_id': 1}) is not None:
+                self.migrate_dates()
+            # First start with the counters/rollups: build them from the stored articles once
+            if self.articles.estimated_document_count() > 0:
+                if self.stats.estimated_document_count() == 0:
+                    self.rebuild_stats()
+                if self.rollups.find_one({'resolution': {'$exists': True}}) is None:
+                    self.rebuild_rollups(full=True)
 
             print(f"✅ Connected to MongoDB: {self.db_name}")
         except Exception as e:
@@ -58,23 +139,56 @@ class DatabaseHandler:
             # Unique index on URL to prevent duplicates
             self.articles.create_index('url', unique=True)
             
-            # Index for common queries
-            self.articles.create_index([('source', 1), ('scrapedAt', DESCENDING)])
-            self.articles.create_index([('sentiment.label', 1)])
+            # List queries (newest first, optionally by source or label) walk
+            # these in order, so pages need neither a sort nor a skip
+            self.articles.create_index(LIST_SORT)
+            self.articles.create_index([('source', 1)] + LIST_SORT)
+            self.articles.create_index([('sentiment.label', 1)] + LIST_SORT)
+            existing = self.articles.index_information()
+            for name in SUPERSEDED_INDEXES:
+                if name in existing:
+                    self.articles.drop_index(name)
             self.articles.create_index([('publishedDate', DESCENDING)])
             self.articles.create_index([('keywords', 1)])
+            # Copies of a story point at the first one seen (near_duplicates.py)
+            self.articles.create_index([('duplicateOf', 1)], sparse=True)
+            
+            self.rollups.create_index([('resolution', 1), ('start', 1), ('source', 1)])
+            # Hourly buckets carry expiresAt and age out; daily buckets are kept
+            self.rollups.create_index('expiresAt', expireAfterSeconds=0)
+            self.setup_retention()
             
             print("✅ Database indexes created")
         except Exception as e:
             print(f"⚠️  Index creation warning: {str(e)}")
     
+    def setup_retention(self):
+        """Create, retune or drop the scrapedAt TTL index to match retention_days"""
+        name = 'scrapedAt_ttl'
+        existing = self.articles.index_information().get(name)
+        if not self.retention_days:
+            if existing:
+                self.articles.drop_index(name)
+            return
+        seconds = int(self.retention_days * 86400)
+        if existing is None:
+            # Pin the expiry marker before the TTL monitor can delete anything
+            self._expiry_marker()
+            self.articles.create_index([('scrapedAt', ASCENDING)], name=name, expireAfterSeconds=seconds)
+        elif existing.get('expireAfterSeconds') != seconds:
+            self.db.command({'collMod': self.articles.name,
+                             'index': {'name': name, 'expireAfterSeconds': seconds}})
+        print(f"🗓️  Articles expire {self.retention_days:g} days after scrapedAt")
+    
     def insert_article(self, article):
         """
         Insert a single article into database
         Returns True if inserted, False if duplicate
         """
         try:
-            result = self.articles.insert_one(article)
+            result = self.articles.insert_one(native_dates(article))
+            self.count_articles([article])
+            self.roll_up([article])
             return True
         except DuplicateKeyError:
             print(f"⚠️  Duplicate article skipped: {article.get('title', 'Unknown')[:50]}...")
@@ -87,21 +201,37 @@ class DatabaseHandler:
         """
         Insert multiple articles into database
         Returns count of successfully inserted articles
+
+        Articles go out in unordered insert_many batches of insert_batch_size,
+        one round trip each; a duplicate URL only fails its own document, and
+        the duplicate/error counts are read from the bulk write result.
         """
         inserted_count = 0
         duplicate_count = 0
         error_count = 0
         
-        for article in articles:
+        for start in range(0, len(articles), self.insert_batch_size):
+            batch = [native_dates(a) for a in articles[start:start + self.insert_batch_size]]
+            failed = set()
             try:
-                result = self.articles.insert_one(article)
-                inserted_count += 1
-                print(f"✅ Inserted: {article['title'][:50]}...")
-            except DuplicateKeyError:
-                duplicate_count += 1
+                result = self.articles.insert_many(batch, ordered=False)
+                inserted_count += len(result.inserted_ids)
+            except BulkWriteError as e:
+                inserted_count += e.details.get('nInserted', 0)
+                for error in e.details.get('writeErrors', []):
+                    failed.add(error.get('index'))
+                    if error.get('code') == 11000:
+                        duplicate_count += 1
+                    else:
+                        error_count += 1
+                        print(f"❌ Error: {error.get('errmsg', 'unknown write error')}")
             except Exception as e:
-                error_count += 1
+                error_count += len(batch)
                 print(f"❌ Error: {str(e)}")
+                continue
+            stored = [a for i, a in enumerate(batch) if i not in failed]
+            self.count_articles(stored)
+            self.roll_up(stored)
         
         print(f"\n📊 Database Insert Summary:")
         print(f"   ✅ Inserted: {inserted_count}")
@@ -110,102 +240,450 @@ class DatabaseHandler:
         
         return inserted_count
     
-    def get_all_articles(self, limit=100):
+    def count_articles(self, articles, sign=1):
+        """
+        Add (sign=-1: remove) articles to the per-source counters with one
+        unordered bulk $inc. Counters that drift (a failed write, articles
+        changed outside this handler) are fixed by rebuild_stats().
+        """
+        groups = {}
+        for article in articles:
+            sentiment = article.get('sentiment') or {}
+            group = groups.setdefault((article.get('source'), sentiment.get('label')), [0, 0.0])
+            group[0] += 1
+            group[1] += sentiment.get('score') or 0.0
+        try:
+            self._inc_counters(groups, sign)
+        except Exception as e:
+            print(f"⚠️  Stats counters not updated ({str(e)}); run python main.py --rebuild-stats")
+    
+    def _inc_counters(self, groups, sign):
+        """$inc the counters by {(source, label): [count, scoreSum]} times sign"""
+        increments = {}
+        for (source, label), (count, score_sum) in groups.items():
+            inc = increments.setdefault(source or 'Unknown', {})
+            for prefix in [''] + ([f'labels.{label}.'] if label else []):
+                inc[prefix + 'count'] = inc.get(prefix + 'count', 0) + sign * count
+                inc[prefix + 'scoreSum'] = inc.get(prefix + 'scoreSum', 0.0) + sign * score_sum
+        if increments:
+            self.stats.bulk_write([UpdateOne({'_id': source}, {'$inc': inc}, upsert=True)
+                                   for source, inc in increments.items()], ordered=False)
+    
+    def _source_label_counts(self, match=None):
+        """Articles per (source, label) with their score sums, from one $group"""
+        pipeline = [{'$match': match}] if match else []
+        pipeline.append({'$group': {
+            '_id': {'source': '$source', 'label': '$sentiment.label'},
+            'count': {'$sum': 1},
+            'scoreSum': {'$sum': '$sentiment.score'},
+        }})
+        return list(self.articles.aggregate(pipeline))
+    
+    def _stored_groups(self, start, end):
+        """{(source, label): [count, scoreSum]} of stored articles scraped in [start, end)"""
+        return {(g['_id'].get('source') or 'Unknown', g['_id'].get('label')): [g['count'], g['scoreSum'] or 0.0]
+                for g in self._source_label_counts({'scrapedAt': {'$gte': start, '$lt': end}})}
+    
+    def rebuild_stats(self):
+        """Recompute the per-source counters from the articles collection"""
+        try:
+            docs = {}
+            for group in self._source_label_counts():
+                source = group['_id'].get('source') or 'Unknown'
+                label = group['_id'].get('label')
+                doc = docs.setdefault(source, {'_id': source, 'count': 0, 'scoreSum': 0.0, 'labels': {}})
+                doc['count'] += group['count']
+                doc['scoreSum'] += group['scoreSum'] or 0.0
+                if label:
+                    doc['labels'][label] = {'count': group['count'], 'scoreSum': group['scoreSum'] or 0.0}
+            self.stats.delete_many({'_id': {'$nin': list(docs)}})
+            for doc in docs.values():
+                self.stats.replace_one({'_id': doc['_id']}, doc, upsert=True)
+            # Rebuilt from the articles still stored: expiry accounting starts over
+            self.rollups.delete_one({'_id': EXPIRY_MARKER})
+            self._expiry_marker()
+            total = sum(doc['count'] for doc in docs.values())
+            print(f"🔧 Rebuilt stats counters: {total} articles from {len(docs)} sources")
+            return total
+        except Exception as e:
+            print(f"❌ Error rebuilding stats: {str(e)}")
+            return 0
+    
+    def _set_expiry_marker(self, hour):
+        """
+        Move the expiry marker to hour: every article scraped before it is out
+        of the counters, every later stored one is in. Hourly buckets keep
+        the history of deleted articles, so the marker hour's bucket may hold
+        some that are no longer counted; they are kept as a credit that
+        expire_counters() does not subtract again.
+        """
+        credit = {}
+        for doc in self.rollups.find({'resolution': 'hour', 'start': hour}):
+            credit[(doc['source'], doc['label'])] = [doc['count'], doc['scoreSum']]
+        for key, (count, score_sum) in self._stored_groups(hour, hour + timedelta(hours=1)).items():
+            group = credit.setdefault(key, [0, 0.0])
+            group[0] -= count
+            group[1] -= score_sum
+        marker = {'_id': EXPIRY_MARKER, 'until': hour, 'credit': [
+            {'source': source, 'label': label, 'count': count, 'scoreSum': score_sum}
+            for (source, label), (count, score_sum) in credit.items() if count]}
+        self.rollups.replace_one({'_id': EXPIRY_MARKER}, marker, upsert=True)
+        return marker
+    
+    def _expiry_marker(self):
+        """The expiry marker, set to the oldest stored article's hour on first use"""
+        marker = self.rollups.find_one({'_id': EXPIRY_MARKER})
+        if marker is not None:
+            return marker
+        oldest = self.articles.find_one({'scrapedAt': {'$type': 'date'}}, {'scrapedAt': 1},
+                                        sort=[('scrapedAt', ASCENDING)])
+        return self._set_expiry_marker(floor_hour(oldest['scrapedAt'] if oldest else datetime.utcnow()))
+    
+    def expire_counters(self, until=None):
+        """
+        Subtract articles the TTL index deleted from the per-source counters,
+        using the hourly rollups: every hour bucket from the expiry marker up
+        to until (default: the TTL cutoff, floored to the hour) is subtracted
+        once, less the marker's credit, and the marker moves on. An hour is
+        only subtracted once all of it is past the cutoff, so the counters
+        may run up to an hour's articles high.
+        """
+        if until is None:
+            if not self.retention_days:
+                return
+            # A few minutes' slack for the TTL monitor, which runs every 60s
+            until = floor_hour(datetime.utcnow() - timedelta(days=self.retention_days, minutes=5))
+        try:
+            marker = self._expiry_marker()
+            if until <= marker['until']:
+                return
+            groups = {}
+            for doc in self.rollups.find({'resolution': 'hour', 'start': {'$gte': marker['until'], '$lt': until}}):
+                group = groups.setdefault((doc['source'], doc['label']), [0, 0.0])
+                group[0] += doc['count']
+                group[1] += doc['scoreSum']
+            for credit in marker.get('credit', []):
+                group = groups.setdefault((credit['source'], credit['label']), [0, 0.0])
+                group[0] -= credit['count']
+                group[1] -= credit['scoreSum']
+            self._inc_counters(groups, -1)
+            self.rollups.replace_one({'_id': EXPIRY_MARKER}, {'_id': EXPIRY_MARKER, 'until': until, 'credit': []})
+        except Exception as e:
+            print(f"⚠️  Stats counters not expired ({str(e)}); run python main.py --rebuild-stats")
+    
+    def migrate_dates(self, batch_size=1000):
+        """
+        Convert publishedDate/scrapedAt strings of stored articles to BSON
+        dates, batch_size documents per bulk write in _id order. Runs on
+        start-up whenever string dates are found, so an interrupted migration
+        continues on the next start. Returns the number of articles converted.
+        """
+        query = {'$or': [{field: {'$type': 'string'}} for field in DATE_FIELDS]}
+        total = self.articles.count_documents(query)
+        print(f"🗓️  Converting dates of {total} articles")
+        converted, last_id = 0, None
+        while True:
+            batch_query = query if last_id is None else {'$and': [query, {'_id': {'$gt': last_id}}]}
+            docs = list(self.articles.find(batch_query, {field: 1 for field in DATE_FIELDS},
+                                           sort=[('_id', ASCENDING)], limit=batch_size))
+            if not docs:
+                break
+            requests = [UpdateOne({'_id': doc['_id']},
+                                  {'$set': {field: native_dates(doc)[field] for field in DATE_FIELDS if field in doc}})
+                        for doc in docs]
+            converted += self.articles.bulk_write(requests, ordered=False).modified_count
+            last_id = docs[-1]['_id']
+            print(f"   {converted}/{total} articles converted")
+        print(f"✅ Dates migrated: {converted} articles")
+        # Converted articles only now fall under the TTL index: recount what is left
+        if converted:
+            self.rebuild_stats()
+        return converted
+    
+    def _rollup_groups(self, articles, groups=None):
+        """Accumulate articles into {(resolution, start, source, label): [count, scoreSum, min, max]}"""
+        groups = {} if groups is None else groups
+        for article in articles:
+            sentiment = article.get('sentiment') or {}
+            at = as_utc_datetime(article.get('scrapedAt'))
+            if at is None:
+                continue
+            # Unlabeled articles (failed analysis) get label None buckets, so
+            # expire_counters() can take them out of the counters as well
+            score = sentiment.get('score') or 0.0
+            for resolution, truncate in ROLLUP_RESOLUTIONS.items():
+                key = (resolution, truncate(at), article.get('source') or 'Unknown', sentiment.get('label'))
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [1, score, score, score]
+                else:
+                    group[0] += 1
+                    group[1] += score
+                    group[2] = min(group[2], score)
+                    group[3] = max(group[3], score)
+        return groups
+    
+    def _rollup_doc(self, key):
+        resolution, start, source, label = key
+        doc = {'resolution': resolution, 'start': start, 'source': source, 'label': label}
+        if resolution == 'hour':
+            doc['expiresAt'] = start + timedelta(days=self.hourly_retention_days)
+        return f"{resolution}:{start:%Y-%m-%dT%H}:{source}:{label}", doc
+    
+    def roll_up(self, articles):
+        """
+        Add articles to their hourly and daily (source, label) buckets with
+        one unordered bulk upsert: $inc count and scoreSum, $min/$max score.
+        Buckets keep the history of articles deleted later.
+        """
+        requests = []
+        for key, (count, score_sum, low, high) in self._rollup_groups(articles).items():
+            _id, doc = self._rollup_doc(key)
+            requests.append(UpdateOne({'_id': _id}, {
+                '$inc': {'count': count, 'scoreSum': score_sum},
+                '$min': {'min': low},
+                '$max': {'max': high},
+                '$setOnInsert': doc,
+            }, upsert=True))
+        if not requests:
+            return
+        try:
+            self.rollups.bulk_write(requests, ordered=False)
+        except Exception as e:
+            print(f"⚠️  Sentiment rollups not updated ({str(e)}); run python main.py --rebuild-stats")
+    
+    def rebuild_rollups(self, full=False):
+        """
+        Recompute the buckets fully covered by the stored articles: those
+        after the bucket of the earliest scrapedAt. That first bucket and
+        older ones may count articles already deleted, so they stay as they
+        are (full=True rebuilds them too, for a collection without buckets).
+        """
+        try:
+            groups = {}
+            batch = []
+            cursor = self.articles.find({}, {'scrapedAt': 1, 'source': 1, 'sentiment.label': 1,
+                                             'sentiment.score': 1, '_id': 0}, batch_size=1000)
+            for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= 1000:
+                    self._rollup_groups(batch, groups)
+                    batch = []
+            self._rollup_groups(batch, groups)
+            if not groups:
+                return 0
+            
+            for resolution in ROLLUP_RESOLUTIONS:
+                earliest = min(start for res, start, _, _ in groups if res == resolution)
+                if not full:
+                    earliest += ROLLUP_STEPS[resolution]
+                    groups = {key: group for key, group in groups.items()
+                              if key[0] != resolution or key[1] >= earliest}
+                self.rollups.delete_many({'resolution': resolution, 'start': {'$gte': earliest}})
+            requests = []
+            for key, (count, score_sum, low, high) in groups.items():
+                _id, doc = self._rollup_doc(key)
+                doc.update({'count': count, 'scoreSum': score_sum, 'min': low, 'max': high})
+                requests.append(UpdateOne({'_id': _id}, {'$set': doc}, upsert=True))
+            for start in range(0, len(requests), 1000):
+                self.rollups.bulk_write(requests[start:start + 1000], ordered=False)
+            print(f"🔧 Rebuilt {len(groups)} sentiment rollup buckets")
+            return len(groups)
+        except Exception as e:
+            print(f"❌ Error rebuilding rollups: {str(e)}")
+            return 0
+    
+    def get_sentiment_rollups(self, start, end=None, resolution='hour', source=None, by_source=True):
+        """
+        Sentiment buckets from start up to (not including) end, oldest first:
+        [{'start', 'source', 'label', 'count', 'avgScore', 'min', 'max'}].
+        resolution is 'hour' or 'day'; by_source=False merges the sources.
+        """
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(ROLLUP_RESOLUTIONS)}")
+        query = {'resolution': resolution, 'label': {'$ne': None},
+                 'start': {'$gte': ROLLUP_RESOLUTIONS[resolution](as_utc_datetime(start))}}
+        if end is not None:
+            query['start']['$lt'] = as_utc_datetime(end)
+        if source:
+            query['source'] = source
+        try:
+            docs = self.rollups.find(query, {'_id': 0, 'expiresAt': 0, 'resolution': 0}).sort('start', ASCENDING)
+            buckets = {}
+            for doc in docs:
+                key = (doc['start'], doc['source'] if by_source else None, doc['label'])
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = doc
+                else:
+                    bucket['count'] += doc['count']
+                    bucket['scoreSum'] += doc['scoreSum']
+                    bucket['min'] = min(bucket['min'], doc['min'])
+                    bucket['max'] = max(bucket['max'], doc['max'])
+            rollups = []
+            for (bucket_start, bucket_source, label), doc in buckets.items():
+                rollup = {'start': bucket_start, 'label': label, 'count': doc['count'],
+                          'avgScore': doc['scoreSum'] / doc['count'] if doc['count'] else 0.0,
+                          'min': doc['min'], 'max': doc['max']}
+                if by_source:
+                    rollup['source'] = bucket_source
+                rollups.append(rollup)
+            return rollups
+        except Exception as e:
+            print(f"❌ Error fetching sentiment rollups: {str(e)}")
+            return []
+    
+    def get_existing_urls(self, urls):
+        """
+        Return the subset of urls that are already stored.
+        One batched $in query answered from the unique url index.
+        """
+        urls = list(set(urls))
+        if not urls:
+            return set()
+        try:
+            cursor = self.articles.find({'url': {'$in': urls}}, {'url': 1, '_id': 0})
+            return {doc['url'] for doc in cursor}
+        except Exception as e:
+            print(f"❌ Error checking existing URLs: {str(e)}")
+            return set()
+    
+    def _projection(self, fields):
+        """Find projection for fields (None: whole documents); the keyset fields are always kept"""
+        if fields is None:
+            return None
+        projection = {field: 1 for field in fields}
+        projection['scrapedAt'] = 1
+        return projection
+    
+    def get_articles_page(self, query=None, limit=50, after=None, fields=LIST_FIELDS):
+        """
+        One page of articles matching query, newest first, and the cursor of
+        the next page (None after the last page). after is the cursor returned
+        with the previous page: the (scrapedAt, _id) of its last article.
+        Each page is an index range scan, however deep it is.
+        """
+        query = dict(query or {})
+        if after is not None:
+            scraped_at, last_id = after
+            keyset = {'$or': [{'scrapedAt': {'$lt': scraped_at}},
+                              {'scrapedAt': scraped_at, '_id': {'$lt': last_id}}]}
+            query = {'$and': [query, keyset]} if query else keyset
+        cursor = self.articles.find(query, self._projection(fields), sort=LIST_SORT,
+                                    limit=limit, batch_size=limit)
+        articles = list(cursor)
+        if len(articles) < limit:
+            return articles, None
+        return articles, (articles[-1].get('scrapedAt'), articles[-1]['_id'])
+    
+    def iter_articles(self, query=None, fields=LIST_FIELDS, limit=None, after=None, batch_size=None):
+        """
+        Yield articles matching query newest first, fetched in keyset pages of
+        batch_size (DB_READ_BATCH_SIZE, default 200) with only fields projected
+        (fields=None for whole documents, content included)
+        """
+        batch_size = batch_size or self.read_batch_size
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            articles, after = self.get_articles_page(query, page_size, after, fields)
+            yield from articles
+            if remaining is not None:
+                remaining -= len(articles)
+            if after is None:
+                return
+    
+    def iter_articles_by_source(self, source, **kwargs):
+        """Yield a source's articles newest first (see iter_articles)"""
+        return self.iter_articles({'source': source}, **kwargs)
+    
+    def iter_articles_by_sentiment(self, sentiment_label, **kwargs):
+        """Yield articles with a sentiment label newest first (see iter_articles)"""
+        return self.iter_articles({'sentiment.label': sentiment_label}, **kwargs)
+    
+    def get_all_articles(self, limit=100, fields=LIST_FIELDS):
         """Get all articles from database"""
         try:
-            articles = list(self.articles.find().sort('scrapedAt', DESCENDING).limit(limit))
-            return articles
+            return list(self.iter_articles(fields=fields, limit=limit))
         except Exception as e:
             print(f"❌ Error fetching articles: {str(e)}")
             return []
     
-    def get_articles_by_source(self, source, limit=50):
+    def get_articles_by_source(self, source, limit=50, fields=LIST_FIELDS):
         """Get articles from a specific source"""
         try:
-            articles = list(
-                self.articles.find({'source': source})
-                .sort('scrapedAt', DESCENDING)
-                .limit(limit)
-            )
-            return articles
+            return list(self.iter_articles_by_source(source, fields=fields, limit=limit))
         except Exception as e:
             print(f"❌ Error fetching articles by source: {str(e)}")
             return []
     
-    def get_articles_by_sentiment(self, sentiment_label, limit=50):
+    def get_articles_by_sentiment(self, sentiment_label, limit=50, fields=LIST_FIELDS):
         """Get articles by sentiment (positive/negative/neutral)"""
         try:
-            articles = list(
-                self.articles.find({'sentiment.label': sentiment_label})
-                .sort('scrapedAt', DESCENDING)
-                .limit(limit)
-            )
-            return articles
+            return list(self.iter_articles_by_sentiment(sentiment_label, fields=fields, limit=limit))
         except Exception as e:
             print(f"❌ Error fetching articles by sentiment: {str(e)}")
             return []
     
     def get_sentiment_statistics(self):
-        """Get sentiment distribution statistics"""
-        try:
-            pipeline = [
-                {
-                    '$group': {
-                        '_id': '$sentiment.label',
-                        'count': {'$sum': 1},
-                        'avgScore': {'$avg': '$sentiment.score'}
-                    }
-                }
-            ]
+        """Get sentiment distribution statistics (read from the per-source counters)"""
+        try:
+            labels = {}
+            unlabeled = 0
+            for doc in self.stats.find():
+                counted = 0
+                for label, counter in (doc.get('labels') or {}).items():
+                    total = labels.setdefault(label, {'count': 0, 'scoreSum': 0.0})
+                    total['count'] += counter.get('count', 0)
+                    total['scoreSum'] += counter.get('scoreSum', 0.0)
+                    counted += counter.get('count', 0)
+                unlabeled += doc.get('count', 0) - counted
             
-            stats = list(self.articles.aggregate(pipeline))
+            stats = [{'_id': label, 'count': total['count'], 'avgScore': total['scoreSum'] / total['count']}
+                     for label, total in labels.items() if total['count'] > 0]
+            if unlabeled > 0:
+                stats.append({'_id': None, 'count': unlabeled, 'avgScore': None})
             return stats
         except Exception as e:
             print(f"❌ Error getting statistics: {str(e)}")
             return []
     
     def get_source_statistics(self):
-        """Get statistics by source"""
-        try:
-            pipeline = [
-                {
-                    '$group': {
-                        '_id': '$source',
-                        'count': {'$sum': 1},
-                        'positive': {
-                            '$sum': {
-                                '$cond': [{'$eq': ['$sentiment.label', 'positive']}, 1, 0]
-                            }
-                        },
-                        'negative': {
-                            '$sum': {
-                                '$cond': [{'$eq': ['$sentiment.label', 'negative']}, 1, 0]
-                            }
-                        },
-                        'neutral': {
-                            '$sum': {
-                                '$cond': [{'$eq': ['$sentiment.label', 'neutral']}, 1, 0]
-                            }
-                        }
-                    }
-                }
-            ]
-            
-            stats = list(self.articles.aggregate(pipeline))
+        """Get statistics by source (read from the per-source counters)"""
+        try:
+            stats = []
+            for doc in self.stats.find():
+                if doc.get('count', 0) <= 0:
+                    continue
+                labels = doc.get('labels') or {}
+                stats.append({
+                    '_id': doc['_id'],
+                    'count': doc['count'],
+                    'positive': labels.get('positive', {}).get('count', 0),
+                    'negative': labels.get('negative', {}).get('count', 0),
+                    'neutral': labels.get('neutral', {}).get('count', 0),
+                })
             return stats
         except Exception as e:
             print(f"❌ Error getting source statistics: {str(e)}")
             return []
     
     def delete_old_articles(self, days=30):
-        """Delete articles older than specified days"""
+        """
+        Delete articles older than specified days (an index range on scrapedAt).
+        With ARTICLE_RETENTION_DAYS set the TTL index does this continuously.
+        """
         try:
-            from datetime import timedelta
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            result = self.articles.delete_many({
-                'scrapedAt': {'$lt': cutoff_date.isoformat()}
-            })
+            # Counters for the articles about to go, grouped before deleting
+            # them; those before the expiry marker are already out of them
+            since = self._expiry_marker()['until']
+            removed = self._stored_groups(since, cutoff_date) if cutoff_date > since else {}
+            result = self.articles.delete_many({'scrapedAt': {'$lt': cutoff_date}})
+            self._inc_counters(removed, -1)
+            if floor_hour(cutoff_date) >= since:
+                self._set_expiry_marker(floor_hour(cutoff_date))
             
             print(f"🗑️  Deleted {result.deleted_count} articles older than {days} days")
             return result.deleted_count
@@ -213,6 +691,64 @@ class DatabaseHandler:
             print(f"❌ Error deleting old articles: {str(e)}")
             return 0
     
+    def iter_articles_to_rescore(self, version, after_id=None, batch_size=500, redo_all=False):
+        """
+        Yield lists of up to batch_size articles not yet scored by analyzer
+        version (every article with redo_all), in _id order after after_id.
+        One server-side cursor fetches batch_size documents per round trip,
+        with only the fields the analyzer reads.
+        """
+        query = {} if redo_all else {'analyzerVersion': {'$ne': version}}
+        if after_id is not None:
+            query['_id'] = {'$gt': after_id}
+        cursor = self.articles.find(
+            query, {'title': 1, 'description': 1, 'content': 1},
+            sort=[('_id', ASCENDING)], batch_size=batch_size, no_cursor_timeout=True,
+        )
+        try:
+            batch = []
+            for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            cursor.close()
+    
+    def count_articles_to_rescore(self, version, after_id=None, redo_all=False):
+        """Number of articles iter_articles_to_rescore would yield"""
+        query = {} if redo_all else {'analyzerVersion': {'$ne': version}}
+        if after_id is not None:
+            query['_id'] = {'$gt': after_id}
+        try:
+            return self.articles.count_documents(query)
+        except Exception as e:
+            print(f"❌ Error counting articles: {str(e)}")
+            return 0
+    
+    def update_analyses(self, articles):
+        """
+        Write back sentiment, keywords and analyzerVersion of analyzed
+        articles in one unordered bulk write; returns the number updated
+        """
+        requests = [
+            UpdateOne({'_id': a['_id']}, {'$set': {
+                'sentiment': a['sentiment'],
+                'keywords': a.get('keywords', []),
+                'analyzerVersion': a['analyzerVersion'],
+            }})
+            for a in articles if 'sentiment' in a
+        ]
+        if not requests:
+            return 0
+        try:
+            return self.articles.bulk_write(requests, ordered=False).matched_count
+        except BulkWriteError as e:
+            print(f"❌ Bulk update errors: {len(e.details.get('writeErrors', []))}")
+            return e.details.get('nMatched', 0)
+    
     def close_connection(self):
         """Close database connection"""
         try:
@@ -231,8 +767,8 @@ if __name__ == "__main__":
         'url': 'https://example.com/test-unique-123',
         'description': 'This is a test article',
         'source': 'Test Source',
-        'publishedDate': datetime.now(timezone.utc).isoformat(),
-        'scrapedAt': datetime.now(timezone.utc).isoformat(),
+        'publishedDate': datetime.now(timezone.utc),
+        'scrapedAt': datetime.now(timezone.utc),
         'sentiment': {
             'score': 0.5,
             'label': 'positive'
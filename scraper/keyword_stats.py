@@ -0,0 +1,184 @@
+"""Incrementally updated document frequencies for TF-IDF keyword ranking.
+
+    python keyword_stats.py            # print what the local store holds
+
+SentimentAnalyzer.extract_keywords counts each article's candidate words
+once into a DocumentFrequencyStore and ranks keywords by term frequency
+times IDF, so words that appear in most news articles stop crowding out
+the distinctive ones. The store is just a term -> ID dict and a float
+array of counts. It is saved to a local file (KEYWORD_DF_PATH) when a batch
+is flushed, and each save bumps the store's generation. Worker processes
+hold a read-only copy and refresh() it from the file when it changes, so
+their IDFs follow the parent's.
+Every KEYWORD_DF_DECAY_EVERY documents all counts are
+multiplied by KEYWORD_DF_DECAY, which lets old news fade. Terms whose count
+falls below MIN_DF are then dropped, so the vocabulary stays compact.
+
+Layout (little endian):
+    8 bytes   magic + format version
+    2 x u32   term count, term blob length
+    2 x u32   documents added since the last decay, generation
+    f64       decayed document count
+    f64 * N   document frequencies, in term ID order
+    bytes     terms, UTF-8, newline separated
+"""
+import math
+import os
+import struct
+import threading
+from array import array
+
+MAGIC = b'KWDF0002'
+HEADER = struct.Struct('<8s4Id')
+# Version 1 files have no generation; they load as generation 0
+MAGIC_V1 = b'KWDF0001'
+HEADER_V1 = struct.Struct('<8s3Id')
+DEFAULT_DF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'keyword_df.bin')
+
+# Terms decayed below this document count are forgotten
+MIN_DF = 0.1
+
+
+class DocumentFrequencyStore:
+    def __init__(self, path=None, decay=None, decay_every=None, read_only=False):
+        """Document frequencies loaded from path (KEYWORD_DF_PATH; '' keeps them in memory only).
+
+        A read_only store (in worker processes) never changes or saves its
+        counts; update() only queues the terms, and take_pending() hands them
+        to the parent process, which owns the real store.
+        """
+        self.path = os.getenv('KEYWORD_DF_PATH', DEFAULT_DF_PATH) if path is None else path
+        self.decay = decay or float(os.getenv('KEYWORD_DF_DECAY', '0.9'))
+        self.decay_every = decay_every or int(os.getenv('KEYWORD_DF_DECAY_EVERY', '1000'))
+        self.read_only = read_only
+        self.pending = []
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._file_stamp = None
+
+        self.generation = 0
+        self.ids = {}
+        self.terms = []
+        self.df = array('d')
+        self.documents = 0.0
+        self.since_decay = 0
+        if self.path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                stamp = self._stamp(f.fileno())
+                data = f.read()
+            if data[:8] == MAGIC_V1:
+                _, term_count, blob_len, since_decay, documents = HEADER_V1.unpack_from(data, 0)
+                generation, offset = 0, HEADER_V1.size
+            elif data[:8] == MAGIC:
+                _, term_count, blob_len, since_decay, generation, documents = HEADER.unpack_from(data, 0)
+                offset = HEADER.size
+            else:
+                return
+            df = array('d')
+            df.frombytes(data[offset:offset + 8 * term_count])
+            offset += 8 * term_count
+            terms = data[offset:offset + blob_len].decode('utf-8').split('\n') if term_count else []
+            if len(terms) != term_count or len(df) != term_count:
+                return
+        except (OSError, struct.error, UnicodeDecodeError, ValueError):
+            return
+        self.terms, self.df = terms, df
+        self.ids = {term: i for i, term in enumerate(terms)}
+        self.documents, self.since_decay = documents, since_decay
+        self.generation, self._file_stamp = generation, stamp
+
+    @staticmethod
+    def _stamp(fd):
+        st = os.fstat(fd)
+        return st.st_mtime_ns, st.st_size
+
+    def refresh(self):
+        """Reload a read_only store if its file was saved since it was loaded; True if it was"""
+        if not self.path or not self.read_only:
+            return False
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) == self._file_stamp:
+            return False
+        self._load()
+        return True
+
+    def idf(self, term):
+        """Smoothed inverse document frequency; every term scores the same while the store is empty"""
+        i = self.ids.get(term)
+        df = self.df[i] if i is not None else 0.0
+        return math.log((1.0 + self.documents) / (1.0 + df)) + 1.0
+
+    def update(self, terms):
+        """Count one document's distinct terms"""
+        if self.read_only:
+            self.pending.append(list(terms))
+            return
+        with self._lock:
+            for term in terms:
+                i = self.ids.get(term)
+                if i is None:
+                    i = self.ids[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.df.append(0.0)
+                self.df[i] += 1.0
+            self.documents += 1.0
+            self.since_decay += 1
+            self._dirty = True
+            if self.since_decay >= self.decay_every:
+                self._decay()
+
+    def take_pending(self):
+        """Terms queued by a read_only store since the last call"""
+        pending, self.pending = self.pending, []
+        return pending
+
+    def _decay(self):
+        """Fade every count by the decay factor and drop the terms that fell below MIN_DF"""
+        self.documents *= self.decay
+        self.since_decay = 0
+        kept_terms, kept_df = [], array('d')
+        for term, df in zip(self.terms, self.df):
+            df *= self.decay
+            if df >= MIN_DF:
+                kept_terms.append(term)
+                kept_df.append(df)
+        self.terms, self.df = kept_terms, kept_df
+        self.ids = {term: i for i, term in enumerate(kept_terms)}
+
+    def save(self):
+        """Write the store to its file and start a new generation if it changed"""
+        if not self.path or self.read_only or not self._dirty:
+            return
+        with self._lock:
+            self.generation += 1
+            self._dirty = False
+            blob = '\n'.join(self.terms).encode('utf-8')
+            header = HEADER.pack(MAGIC, len(self.terms), len(blob), self.since_decay,
+                                 self.generation, self.documents)
+            df = self.df.tobytes()
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(header)
+                f.write(df)
+                f.write(blob)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save keyword statistics to {self.path}: {str(e)}")
+
+
+if __name__ == "__main__":
+    store = DocumentFrequencyStore(read_only=True)
+    print(f"📚 {store.path}: {store.documents:.1f} documents, {len(store.terms)} terms "
+          f"({store.since_decay} added since the last decay, generation {store.generation})")
+    common = sorted(zip(store.df, store.terms), reverse=True)[:20]
+    for df, term in common:
+        print(f"   {term:<20} df {df:8.1f}  idf {store.idf(term):.2f}")
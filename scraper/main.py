@@ -1,16 +1,31 @@
-import schedule
 import time
+# --startup-profile measures from here
+_PROCESS_START = time.perf_counter()
+
+import schedule
+import os
+import sys
 from datetime import datetime
 from scrapers.bbc_scraper import BBCScraper
 from scrapers.ndtv_scraper import NDTVScraper
 from sentiment_analyzer import SentimentAnalyzer
 from db_handler import DatabaseHandler
+from pipeline import ArticlePipeline
+from near_duplicates import NearDuplicateIndex, near_duplicates_enabled
+from scrapers.http_client import get_http_client
+from scrapers.browser_pool import get_browser_pool
+
+_IMPORTS_DONE = time.perf_counter()
+
+# Modules worth knowing about when they show up in a startup profile
+HEAVY_MODULES = ('nltk', 'numpy', 'selenium', 'pymongo', 'bs4', 'lxml', 'requests')
 
 class NewsAggregator:
-    def __init__(self):
+    def __init__(self, db=None, startup_profile=False):
         """Initialize the news aggregator"""
+        self.startup_profile = startup_profile
         self.sentiment_analyzer = SentimentAnalyzer()
-        self.db = DatabaseHandler()
+        self.db = db or DatabaseHandler()
         
         # Initialize scrapers
         self.scrapers = {
@@ -18,46 +33,21 @@ class NewsAggregator:
             'ndtv': NDTVScraper,
             # Add more scrapers here
         }
-    
-    def scrape_all_sources(self):
-        """Scrape all news sources"""
-        print("\n" + "="*60)
-        print(f"🚀 Starting news scraping at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*60)
         
-        all_articles = []
+        # Sources are scraped concurrently; a source still running after
+        # source_timeout seconds is abandoned so it can't stall the cycle
+        self.source_workers = int(os.getenv('SCRAPER_SOURCE_WORKERS', '0')) or len(self.scrapers)
+        self.source_timeout = float(os.getenv('SCRAPER_SOURCE_TIMEOUT', '300'))
         
-        for source_name, ScraperClass in self.scrapers.items():
-            try:
-                print(f"\n📰 Scraping {source_name.upper()}...")
-                scraper = ScraperClass()
-                articles = scraper.scrape_articles(max_articles=15)
-                all_articles.extend(articles)
-                print(f"✅ Got {len(articles)} articles from {source_name}")
-            except Exception as e:
-                print(f"❌ Error scraping {source_name}: {str(e)}")
-        
-        print(f"\n📊 Total articles scraped: {len(all_articles)}")
-        return all_articles
-    
-    def process_articles(self, articles):
-        """Process articles: analyze sentiment and save to database"""
-        if not articles:
-            print("⚠️  No articles to process")
-            return
-        
-        # Analyze sentiment
-        print("\n🔍 Analyzing sentiment...")
-        analyzed_articles = self.sentiment_analyzer.batch_analyze(articles)
-        
-        # Save to database
-        print("\n💾 Saving to database...")
-        inserted_count = self.db.insert_articles(analyzed_articles)
+        # Syndicated copies of a story are linked to the first one (NEAR_DUP=0 turns this off)
+        self.near_duplicates = NearDuplicateIndex() if near_duplicates_enabled() else None
         
-        print(f"\n✅ Processing complete! {inserted_count} new articles added.")
-        
-        # Show statistics
-        self.show_statistics()
+        self.pipeline = ArticlePipeline(
+            self.scrapers, self.sentiment_analyzer, self.db, max_articles=15,
+            source_workers=self.source_workers, source_timeout=self.source_timeout,
+            near_duplicates=self.near_duplicates,
+        )
+        self.ready_at = time.perf_counter()
     
     def show_statistics(self):
         """Display current database statistics"""
@@ -88,9 +78,59 @@ class NewsAggregator:
         print("="*60 + "\n")
     
     def run_once(self):
-        """Run scraping and processing once"""
-        articles = self.scrape_all_sources()
-        self.process_articles(articles)
+        """Run scraping and processing once, streaming each article from its
+        scraper through sentiment analysis into the database"""
+        print("\n" + "="*60)
+        print(f"🚀 Starting news scraping at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*60)
+        
+        get_http_client().reset_stats()
+        get_browser_pool().reset_stats()
+        self.sentiment_analyzer.reset_stats()
+        if self.near_duplicates:
+            self.near_duplicates.reset_stats()
+        
+        inserted_count = self.pipeline.run()
+        # Take articles the TTL index removed out of the stats counters
+        self.db.expire_counters()
+        
+        get_http_client().report()
+        get_browser_pool().report()
+        self.sentiment_analyzer.report()
+        if self.near_duplicates:
+            self.near_duplicates.report()
+        if self.startup_profile:
+            self.show_startup_profile()
+            self.startup_profile = False
+        print(f"\n✅ Processing complete! {inserted_count} new articles added.")
+        
+        # Show statistics
+        self.show_statistics()
+    
+    def show_startup_profile(self):
+        """Print where the first cycle's time-to-first-scrape went (--startup-profile)"""
+        def since_start(t):
+            return f"{(t - _PROCESS_START) * 1000:8.0f} ms" if t else "       -   "
+        
+        stages = self.pipeline.last_run['stages'] if self.pipeline.last_run else {}
+        first = {name: stage.first_at for name, stage in stages.items()}
+        analyzer = self.sentiment_analyzer
+        
+        print("\n" + "="*60)
+        print("⏱️  STARTUP PROFILE (from the top of main.py)")
+        print("="*60)
+        print(f"   imports done            {since_start(_IMPORTS_DONE)}  ({(_IMPORTS_DONE - _PROCESS_START) * 1000:.0f} ms)")
+        print(f"   aggregator ready        {since_start(self.ready_at)}  ({(self.ready_at - _IMPORTS_DONE) * 1000:.0f} ms, DB connect included)")
+        print(f"   first article scraped   {since_start(first.get('scrape'))}")
+        print(f"   first article analyzed  {since_start(first.get('analyze'))}")
+        print(f"   first article stored    {since_start(first.get('store'))}")
+        if analyzer.load_time is not None:
+            print(f"   sentiment data          {analyzer.load_time * 1000:8.0f} ms  (from {analyzer.loaded_from}, "
+                  f"loaded while scraping)")
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        print(f"   heavy modules loaded:   {', '.join(loaded) or 'none'}")
+        print("   (python -X importtime main.py --once breaks the imports down per module)")
+        print("="*60)
     
     def run_scheduled(self, interval_minutes=30):
         """Run scraping on a schedule"""
@@ -115,16 +155,31 @@ class NewsAggregator:
     def cleanup(self):
         """Cleanup resources"""
         print("🧹 Cleaning up...")
+        get_http_client().close()
+        get_browser_pool().close()
+        self.sentiment_analyzer.close()
+        if self.near_duplicates:
+            self.near_duplicates.close()
         self.db.close_connection()
 
 def main():
     """Main entry point"""
-    import sys
+    args = sys.argv[1:]
+    startup_profile = '--startup-profile' in args
+    args = [arg for arg in args if arg != '--startup-profile']
+    
+    if args and args[0] == '--rebuild-stats':
+        # Repair drifted stats counters without scraping
+        db = DatabaseHandler()
+        db.rebuild_stats()
+        db.rebuild_rollups()
+        db.close_connection()
+        return
     
-    aggregator = NewsAggregator()
+    aggregator = NewsAggregator(startup_profile=startup_profile)
     
     # Check command line arguments
-    if len(sys.argv) > 1 and sys.argv[1] == '--once':
+    if len(args) > 0 and args[0] == '--once':
         # Run once and exit
         print("🔄 Running one-time scrape...")
         aggregator.run_once()
@@ -132,9 +187,9 @@ def main():
     else:
         # Run on schedule (every 30 minutes by default)
         interval = 30
-        if len(sys.argv) > 1 and sys.argv[1] == '--interval':
+        if len(args) > 0 and args[0] == '--interval':
             try:
-                interval = int(sys.argv[2])
+                interval = int(args[1])
             except:
                 print("⚠️  Invalid interval, using default (30 minutes)")
         
@@ -145,5 +200,7 @@ if __name__ == "__main__":
     # python main.py              # Run with scheduler (every 30 min)
     # python main.py --once       # Run once and exit
     # python main.py --interval 60  # Run every 60 minutes
+    # python main.py --once --startup-profile  # Also report time-to-first-scrape
+    # python main.py --rebuild-stats  # Recompute the stats counters and rollups from the articles
     
     main()
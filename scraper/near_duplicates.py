@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'near_duplicates.sqlite3')
+
+# MinHash signature: NUM_BINS one-permutation bins, split into BANDS LSH bands
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+SIGNATURE = struct.Struct(f'<{NUM_BINS}Q')
+BAND = struct.Struct(f'<{ROWS}Q')
+
+WORD_PATTERN = re.compile(r'\w+')
+SHINGLE_SIZE = 3
+# Only the opening words are fingerprinted, so the cost per article is bounded;
+# syndicated copies share their opening even when the ends are cut differently
+MAX_WORDS = 2000
+# Fewer shingles than this (a headline-only item) is too little text to compare
+MIN_SHINGLES = 8
+
+
+def near_duplicates_enabled():
+    """Near-duplicate detection runs unless NEAR_DUP=0"""
+    return os.getenv('NEAR_DUP', '1') != '0'
+
+
+def signature(text):
+    """One-permutation MinHash of the text's word 3-shingles, or None for too little text.
+
+    Each shingle is hashed once; the low bits pick one of NUM_BINS bins and
+    the bin keeps its smallest value, so the cost is O(words) rather than
+    O(words x hash functions). Empty bins borrow the next filled bin's value
+    (rotation densification), offset by the distance so they stay distinct.
+    """
+    words = WORD_PATTERN.findall(text.lower())[:MAX_WORDS]
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    empty = 1 << 58
+    bins = [empty] * NUM_BINS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        b, value = h % NUM_BINS, h >> 6
+        if value < bins[b]:
+            bins[b] = value
+
+    sig = list(bins)
+    for b in range(NUM_BINS):
+        if bins[b] == empty:
+            distance = next(d for d in range(1, NUM_BINS) if bins[(b + d) % NUM_BINS] != empty)
+            sig[b] = bins[(b + distance) % NUM_BINS] + (distance << 58)
+    return tuple(sig)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+def band_buckets(sig):
+    """(band, bucket) LSH keys; two signatures share a bucket if a whole band matches"""
+    keys = []
+    for band in range(BANDS):
+        rows = BAND.pack(*sig[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(rows, digest_size=8, person=bytes([band])).digest()
+        keys.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return keys
+
+
+class NearDuplicateIndex:
+    def __init__(self, path=None, threshold=None, retention_days=None, reuse_analysis=None):
+        """Persistent MinHash LSH index of recently analyzed stories.
+
+        Every article gets a signature; candidates are only looked up in
+        the BANDS buckets it hashes to, so a check costs the same however
+        many stories are indexed. A candidate whose estimated similarity is
+        at least threshold (NEAR_DUP_THRESHOLD, default 0.7) is a copy: the
+        article gets duplicateOf = the URL of the first copy seen (the
+        canonical article) and, with reuse_analysis (NEAR_DUP_REUSE_ANALYSIS,
+        default on), that copy's sentiment and keywords instead of being
+        scored again. Stories older than retention_days
+        (NEAR_DUP_RETENTION_DAYS, default 7) are pruned on flush().
+        """
+        self.path = path or os.getenv('NEAR_DUP_INDEX_PATH', DEFAULT_INDEX_PATH)
+        self.threshold = threshold or float(os.getenv('NEAR_DUP_THRESHOLD', '0.7'))
+        self.retention_days = retention_days or float(os.getenv('NEAR_DUP_RETENTION_DAYS', '7'))
+        if reuse_analysis is None:
+            reuse_analysis = os.getenv('NEAR_DUP_REUSE_ANALYSIS', '1') != '0'
+        self.reuse_analysis = reuse_analysis
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS stories (
+                url TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                analysis TEXT,
+                added REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS stories_added ON stories (added);
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (band, bucket, url)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS bands_url ON bands (url);
+        """)
+        self.conn.commit()
+        self._query = "SELECT DISTINCT url FROM bands WHERE " + " OR ".join(["(band = ? AND bucket = ?)"] * BANDS)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {'checked': 0, 'duplicates': 0, 'reused': 0}
+
+    def _best_match(self, sig, url):
+        """(canonical url, similarity, analysis) of the closest indexed copy, or None"""
+        params = [value for key in band_buckets(sig) for value in key]
+        candidates = [row[0] for row in self.conn.execute(self._query, params) if row[0] != url]
+        if not candidates:
+            return None
+        placeholders = ','.join('?' * len(candidates))
+        rows = self.conn.execute(
+            f"SELECT canonical, signature, analysis, added FROM stories WHERE url IN ({placeholders})", candidates
+        ).fetchall()
+        best = None
+        for canonical, stored, analysis, added in rows:
+            score = similarity(sig, SIGNATURE.unpack(stored))
+            # ties go to the oldest story, which is closest to the original
+            if score >= self.threshold and (best is None or (score, -added) > (best[1], -best[3])):
+                best = (canonical, score, analysis, added)
+        return best[:3] if best else None
+
+    def _add(self, url, canonical, sig):
+        self.conn.execute("DELETE FROM bands WHERE url = ?", (url,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO stories (url, canonical, signature, analysis, added) VALUES (?, ?, ?, NULL, ?)",
+            (url, canonical, SIGNATURE.pack(*sig), time.time()),
+        )
+        self.conn.executemany("INSERT OR IGNORE INTO bands (band, bucket, url) VALUES (?, ?, ?)",
+                              [(band, bucket, url) for band, bucket in band_buckets(sig)])
+
+    def link(self, articles, text_of):
+        """Fingerprint and index a batch; return the articles that still need analysis.
+
+        text_of(article) is the text to fingerprint. Copies get duplicateOf
+        and, when reused, the canonical article's sentiment and keywords.
+        Copies within the same batch are found as well.
+        """
+        pending = []
+        with self._lock:
+            for article in articles:
+                url = article.get('url')
+                sig = signature(text_of(article)) if url else None
+                if sig is None:
+                    pending.append(article)
+                    continue
+                self.stats['checked'] += 1
+                match = self._best_match(sig, url)
+                canonical = match[0] if match else url
+                self._add(url, canonical, sig)
+                if not match:
+                    pending.append(article)
+                    continue
+
+                self.stats['duplicates'] += 1
+                article['duplicateOf'] = canonical
+                if self.reuse_analysis and match[2]:
+                    article.update(json.loads(match[2]))
+                    self.stats['reused'] += 1
+                else:
+                    pending.append(article)
+        return pending
+
+    def remember(self, articles):
+        """Store the batch's sentiment and keywords for copies that turn up later"""
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE stories SET analysis = ? WHERE url = ?",
+                [(json.dumps({'sentiment': a['sentiment'], 'keywords': a.get('keywords', []),
+                              'analyzerVersion': a.get('analyzerVersion')}, separators=(',', ':')), a['url'])
+                 for a in articles if a.get('url') and 'sentiment' in a],
+            )
+            self.conn.commit()
+
+    def flush(self):
+        """Prune stories older than the retention window and commit"""
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock:
+            self.conn.execute("DELETE FROM bands WHERE url IN (SELECT url FROM stories WHERE added < ?)", (cutoff,))
+            self.conn.execute("DELETE FROM stories WHERE added < ?", (cutoff,))
+            self.conn.commit()
+
+    def report(self):
+        """Print how many articles were copies of an indexed story"""
+        if not self.stats['checked']:
+            return
+        indexed = self.conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0]
+        print(f"🧬 Near-duplicates: {self.stats['duplicates']}/{self.stats['checked']} articles were copies, "
+              f"{self.stats['reused']} reused the canonical analysis, {indexed} stories indexed")
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
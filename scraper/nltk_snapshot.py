@@ -0,0 +1,108 @@
+"""Prebuilt VADER lexicon and stopword snapshot.
+
+Run once at build time (see render.yaml):
+    python nltk_snapshot.py            # downloads the NLTK data if needed, writes the snapshot
+
+SentimentAnalyzer loads the snapshot instead of probing/downloading NLTK
+data, unzipping and parsing vader_lexicon.txt and reading the stopwords
+corpus. The file is read through a read-only memory map straight into the
+lexicon dict and stopword set: no import of NLTK's corpus readers, no unzip
+and no text parsing.
+
+Layout (little endian):
+    8 bytes   magic + format version
+    4 x u32   lexicon word count, lexicon blob length, stopword count, stopword blob length
+    f64 * N   lexicon valences, in word order
+    bytes     lexicon words, UTF-8, newline separated
+    bytes     stopwords, UTF-8, newline separated
+"""
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b'VADSNAP1'
+HEADER = struct.Struct('<8s4I')
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'nltk_snapshot.bin')
+
+NLTK_PACKAGES = (('vader_lexicon', 'sentiment/vader_lexicon.zip'), ('stopwords', 'corpora/stopwords'))
+
+
+def snapshot_path():
+    return os.getenv('SENTIMENT_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+
+
+class Snapshot:
+    def __init__(self, lexicon, stopwords):
+        self.lexicon = lexicon
+        self.stopwords = stopwords
+
+
+def ensure_nltk_data():
+    """Download the NLTK data the analyzer needs, if it isn't installed yet"""
+    import nltk
+    for package, resource in NLTK_PACKAGES:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            print(f"📦 Downloading NLTK {package}...")
+            nltk.download(package, quiet=True)
+
+
+def build(path=None):
+    """Load the lexicon and stopwords through NLTK and write the snapshot to path"""
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    from nltk.corpus import stopwords
+    ensure_nltk_data()
+    lexicon = SentimentIntensityAnalyzer().lexicon
+    stop_words = sorted(set(stopwords.words('english')))
+
+    words = list(lexicon)
+    lexicon_blob = '\n'.join(words).encode('utf-8')
+    stop_blob = '\n'.join(stop_words).encode('utf-8')
+    valences = struct.pack(f'<{len(words)}d', *(lexicon[word] for word in words))
+
+    path = path or snapshot_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(words), len(lexicon_blob), len(stop_words), len(stop_blob)))
+        f.write(valences)
+        f.write(lexicon_blob)
+        f.write(stop_blob)
+    os.replace(tmp, path)
+    return path, len(words), len(stop_words)
+
+
+def load(path=None):
+    """Return the Snapshot at path, or None if it is missing or unreadable"""
+    path = path or snapshot_path()
+    try:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, word_count, lexicon_len, stop_count, stop_len = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            return None
+        offset = HEADER.size
+        valences = struct.unpack_from(f'<{word_count}d', mm, offset)
+        offset += 8 * word_count
+        words = mm[offset:offset + lexicon_len].decode('utf-8').split('\n') if word_count else []
+        offset += lexicon_len
+        stop_words = mm[offset:offset + stop_len].decode('utf-8').split('\n') if stop_count else []
+        if len(words) != word_count or len(stop_words) != stop_count:
+            return None
+        return Snapshot(dict(zip(words, valences)), set(stop_words))
+    except (struct.error, UnicodeDecodeError):
+        return None
+    finally:
+        mm.close()
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    path, word_count, stop_count = build()
+    print(f"✅ Wrote {path}: {word_count} lexicon words, {stop_count} stopwords "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,269 @@
+import os
+import queue
+import threading
+import time
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name):
+        """Per-stage counters: items handled, busy time and time items spent queued"""
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.max_item = 0.0
+        self.queue_wait = 0.0
+        # perf_counter() when the stage finished its first item
+        self.first_at = None
+        self._lock = threading.Lock()
+
+    def record(self, items, busy, queue_wait=0.0):
+        with self._lock:
+            if items and self.first_at is None:
+                self.first_at = time.perf_counter()
+            self.items += items
+            self.busy += busy
+            self.queue_wait += queue_wait
+            if items:
+                self.max_item = max(self.max_item, busy / items)
+
+    def summary(self):
+        per_item = self.busy / self.items if self.items else 0.0
+        waited = self.queue_wait / self.items if self.items else 0.0
+        return (f"{self.name:<8} {self.items:4d} items, busy {self.busy:6.2f}s, "
+                f"{per_item * 1000:7.1f} ms/item (max {self.max_item * 1000:.1f} ms), "
+                f"queued {waited * 1000:.1f} ms/item")
+
+
+class ArticlePipeline:
+    def __init__(self, scrapers, sentiment_analyzer, db, max_articles=15,
+                 source_workers=None, source_timeout=None, queue_size=None,
+                 analyze_batch_size=None, store_batch_size=None, near_duplicates=None):
+        """Streaming scrape -> analyze -> store pipeline.
+
+        Every source is a producer thread feeding articles into a bounded
+        queue as soon as each one is scraped; one analyzer thread scores them
+        in small batches and hands them to a writer thread through a second
+        bounded queue. Full queues block the stage before them (backpressure),
+        so at most queue_size articles wait between two stages and the first
+        articles reach MongoDB while slower sources are still scraping.
+
+        Defaults come from SCRAPER_SOURCE_WORKERS, SCRAPER_SOURCE_TIMEOUT,
+        PIPELINE_QUEUE_SIZE, PIPELINE_ANALYZE_BATCH and PIPELINE_STORE_BATCH.
+        
+        With a NearDuplicateIndex, the analyzer thread links copies of an
+        already seen story to it before scoring and only scores the rest.
+
+        If the analyze or store stage raises, the other stages and the
+        sources are stopped; run() reports the error (last_run['failures'])
+        and returns what was stored before it.
+        """
+        self.scrapers = scrapers
+        self.sentiment_analyzer = sentiment_analyzer
+        self.db = db
+        self.max_articles = max_articles
+        self.source_workers = source_workers or int(os.getenv('SCRAPER_SOURCE_WORKERS', '0')) or len(scrapers)
+        self.source_timeout = source_timeout or float(os.getenv('SCRAPER_SOURCE_TIMEOUT', '300'))
+        self.queue_size = queue_size or int(os.getenv('PIPELINE_QUEUE_SIZE', '32'))
+        self.analyze_batch_size = analyze_batch_size or int(os.getenv('PIPELINE_ANALYZE_BATCH', '8'))
+        self.store_batch_size = store_batch_size or int(os.getenv('PIPELINE_STORE_BATCH', '20'))
+        self.near_duplicates = near_duplicates
+        # Counters of the most recent run(): scraped, inserted, elapsed, stages
+        self.last_run = None
+
+    def _put(self, q, item, stop):
+        """Blocking put that gives up once stop is set"""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q, stop):
+        """Blocking get that returns _DONE once stop is set"""
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _drain(self, q, first, limit):
+        """Collect first plus whatever else is already queued, up to limit items"""
+        batch = [first]
+        while len(batch) < limit:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_source(self, slots, *args):
+        """Source thread body: wait for one of the source_workers slots, then scrape"""
+        with slots:
+            self._produce(*args)
+
+    def _produce(self, source_name, ScraperClass, scraped_q, stop, started, stats, errors, counts):
+        started[source_name] = time.monotonic()
+        print(f"\n📰 Scraping {source_name.upper()}...")
+        articles = None
+        try:
+            scraper = ScraperClass()
+            articles = scraper.iter_articles(max_articles=self.max_articles, seen_urls=self.db.get_existing_urls)
+            last = time.perf_counter()
+            for article in articles:
+                now = time.perf_counter()
+                stats.record(1, now - last)
+                if not self._put(scraped_q, (article, time.perf_counter()), stop[source_name]):
+                    break
+                counts[source_name] = counts.get(source_name, 0) + 1
+                last = time.perf_counter()
+        except Exception as e:
+            errors[source_name] = e
+        finally:
+            if articles is not None:
+                articles.close()
+
+    def _analyze(self, scraped_q, stored_q, stop, stats, failures):
+        try:
+            # Load the lexicon while the sources are still scraping
+            warm_up = getattr(self.sentiment_analyzer, 'warm_up', None)
+            if warm_up:
+                warm_up()
+            done = False
+            while not done:
+                first = self._get(scraped_q, stop)
+                if first is _DONE:
+                    break
+                batch, done = self._drain(scraped_q, first, self.analyze_batch_size)
+                now = time.perf_counter()
+                waited = sum(now - queued_at for _, queued_at in batch)
+
+                start = time.perf_counter()
+                articles = [article for article, _ in batch]
+                if self.near_duplicates:
+                    fresh = self.near_duplicates.link(articles, self.sentiment_analyzer.text_to_analyze)
+                    if fresh:
+                        self.sentiment_analyzer.batch_analyze(fresh)
+                    # Copies reusing an analysis still count as documents for the keyword stats
+                    analyzed = {id(article) for article in fresh}
+                    count_terms = getattr(self.sentiment_analyzer, 'count_keyword_terms', None)
+                    if count_terms:
+                        count_terms([article for article in articles if id(article) not in analyzed])
+                    self.near_duplicates.remember(articles)
+                else:
+                    articles = self.sentiment_analyzer.batch_analyze(articles)
+                stats.record(len(batch), time.perf_counter() - start, waited)
+
+                for article in articles:
+                    self._put(stored_q, (article, time.perf_counter()), stop)
+        except Exception as e:
+            # Stops the writer and the sources too, so run() returns
+            failures['analyze'] = e
+            stop.set()
+        finally:
+            self._put(stored_q, _DONE, stop)
+
+    def _store(self, stored_q, stop, stats, totals, failures):
+        try:
+            done = False
+            while not done:
+                first = self._get(stored_q, stop)
+                if first is _DONE:
+                    break
+                batch, done = self._drain(stored_q, first, self.store_batch_size)
+                now = time.perf_counter()
+                waited = sum(now - queued_at for _, queued_at in batch)
+
+                start = time.perf_counter()
+                totals['inserted'] += self.db.insert_articles([article for article, _ in batch])
+                stats.record(len(batch), time.perf_counter() - start, waited)
+        except Exception as e:
+            failures['store'] = e
+            stop.set()
+
+    def run(self):
+        """Run one scrape/analyze/store cycle. Returns the number of articles inserted."""
+        scraped_q = queue.Queue(maxsize=self.queue_size)
+        stored_q = queue.Queue(maxsize=self.queue_size)
+        stages = {name: StageStats(name) for name in ('scrape', 'analyze', 'store')}
+        stop = {source_name: threading.Event() for source_name in self.scrapers}
+        consumers_stop = threading.Event()
+        started, errors, counts, failures = {}, {}, {}, {}
+        totals = {'inserted': 0}
+        cycle_start = time.perf_counter()
+
+        analyzer = threading.Thread(target=self._analyze, name='analyze',
+                                    args=(scraped_q, stored_q, consumers_stop, stages['analyze'], failures))
+        writer = threading.Thread(target=self._store, name='store',
+                                  args=(stored_q, consumers_stop, stages['store'], totals, failures))
+        analyzer.start()
+        writer.start()
+
+        # Daemon threads rather than an executor: a source abandoned after
+        # source_timeout must not keep the interpreter from exiting
+        slots = threading.BoundedSemaphore(self.source_workers)
+        sources = {}
+        for source_name, ScraperClass in self.scrapers.items():
+            sources[source_name] = threading.Thread(
+                target=self._run_source, name=f'source-{source_name}', daemon=True,
+                args=(slots, source_name, ScraperClass, scraped_q, stop,
+                      started, stages['scrape'], errors, counts),
+            )
+            sources[source_name].start()
+
+        pending = set(sources)
+        while pending:
+            if consumers_stop.is_set():
+                # Analysis or storage failed: nothing would take the articles
+                for event in stop.values():
+                    event.set()
+                break
+            now = time.monotonic()
+            for source_name in list(pending):
+                if not sources[source_name].is_alive():
+                    pending.discard(source_name)
+                    if source_name in errors:
+                        print(f"❌ Error scraping {source_name}: {str(errors[source_name])}")
+                    else:
+                        print(f"✅ Got {counts.get(source_name, 0)} articles from {source_name}")
+                elif source_name in started and now - started[source_name] > self.source_timeout:
+                    # Stop taking its articles; the thread finishes in the background
+                    stop[source_name].set()
+                    pending.discard(source_name)
+                    print(f"❌ Error scraping {source_name}: timed out after {self.source_timeout:.0f}s")
+            if pending:
+                time.sleep(0.2)
+
+        # Everything scraped is already queued; let analysis and storage drain it
+        self._put(scraped_q, _DONE, consumers_stop)
+        analyzer.join()
+        writer.join()
+        if self.near_duplicates:
+            try:
+                self.near_duplicates.flush()
+            except Exception as e:
+                failures['flush'] = e
+
+        elapsed = time.perf_counter() - cycle_start
+        self.last_run = {
+            'scraped': sum(counts.values()),
+            'inserted': totals['inserted'],
+            'elapsed': elapsed,
+            'stages': stages,
+            'failures': failures,
+        }
+        for stage, error in failures.items():
+            print(f"❌ Pipeline {stage} stage failed: {type(error).__name__}: {str(error)}")
+        print(f"\n📊 Pipeline: {self.last_run['scraped']} articles scraped, {totals['inserted']} inserted "
+              f"in {elapsed:.2f}s")
+        for stage in stages.values():
+            print(f"   {stage.summary()}")
+        return totals['inserted']
@@ -0,0 +1,207 @@
+"""Re-score stored articles with the current SentimentAnalyzer.
+
+Usage (from the scraper/ directory):
+    python rescore.py                        # articles not scored by this analyzer version yet
+    python rescore.py --all                  # every article, whatever version scored it
+    python rescore.py --workers 4 --batch-size 1000 --limit 50000
+    python rescore.py --restart              # ignore the checkpoint of an interrupted run
+
+Articles are read in _id order through one server-side cursor, with only
+the text fields projected, scored batch by batch (on a worker pool with
+--workers > 1, with the numpy backend unless SENTIMENT_BACKEND says
+otherwise) and written back with unordered bulk updates that also set
+analyzerVersion. The next batch is scored while the previous one is being
+written. After every write the last _id is saved to a checkpoint file, so
+an interrupted run (Ctrl+C, lost connection) continues where it stopped.
+
+Target: RESCORE_TARGET_RATE articles/second (default 35, a million articles
+in about 8 hours). The rate and the projected time for a million articles
+are printed as the job runs.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+from sentiment_analyzer import SentimentAnalyzer
+from db_handler import DatabaseHandler
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'rescore_checkpoint.json')
+
+# A lost cursor or connection is retried from the checkpoint this many times
+MAX_RETRIES = 5
+
+
+def format_duration(seconds):
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+class Rescorer:
+    def __init__(self, db, analyzer, batch_size=500, checkpoint_path=None, target_rate=None):
+        """Bulk re-scoring job over db.articles with a resumable checkpoint"""
+        self.db = db
+        self.analyzer = analyzer
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path or os.getenv('RESCORE_CHECKPOINT_PATH', DEFAULT_CHECKPOINT_PATH)
+        self.target_rate = target_rate or float(os.getenv('RESCORE_TARGET_RATE', '35'))
+
+    def load_checkpoint(self, redo_all):
+        """The saved progress of an unfinished run of the same job, or None"""
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('version') != self.analyzer.version or checkpoint.get('all') != redo_all:
+            return None
+        return checkpoint
+
+    def save_checkpoint(self, checkpoint):
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        tmp = self.checkpoint_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_path)
+        except OSError:
+            pass
+
+    def run(self, redo_all=False, restart=False, limit=None):
+        """Re-score articles until none are left (or limit is reached); returns the progress counters"""
+        checkpoint = None if restart else self.load_checkpoint(redo_all)
+        if checkpoint:
+            print(f"⏯️  Resuming after {checkpoint['processed']:,} articles (last _id {checkpoint['last_id']})")
+        else:
+            checkpoint = {'version': self.analyzer.version, 'all': redo_all, 'last_id': None,
+                          'processed': 0, 'updated': 0, 'failed': 0, 'elapsed': 0.0}
+
+        after_id = ObjectId(checkpoint['last_id']) if checkpoint['last_id'] else None
+        remaining = self.db.count_articles_to_rescore(self.analyzer.version, after_id, redo_all)
+        if limit:
+            remaining = min(remaining, limit)
+        print(f"🔁 Re-scoring {remaining:,} articles with analyzer {self.analyzer.version} "
+              f"({self.batch_size} per batch, {self.analyzer.workers} workers)")
+
+        self.remaining, self.processed_before = remaining, checkpoint['processed']
+        retries = 0
+        while True:
+            try:
+                finished = self._run_batches(checkpoint, redo_all, limit)
+                break
+            except PyMongoError as e:
+                retries += 1
+                if retries > MAX_RETRIES:
+                    print(f"❌ Giving up after {MAX_RETRIES} retries: {str(e)}; run again to resume")
+                    return checkpoint
+                print(f"⚠️  MongoDB error ({str(e)}), resuming from the checkpoint (retry {retries})")
+                time.sleep(min(2 ** retries, 30))
+
+        if finished:
+            self.clear_checkpoint()
+        self._report(checkpoint, final=True)
+        if checkpoint['updated']:
+            # Labels changed in place, which the insert-time counters don't see
+            self.db.rebuild_stats()
+            self.db.rebuild_rollups()
+        return checkpoint
+
+    def _run_batches(self, checkpoint, redo_all, limit):
+        """Score and write batches from the checkpoint on; True once no articles are left"""
+        after_id = ObjectId(checkpoint['last_id']) if checkpoint['last_id'] else None
+        batches = self.db.iter_articles_to_rescore(self.analyzer.version, after_id, self.batch_size, redo_all)
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rescore-write')
+        pending = None
+        start = time.perf_counter() - checkpoint['elapsed']
+        last_report = time.perf_counter()
+        # Counted from the checkpoint, so a retry doesn't start --limit over
+        scored = checkpoint['processed'] - self.processed_before
+        try:
+            if limit and scored >= limit:
+                return False
+            for batch in batches:
+                if limit and scored + len(batch) >= limit:
+                    batch = batch[:limit - scored]
+                analyzed = self.analyzer.batch_analyze(batch, verbose=False)
+                scored += len(batch)
+
+                # Write this batch while the next one is read and scored
+                if pending:
+                    self._finish_write(pending, checkpoint, start)
+                pending = (writer.submit(self.db.update_analyses, analyzed), analyzed)
+
+                if time.perf_counter() - last_report >= 10:
+                    self._report(checkpoint)
+                    last_report = time.perf_counter()
+                if limit and scored >= limit:
+                    break
+            else:
+                limit = None
+            if pending:
+                self._finish_write(pending, checkpoint, start)
+                pending = None
+            return not limit
+        finally:
+            batches.close()
+            writer.shutdown(wait=True)
+
+    def _finish_write(self, pending, checkpoint, start):
+        """Wait for a batch's bulk write and move the checkpoint past it"""
+        future, analyzed = pending
+        updated = future.result()
+        checkpoint['processed'] += len(analyzed)
+        checkpoint['updated'] += updated
+        checkpoint['failed'] += sum('sentiment' not in a for a in analyzed)
+        checkpoint['last_id'] = str(analyzed[-1]['_id'])
+        checkpoint['elapsed'] = time.perf_counter() - start
+        self.save_checkpoint(checkpoint)
+
+    def _report(self, checkpoint, final=False):
+        rate = checkpoint['processed'] / checkpoint['elapsed'] if checkpoint['elapsed'] else 0.0
+        left = max(self.remaining - (checkpoint['processed'] - self.processed_before), 0)
+        eta = f", {format_duration(left / rate)} left" if rate and not final else ""
+        print(f"   {checkpoint['processed']:,} articles ({checkpoint['updated']:,} updated, "
+              f"{checkpoint['failed']:,} failed), {rate:.0f}/s{eta}")
+        if final and rate:
+            million = format_duration(1_000_000 / rate)
+            mark = "✅" if rate >= self.target_rate else "⚠️ "
+            print(f"{mark} Re-scoring done: {rate:.0f} articles/s, a million articles would take {million} "
+                  f"(target {self.target_rate:.0f}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--all', action='store_true', help='re-score articles already scored by this version too')
+    parser.add_argument('--restart', action='store_true', help='start over instead of resuming')
+    parser.add_argument('--batch-size', type=int, default=int(os.getenv('RESCORE_BATCH_SIZE', '500')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SENTIMENT_WORKERS', '0')),
+                        help='scoring processes (0 = one per CPU)')
+    parser.add_argument('--limit', type=int, help='stop after this many articles')
+    args = parser.parse_args()
+
+    # Stored articles were counted into the keyword statistics when they were scraped;
+    # scoring stays in this process (and its pool) rather than going to a sentiment service
+    analyzer = SentimentAnalyzer(
+        workers=args.workers, chunk_size=max(args.batch_size // max(args.workers or os.cpu_count() or 1, 1), 1),
+        use_cache=False, backend=os.getenv('SENTIMENT_BACKEND', 'numpy'), update_keyword_stats=False,
+        service_url='',
+    )
+    db = DatabaseHandler()
+    try:
+        Rescorer(db, analyzer, batch_size=args.batch_size).run(
+            redo_all=args.all, restart=args.restart, limit=args.limit)
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped; run again to resume from the checkpoint")
+    finally:
+        analyzer.close()
+        db.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,103 +1,133 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import time
 from datetime import datetime
-import os
-import requests
+from scrapers.fetcher import ConcurrentFetcher, drop_seen_articles
+from scrapers.http_client import get_http_client
+from scrapers.browser_pool import get_browser_pool, wait_for_tag
+from scrapers.parsing import make_soup, strainer
+from scrapers.feeds import FeedReader, feeds_enabled
+
+LISTING_SELECTOR = "div[data-testid='card-text-wrapper'], div[data-testid='dundee-card'], div.gs-c-promo, article"
+
+# Only the elements the listing and article extractors select are parsed
+LISTING_STRAINER = strainer(
+    tags={'article'},
+    classes={'div': {'gs-c-promo'}},
+    attr_values={'div': {'data-testid': {'card-text-wrapper', 'dundee-card'}}},
+)
+ARTICLE_STRAINER = strainer(
+    tags={'article', 'p'},
+    attr_values={'div': {'data-component': {'text-block'}, 'data-testid': {'article-body', 'main-content'}}},
+)
+# Bump when article parsing changes, so pages cached with the old parser's
+# extract are parsed again on a 304 (see HttpClient.remember_extract)
+ARTICLE_EXTRACT_VERSION = 1
 
 class BBCScraper:
     def __init__(self):
-        self.setup_driver()
         self.base_url = "https://www.bbc.com/news"
+        self.feed_url = "https://feeds.bbci.co.uk/news/rss.xml"
+        self.http = get_http_client()
+        self.feeds = FeedReader(self.http)
+        self.fetcher = ConcurrentFetcher()
+        # Chrome is borrowed from the shared pool only while a page is rendered
+        self.browsers = get_browser_pool()
         
-    def setup_driver(self):
-        """Setup Selenium WebDriver with Chrome"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in background
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        # Install or get chromedriver path from webdriver-manager and resolve the actual executable
-        driver_install_path = ChromeDriverManager().install()
-        exe_path = None
-        try:
-            if os.path.isfile(driver_install_path) and driver_install_path.lower().endswith('.exe'):
-                exe_path = driver_install_path
-            else:
-                # Sometimes install() returns a folder or a helper file; search the returned path for the exe
-                base = driver_install_path if os.path.isdir(driver_install_path) else os.path.dirname(driver_install_path)
-                for root, _, files in os.walk(base):
-                    for f in files:
-                        if 'chromedriver' in f.lower() and f.lower().endswith('.exe'):
-                            exe_path = os.path.join(root, f)
-                            break
-                    if exe_path:
-                        break
-        except Exception:
-            exe_path = None
-
-        # Fallback: let webdriver-manager handle it if we couldn't find the exe explicitly
-        service = Service(exe_path or driver_install_path)
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-    def scrape_articles(self, max_articles=20):
+    def scrape_articles(self, max_articles=20, seen_urls=None):
         """Scrape BBC News articles"""
-        articles = []
+        return list(self.iter_articles(max_articles, seen_urls))
+    
+    def iter_articles(self, max_articles=20, seen_urls=None):
+        """Yield BBC News articles one by one, as soon as each full page is fetched"""
+        count = 0
         
         try:
             print("🔍 Scraping BBC News...")
-            self.driver.get(self.base_url)
+            listed = self.list_from_feed(max_articles) if feeds_enabled() else []
+            if not listed:
+                listed = self.list_from_page(max_articles)
+
+            # Skip anything already stored before paying for the page fetch and analysis
+            listed = drop_seen_articles(listed, seen_urls)
+
+            # Fetch full article content concurrently (requests fast path, selenium fallback)
+            start = time.perf_counter()
+            results = []
+            for article_data, result in zip(listed, self.fetcher.imap(self.fetch_full_article, [a['url'] for a in listed])):
+                results.append(result)
+                if result.value:
+                    article_data['content'] = result.value  # prefer full content when available
+                count += 1
+                print(f"✅ Scraped: {article_data['title'][:50]}...")
+                yield article_data
+            self.fetcher.report(results, time.perf_counter() - start, label='BBC article fetch')
+                    
+        except Exception as e:
+            print(f"❌ Error scraping BBC: {str(e)}")
+            
+        print(f"✅ Total articles scraped from BBC: {count}")
+    
+    def list_from_feed(self, max_articles):
+        """Listing items from the BBC RSS feed; empty list if the feed is unusable"""
+        try:
+            items = self.feeds.read(self.feed_url, max_items=max_articles)
+        except Exception as e:
+            print(f"⚠️  BBC feed failed, falling back to the rendered listing page: {e}")
+            return []
+
+        print(f"📡 BBC feed returned {len(items)} items")
+        listed = []
+        for item in items:
+            listed.append({
+                'title': item['title'],
+                # the feed appends ?at_medium=RSS&at_campaign=... tracking parameters
+                'url': item['url'].split('?', 1)[0],
+                'description': item['description'],
+                'source': 'BBC News',
+                'category': 'General',
+                'publishedDate': item['publishedDate'] or datetime.utcnow().isoformat(),
+                'scrapedAt': datetime.utcnow().isoformat(),
+                'content': item['description'],  # replaced by the full text once fetched
+                'image': item['image']
+            })
+        return listed
+    
+    def list_from_page(self, max_articles):
+        """Listing items from the Selenium-rendered https://www.bbc.com/news page"""
+        with self.browsers.driver() as driver:
+            driver.get(self.base_url)
             
             # Wait for page to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "article"))
-            )
+            wait_for_tag(driver, 'article', 10)
             
             # Scroll to load more content
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
             time.sleep(2)
-            
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Find article elements (BBC structure may vary). Try multiple selectors as fallbacks.
-            # Use CSS selectors to combine possibilities observed in DevTools.
-            article_elements = soup.select(
-                "div[data-testid='card-text-wrapper'], div[data-testid='dundee-card'], div.gs-c-promo, article"
-            )
+            page_source = driver.page_source
+        
+        # Get page source and parse the article cards with BeautifulSoup
+        soup = make_soup(page_source, LISTING_STRAINER)
+        
+        # Find article elements (BBC structure may vary). Try multiple selectors as fallbacks.
+        # Use CSS selectors to combine possibilities observed in DevTools.
+        article_elements = soup.select(LISTING_SELECTOR)
 
-            # Debug: show how many elements matched and sample HTML for first few
-            print(f"🔎 BBC selector matched {len(article_elements)} elements")
-            if article_elements:
-                sample = article_elements[0]
-                sample_text = sample.get_text(" ", strip=True)[:200]
-                print(f"   Sample text: {sample_text}")
-            
-            for idx, article in enumerate(article_elements[:max_articles]):
-                try:
-                    article_data = self.extract_article_data(article)
-                    if article_data:
-                        articles.append(article_data)
-                        print(f"✅ Scraped: {article_data['title'][:50]}...")
-                except Exception as e:
-                    print(f"❌ Error extracting article {idx}: {str(e)}")
-                    continue
-                    
-        except Exception as e:
-            print(f"❌ Error scraping BBC: {str(e)}")
-        finally:
-            self.driver.quit()
-            
-        print(f"✅ Total articles scraped from BBC: {len(articles)}")
-        return articles
+        # Debug: show how many elements matched and sample HTML for first few
+        print(f"🔎 BBC selector matched {len(article_elements)} elements")
+        if article_elements:
+            sample = article_elements[0]
+            sample_text = sample.get_text(" ", strip=True)[:200]
+            print(f"   Sample text: {sample_text}")
+        
+        listed = []
+        for idx, article in enumerate(article_elements[:max_articles]):
+            try:
+                article_data = self.extract_article_data(article)
+                if article_data:
+                    listed.append(article_data)
+            except Exception as e:
+                print(f"❌ Error extracting article {idx}: {str(e)}")
+                continue
+        return listed
     
     def extract_article_data(self, article_element):
         """Extract data from a single article element"""
@@ -162,9 +192,6 @@ class BBCScraper:
             time_elem = article_element.find('time')
             published_date = time_elem['datetime'] if time_elem and time_elem.get('datetime') else None
             
-            # Try to fetch full article content (requests fast path, selenium fallback)
-            content = self.fetch_full_article(url)
-
             return {
                 'title': title,
                 'url': url,
@@ -173,7 +200,7 @@ class BBCScraper:
                 'category': 'General',
                 'publishedDate': published_date or datetime.utcnow().isoformat(),
                 'scrapedAt': datetime.utcnow().isoformat(),
-                'content': content or description,  # prefer full content when available
+                'content': description,  # replaced by the full text once fetched
                 'image': image_url
             }
             
@@ -181,65 +208,69 @@ class BBCScraper:
             print(f"Error in extract_article_data: {str(e)}")
             return None
 
+    def extract_paragraphs(self, soup):
+        """Extract body paragraphs from an article page using common BBC patterns"""
+        texts = []
+        # Common selectors for BBC article body
+        selectors = [
+            'article',
+            "div[data-component='text-block']",
+            "div[data-testid='article-body']",
+            "div[data-testid='main-content']",
+            "div.ssrcss-.*-RichTextComponentWrapper",
+        ]
+        for sel in selectors:
+            try:
+                nodes = soup.select(sel)
+            except Exception:
+                nodes = []
+            if not nodes:
+                continue
+            for node in nodes:
+                for p in node.find_all('p'):
+                    t = p.get_text(strip=True)
+                    if t and len(t) > 20:
+                        texts.append(t)
+            if texts:
+                break
+
+        # Fallback: all p tags
+        if not texts:
+            for p in soup.find_all('p'):
+                t = p.get_text(strip=True)
+                if t and len(t) > 30:
+                    texts.append(t)
+        return texts
+
     def fetch_full_article(self, url, timeout=8):
         """Fetch full article content. Try requests first, then Selenium if JS renders the content."""
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
         paragraphs = []
 
-        # Helper to extract paragraphs from a BeautifulSoup object using common BBC patterns
-        def extract_from_soup(soup):
-            texts = []
-            # Common selectors for BBC article body
-            selectors = [
-                'article',
-                "div[data-component='text-block']",
-                "div[data-testid='article-body']",
-                "div[data-testid='main-content']",
-                "div.ssrcss-.*-RichTextComponentWrapper",
-            ]
-            for sel in selectors:
-                try:
-                    nodes = soup.select(sel)
-                except Exception:
-                    nodes = []
-                if not nodes:
-                    continue
-                for node in nodes:
-                    for p in node.find_all('p'):
-                        t = p.get_text(strip=True)
-                        if t and len(t) > 20:
-                            texts.append(t)
-                if texts:
-                    break
-
-            # Fallback: all p tags
-            if not texts:
-                for p in soup.find_all('p'):
-                    t = p.get_text(strip=True)
-                    if t and len(t) > 30:
-                        texts.append(t)
-            return texts
-
         # Try requests first
         try:
-            r = requests.get(url, headers=headers, timeout=10)
+            r = self.http.get(url, extract_version=ARTICLE_EXTRACT_VERSION)
+            if r.cached_extract:
+                # 304 Not Modified: reuse what we parsed out of this page last time
+                return r.cached_extract
             if r.status_code == 200 and len(r.text) > 1000:
-                soup = BeautifulSoup(r.text, 'html.parser')
-                paragraphs = extract_from_soup(soup)
+                soup = make_soup(r.text, ARTICLE_STRAINER)
+                paragraphs = self.extract_paragraphs(soup)
                 if paragraphs:
-                    return "\n\n".join(paragraphs)
+                    content = "\n\n".join(paragraphs)
+                    self.http.remember_extract(url, content, ARTICLE_EXTRACT_VERSION)
+                    return content
         except Exception:
             paragraphs = []
 
         # Fallback to Selenium (rendered content)
         try:
-            # reuse the existing driver to load article page
-            self.driver.get(url)
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, 'article'))
-            )
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            paragraphs = extract_from_soup(soup)
+            # borrow a pooled browser to load the article page
+            with self.browsers.driver() as driver:
+                driver.get(url)
+                wait_for_tag(driver, 'article', timeout)
+                page_source = driver.page_source
+            soup = make_soup(page_source, ARTICLE_STRAINER)
+            paragraphs = self.extract_paragraphs(soup)
             return "\n\n".join(paragraphs) if paragraphs else None
         except Exception:
             return None
@@ -249,3 +280,4 @@ if __name__ == "__main__":
     articles = scraper.scrape_articles(max_articles=10)
     for article in articles:
         print(f"\n{article['title']}\n{article['url']}\n")
+    get_browser_pool().close()
@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+DRIVER_PATH_FILE = os.path.join(CACHE_DIR, 'chromedriver_path')
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _find_chromedriver(install_path):
+    """webdriver-manager sometimes returns a folder or a helper file; find the real executable"""
+    names = ('chromedriver', 'chromedriver.exe')
+    if os.path.isfile(install_path) and os.path.basename(install_path).lower() in names:
+        return install_path
+    base = install_path if os.path.isdir(install_path) else os.path.dirname(install_path)
+    for root, _, files in os.walk(base):
+        for f in files:
+            if f.lower() in names:
+                return os.path.join(root, f)
+    return install_path
+
+
+def resolve_chromedriver_path():
+    """Return the chromedriver executable path, resolving it at most once.
+
+    Order: CHROMEDRIVER_PATH, the in-process value, the path remembered in
+    .cache/chromedriver_path by an earlier run, then webdriver-manager.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.isfile(_driver_path):
+            return _driver_path
+
+        path = os.getenv('CHROMEDRIVER_PATH')
+        if not path and os.path.exists(DRIVER_PATH_FILE):
+            with open(DRIVER_PATH_FILE) as f:
+                path = f.read().strip()
+        if not path or not os.path.isfile(path):
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = _find_chromedriver(ChromeDriverManager().install())
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(DRIVER_PATH_FILE, 'w') as f:
+                    f.write(path)
+            except OSError:
+                pass
+
+        _driver_path = path
+        return path
+
+
+def chrome_options():
+    """Headless Chrome options shared by every pooled browser"""
+    # Selenium is imported on first use so runs that never need a browser skip it
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-software-rasterizer')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-features=VizDisplayCompositor')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    options.add_argument('--window-size=1920,1080')
+    return options
+
+
+def wait_for_tag(driver, tag, timeout):
+    """Wait until an element with the given tag name is on the page"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, tag)))
+
+
+class _PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    def __init__(self, max_size=None, max_pages=None, wait_timeout=None):
+        """Pool of headless Chrome instances shared by the Selenium fallbacks.
+
+        Browsers are launched lazily, at most max_size at a time
+        (SCRAPER_BROWSER_POOL_SIZE), and recycled after max_pages borrows
+        (SCRAPER_BROWSER_MAX_PAGES) or as soon as one stops responding.
+        Borrowers wait up to wait_timeout seconds for a free browser.
+        SCRAPER_BROWSER_DISABLED=1 turns every borrow into an error, so the
+        Selenium fallbacks are skipped (e.g. on hosts without Chrome).
+        """
+        self.max_size = max_size or int(os.getenv('SCRAPER_BROWSER_POOL_SIZE', '2'))
+        self.max_pages = max_pages or int(os.getenv('SCRAPER_BROWSER_MAX_PAGES', '25'))
+        self.wait_timeout = wait_timeout or float(os.getenv('SCRAPER_BROWSER_WAIT_TIMEOUT', '120'))
+        self.disabled = os.getenv('SCRAPER_BROWSER_DISABLED', '0') == '1'
+
+        self._idle = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            'borrows': 0, 'wait_time': 0.0, 'max_wait': 0.0,
+            'launches': 0, 'launch_time': 0.0, 'recycled': 0, 'crashed': 0,
+        }
+
+    def _launch(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        start = time.perf_counter()
+        service = Service(resolve_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=chrome_options())
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self.stats['launches'] += 1
+            self.stats['launch_time'] += elapsed
+        print(f"🌐 Launched headless Chrome in {elapsed:.2f}s")
+        return _PooledDriver(driver)
+
+    def _acquire(self):
+        if self.disabled:
+            raise RuntimeError("browser fallbacks are disabled (SCRAPER_BROWSER_DISABLED=1)")
+        start = time.perf_counter()
+        deadline = start + self.wait_timeout
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser free after {self.wait_timeout:.0f}s")
+                self._cond.wait(remaining)
+
+            waited = time.perf_counter() - start
+            self.stats['borrows'] += 1
+            self.stats['wait_time'] += waited
+            self.stats['max_wait'] = max(self.stats['max_wait'], waited)
+
+            if self._idle:
+                return self._idle.pop()
+            self._size += 1
+
+        # Launch outside the lock so other borrowers aren't blocked on Chrome startup
+        try:
+            return self._launch()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, pooled, healthy):
+        pooled.pages += 1
+        retire = not healthy or pooled.pages >= self.max_pages
+        with self._cond:
+            if retire:
+                self._size -= 1
+                self.stats['crashed' if not healthy else 'recycled'] += 1
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+        if retire:
+            self._quit(pooled)
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(pooled):
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def driver(self):
+        """Borrow a WebDriver for the duration of a with block"""
+        pooled = self._acquire()
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            # Page timeouts are fine, a dead browser is not
+            healthy = self._is_alive(pooled)
+            raise
+        finally:
+            self._release(pooled, healthy)
+
+    def report(self):
+        """Print borrow wait and launch times"""
+        s = self.stats
+        if not s['borrows']:
+            return
+        avg_launch = s['launch_time'] / s['launches'] if s['launches'] else 0.0
+        print(f"🌐 Browser pool: {s['borrows']} borrows, waited {s['wait_time']:.2f}s "
+              f"(max {s['max_wait']:.2f}s), {s['launches']} launches "
+              f"(avg {avg_launch:.2f}s), {s['recycled']} recycled, {s['crashed']} crashed")
+
+    def close(self):
+        """Quit every idle browser"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for pooled in idle:
+            self._quit(pooled)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide BrowserPool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
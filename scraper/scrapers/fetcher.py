@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+def drop_seen_articles(articles, seen_urls=None):
+    """Remove listing items whose full page should not be fetched.
+
+    Drops repeated URLs within the listing and, when seen_urls is given, every
+    item whose URL it reports as already stored. seen_urls is a callable taking
+    a list of URLs and returning the set of those already stored (e.g.
+    DatabaseHandler.get_existing_urls), so one source costs one lookup.
+    """
+    unique = []
+    listed_urls = set()
+    for article in articles:
+        if article['url'] not in listed_urls:
+            listed_urls.add(article['url'])
+            unique.append(article)
+
+    stored = seen_urls(list(listed_urls)) if seen_urls and unique else set()
+    fresh = [a for a in unique if a['url'] not in stored]
+    skipped = len(articles) - len(fresh)
+    if skipped:
+        print(f"⏭️  Skipping {skipped} already-seen articles ({len(fresh)} new)")
+    return fresh
+
+
+class FetchResult:
+    """Outcome of fetching a single URL: the value returned by the fetch
+    function (or the exception it raised) plus how long the call took."""
+
+    def __init__(self, url, value=None, error=None, elapsed=0.0):
+        self.url = url
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class ConcurrentFetcher:
+    def __init__(self, max_workers=None, per_host_limit=None):
+        """Bounded thread pool for fetching article pages in parallel.
+
+        max_workers caps the total number of in-flight fetches and per_host_limit
+        caps how many of them may target the same host at once, so a listing of
+        15 articles from one site doesn't open 15 simultaneous connections to it.
+        Both can be set through SCRAPER_FETCH_WORKERS / SCRAPER_PER_HOST_LIMIT.
+        """
+        self.max_workers = max_workers or int(os.getenv('SCRAPER_FETCH_WORKERS', '8'))
+        self.per_host_limit = per_host_limit or int(os.getenv('SCRAPER_PER_HOST_LIMIT', '4'))
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slot_for(self, url):
+        """Return the semaphore limiting concurrent fetches to url's host"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def _fetch_one(self, func, url):
+        with self._slot_for(url):
+            start = time.perf_counter()
+            try:
+                value = func(url)
+                return FetchResult(url, value=value, elapsed=time.perf_counter() - start)
+            except Exception as e:
+                return FetchResult(url, error=e, elapsed=time.perf_counter() - start)
+
+    def imap(self, func, urls):
+        """Call func(url) for every url concurrently, yielding FetchResults in
+        the same order as urls as soon as each one (and all before it) is done.
+
+        Exceptions raised by func are captured on the result rather than
+        propagated. Closing the generator early cancels fetches not yet started.
+        """
+        urls = list(urls)
+        if not urls:
+            return
+
+        workers = min(self.max_workers, len(urls))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch')
+        try:
+            futures = [executor.submit(self._fetch_one, func, url) for url in urls]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def map(self, func, urls):
+        """Like imap(), but returns the full list of FetchResults"""
+        return list(self.imap(func, urls))
+
+    @staticmethod
+    def report(results, wall_time, label='fetch'):
+        """Print per-URL timings and how the wall-clock time compares to the sum"""
+        if not results:
+            return
+        total = sum(r.elapsed for r in results)
+        slowest = max(r.elapsed for r in results)
+        print(f"⏱️  {label}: {len(results)} pages in {wall_time:.2f}s "
+              f"(sum {total:.2f}s, slowest {slowest:.2f}s)")
+        for r in results:
+            status = '✅' if r.ok else '❌'
+            print(f"   {status} {r.elapsed:6.2f}s  {r.url}")
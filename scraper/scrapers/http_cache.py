@@ -0,0 +1,155 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'http_cache.sqlite3'
+)
+
+
+class CacheEntry:
+    def __init__(self, url, etag, last_modified, body, encoding, extract, extract_version=None):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.encoding = encoding
+        self.extract = extract
+        self.extract_version = extract_version
+
+
+class HttpCache:
+    def __init__(self, path=None, max_bytes=None):
+        """On-disk HTTP cache keyed by URL, used for conditional GETs.
+
+        Each entry keeps the response validators (ETag / Last-Modified), the
+        compressed body and, optionally, whatever a scraper extracted from that
+        body, so an unchanged page can skip both the download and the parse.
+        An extract is stored with the version of the parser that produced it
+        and only handed back to a parser of the same version.
+        Entries are evicted least-recently-used once the stored bodies exceed
+        max_bytes (SCRAPER_CACHE_MAX_MB, default 100 MB).
+        """
+        self.path = path or os.getenv('SCRAPER_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes or int(float(os.getenv('SCRAPER_CACHE_MAX_MB', '100')) * 1024 * 1024)
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                body BLOB,
+                extract TEXT,
+                extract_version INTEGER,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(entries)")}
+        if 'extract_version' not in columns:
+            # Caches written before extracts were versioned; their extracts never match a version
+            self.conn.execute("ALTER TABLE entries ADD COLUMN extract_version INTEGER")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self.reset_stats()
+
+    def reset_stats(self):
+        # hits: 304, misses: no cached copy, revalidations: the cached copy had changed
+        self.stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'stores': 0, 'evictions': 0}
+
+    def record(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def lookup(self, url):
+        """Return the CacheEntry for url, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, encoding, body, extract, extract_version FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, encoding, body, extract, extract_version = row
+        return CacheEntry(
+            url, etag, last_modified, zlib.decompress(body), encoding,
+            json.loads(extract) if extract is not None else None, extract_version,
+        )
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url, etag, last_modified, body, encoding):
+        """Store a fresh response body, dropping any previous extract for url"""
+        compressed = zlib.compress(body)
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, etag, last_modified, encoding, body, extract, extract_version, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, ?)",
+                (url, etag, last_modified, encoding, compressed, len(compressed), time.time()),
+            )
+            self.total_bytes += len(compressed) - (old[0] if old else 0)
+            self.stats['stores'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def store_extract(self, url, extract, version):
+        """Attach the data version `version` of a scraper's parser got out of url's cached body"""
+        with self._lock:
+            self.conn.execute("UPDATE entries SET extract = ?, extract_version = ? WHERE url = ?",
+                              (json.dumps(extract), version, url))
+            self.conn.commit()
+
+    def discard(self, url):
+        """Drop url's entry (a response that can't be revalidated replaced it)"""
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            if not old:
+                return
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self.total_bytes -= old[0]
+            self.conn.commit()
+
+    def touch(self, url):
+        with self._lock:
+            self.conn.execute("UPDATE entries SET last_used = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes (lock held)"""
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute(
+                "SELECT url, size FROM entries ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if not row:
+                self.total_bytes = 0
+                break
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.stats['evictions'] += 1
+
+    def report(self):
+        """Print hit/miss/revalidation counters"""
+        s = self.stats
+        print(f"🗃️  HTTP cache: {s['hits']} hits (304), {s['misses']} misses, "
+              f"{s['revalidations']} revalidations (changed), {s['evictions']} evictions, "
+              f"{self.total_bytes / (1024 * 1024):.1f} MB stored")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
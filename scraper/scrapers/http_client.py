@@ -0,0 +1,218 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from scrapers.http_cache import HttpCache
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+try:
+    # urllib3 only decodes brotli responses when one of these is installed
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        import brotlicffi  # noqa: F401
+    DEFAULT_HEADERS['Accept-Encoding'] = 'gzip, deflate, br'
+except ImportError:
+    DEFAULT_HEADERS['Accept-Encoding'] = 'gzip, deflate'
+
+
+def replay_url_rewriter(replay_url):
+    """Map https://host/path?q to {replay_url}/https/host/path?q (see benchmarks/harness.py)"""
+    replay_url = replay_url.rstrip('/')
+
+    def rewrite(url):
+        scheme, _, rest = url.partition('://')
+        return f"{replay_url}/{scheme}/{rest}"
+    return rewrite
+
+
+class _TrackingPoolManager(PoolManager):
+    """PoolManager that counts every socket its connections open, so keep-alive
+    reuse can be reported as requests sent vs. connections opened."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_pools = []
+        self.connections_opened = 0
+        self._counter_lock = threading.Lock()
+        self._counting_classes = {}
+
+    def _count_connect(self):
+        with self._counter_lock:
+            self.connections_opened += 1
+
+    def _counting_class(self, connection_cls):
+        counting_cls = self._counting_classes.get(connection_cls)
+        if counting_cls is None:
+            manager = self
+
+            class CountingConnection(connection_cls):
+                def connect(self):
+                    manager._count_connect()
+                    return super().connect()
+
+            counting_cls = self._counting_classes[connection_cls] = CountingConnection
+        return counting_cls
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        with self._counter_lock:
+            pool.ConnectionCls = self._counting_class(pool.ConnectionCls)
+            self.created_pools.append(pool)
+        return pool
+
+
+class _TrackingAdapter(HTTPAdapter):
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _TrackingPoolManager(
+            num_pools=connections, maxsize=maxsize, block=block, **pool_kwargs
+        )
+
+
+class HttpClient:
+    def __init__(self, pool_connections=None, pool_maxsize=None, timeout=None, headers=None, cache=None):
+        """Pooled keep-alive HTTP client shared by all scrapers.
+
+        pool_connections is the number of per-host pools kept around,
+        pool_maxsize the number of connections kept alive per host. Both, and
+        the default timeout, can be set through SCRAPER_POOL_CONNECTIONS,
+        SCRAPER_POOL_MAXSIZE and SCRAPER_HTTP_TIMEOUT.
+
+        GETs are revalidated against an on-disk HttpCache unless
+        SCRAPER_HTTP_CACHE=0. Setting SCRAPER_REPLAY_URL (or rewrite_url)
+        sends every request to a local replay server instead of the live site.
+        """
+        self.pool_connections = pool_connections or int(os.getenv('SCRAPER_POOL_CONNECTIONS', '10'))
+        self.pool_maxsize = pool_maxsize or int(os.getenv('SCRAPER_POOL_MAXSIZE', '10'))
+        self.timeout = timeout or float(os.getenv('SCRAPER_HTTP_TIMEOUT', '10'))
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        self.adapter = _TrackingAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        if cache is None and os.getenv('SCRAPER_HTTP_CACHE', '1') != '0':
+            cache = HttpCache()
+        self.cache = cache
+        self._baseline = {'requests': 0, 'connections_opened': 0}
+
+        replay_url = os.getenv('SCRAPER_REPLAY_URL')
+        self.rewrite_url = replay_url_rewriter(replay_url) if replay_url else None
+
+    def get(self, url, timeout=None, use_cache=True, extract_version=None, **kwargs):
+        """GET url through the shared session (keep-alive, compression, default headers).
+
+        When a cached copy exists the request is made conditional. A 304 is
+        turned into a 200 carrying the cached body, with response.from_cache set
+        and response.cached_extract holding whatever remember_extract() saved
+        for url last time if it was saved with extract_version (else None),
+        so callers can skip re-parsing it.
+        """
+        cache = self.cache if use_cache else None
+        entry = cache.lookup(url) if cache else None
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            headers.update(cache.conditional_headers(entry))
+
+        request_url = self.rewrite_url(url) if self.rewrite_url else url
+        response = self.session.get(request_url, timeout=timeout or self.timeout, headers=headers, **kwargs)
+        response.from_cache = False
+        response.cached_extract = None
+
+        if entry and response.status_code == 304:
+            cache.record('hits')
+            cache.touch(url)
+            response.status_code = 200
+            response._content = entry.body
+            response.encoding = entry.encoding
+            response.from_cache = True
+            if extract_version is not None and entry.extract_version == extract_version:
+                response.cached_extract = entry.extract
+        elif cache:
+            cache.record('revalidations' if entry else 'misses')
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if response.status_code == 200 and (etag or last_modified):
+                cache.store(url, etag, last_modified, response.content, response.encoding)
+            elif response.status_code == 200 and entry:
+                # Nothing to revalidate the new body with; the old one is stale
+                cache.discard(url)
+
+        return response
+
+    def remember_extract(self, url, extract, version):
+        """Cache the data parsed from url's body so a later 304 can reuse it.
+
+        version identifies the parser; bump it whenever the parser's output
+        for the same page changes, so extracts from the old parser are ignored.
+        """
+        if self.cache and extract:
+            self.cache.store_extract(url, extract, version)
+
+    def _totals(self):
+        manager = self.adapter.poolmanager
+        pools = list(manager.created_pools)
+        return pools, sum(pool.num_requests for pool in pools), manager.connections_opened
+
+    def stats(self):
+        """Return request and connection counters since the last reset_stats()"""
+        pools, request_count, opened = self._totals()
+        request_count -= self._baseline['requests']
+        opened -= self._baseline['connections_opened']
+        return {
+            'hosts': len({pool.host for pool in pools}),
+            'requests': request_count,
+            'connections_opened': opened,
+            'connections_reused': max(request_count - opened, 0),
+        }
+
+    def reset_stats(self):
+        _, request_count, opened = self._totals()
+        self._baseline = {'requests': request_count, 'connections_opened': opened}
+        if self.cache:
+            self.cache.reset_stats()
+
+    def report(self):
+        """Print connection reuse and cache counters"""
+        stats = self.stats()
+        print(f"🔌 HTTP: {stats['requests']} requests to {stats['hosts']} hosts, "
+              f"{stats['connections_opened']} connections opened, "
+              f"{stats['connections_reused']} reused")
+        if self.cache:
+            self.cache.report()
+
+    def close(self):
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HttpClient, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -1,124 +1,137 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import time
 from datetime import datetime
-import requests
 import re
-import os
+from scrapers.fetcher import ConcurrentFetcher, drop_seen_articles
+from scrapers.http_client import get_http_client
+from scrapers.browser_pool import get_browser_pool
+from scrapers.parsing import make_soup, strainer
+from scrapers.feeds import FeedReader, feeds_enabled
+
+LISTING_SELECTOR = 'li.NwsLstPg-a-li, div.NwsLstPg-a, div.NwsLstPg_txt-wrp, div.news_Itm, article'
+
+# Only the elements the listing and article extractors select are parsed
+LISTING_STRAINER = strainer(
+    tags={'article'},
+    classes={'li': {'NwsLstPg-a-li'}, 'div': {'NwsLstPg-a', 'NwsLstPg_txt-wrp', 'news_Itm'}},
+)
+ARTICLE_STRAINER = strainer(
+    tags={'article', 'p', 'meta', 'time'},
+    classes={'div': {'sp_txt', 'Art-exp_cn', 'ins_storybody'}, 'span': {'auth-name'}, None: {'byline', 'author'}},
+    ids={'div': {'TxSS_selct', 'ins_storybody'}},
+)
+# Bump when article parsing changes, so pages cached with the old parser's
+# extract are parsed again on a 304 (see HttpClient.remember_extract)
+ARTICLE_EXTRACT_VERSION = 1
 
 class NDTVScraper:
     def __init__(self):
-        # don't create a persistent selenium driver up-front — create only on-demand
-        self.driver = None
+        # no selenium driver up-front — one is borrowed from the shared pool only on fallback
         self.base_url = "https://www.ndtv.com/latest"
+        self.feed_url = "https://feeds.feedburner.com/ndtvnews-latest"
+        self.http = get_http_client()
+        self.feeds = FeedReader(self.http)
+        self.fetcher = ConcurrentFetcher()
+        self.browsers = get_browser_pool()
         
-    def setup_driver(self):
-        """Create and return a Selenium WebDriver configured for NDTV fallback use.
-
-        This returns a driver instance that the caller must quit() after use. We avoid
-        creating a persistent driver at init to reduce crashes on pages that render poorly
-        in headless Chromium on some Windows setups.
-        """
-        chrome_options = Options()
-        # Use new headless mode and disable GPU/accelerated paths that have caused crashes
-        chrome_options.add_argument('--headless=new')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-software-rasterizer')
-        chrome_options.add_argument('--disable-extensions')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        chrome_options.add_argument('--single-process')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        chrome_options.add_argument('--window-size=1920,1080')
-
-        # Install or get chromedriver path from webdriver-manager and resolve the actual executable
-        driver_install_path = ChromeDriverManager().install()
-        exe_path = None
-        try:
-            if os.path.isfile(driver_install_path) and driver_install_path.lower().endswith('.exe'):
-                exe_path = driver_install_path
-            else:
-                base = driver_install_path if os.path.isdir(driver_install_path) else os.path.dirname(driver_install_path)
-                for root, _, files in os.walk(base):
-                    for f in files:
-                        if 'chromedriver' in f.lower() and f.lower().endswith('.exe'):
-                            exe_path = os.path.join(root, f)
-                            break
-                    if exe_path:
-                        break
-        except Exception:
-            exe_path = None
-
-        service = Service(exe_path or driver_install_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        return driver
-        
-    def scrape_articles(self, max_articles=20):
-        """Scrape NDTV articles using requests for the listing page (faster and avoids
+    def scrape_articles(self, max_articles=20, seen_urls=None):
+        """Scrape NDTV articles. The listing comes from the RSS feed, or from the
+        listing page fetched with requests when the feed fails (faster and avoids
         creating Chromium). Selenium is used only as a fallback when requests fails
-        to fetch or render a particular article page.
+        to fetch or render a particular page.
         """
-        articles = []
+        return list(self.iter_articles(max_articles, seen_urls))
 
-        print("🔍 Scraping NDTV (requests-first)...")
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+    def iter_articles(self, max_articles=20, seen_urls=None):
+        """Yield NDTV articles one by one, as soon as each full page is fetched"""
+        count = 0
 
+        print("🔍 Scraping NDTV (feed-first)...")
+
+        listed = self.list_from_feed(max_articles) if feeds_enabled() else []
+        if not listed:
+            listed = self.list_from_page(max_articles)
+
+        # Skip anything already stored before paying for the page fetch and analysis
+        listed = drop_seen_articles(listed, seen_urls)
+
+        # Fetch the full articles concurrently (requests first, selenium fallback inside)
+        start = time.perf_counter()
+        results = []
+        for article_data, result in zip(listed, self.fetcher.imap(self.fetch_full_article, [a['url'] for a in listed])):
+            results.append(result)
+            if result.error:
+                print(f"⚠️  Failed to fetch full article for {article_data.get('url')}: {result.error}")
+            elif result.value:
+                article_data.update(result.value)
+
+            count += 1
+            print(f"✅ Scraped: {article_data.get('title','')[:50]}...")
+            yield article_data
+        self.fetcher.report(results, time.perf_counter() - start, label='NDTV article fetch')
+
+        print(f"✅ Total articles scraped from NDTV: {count}")
+
+    def list_from_feed(self, max_articles):
+        """Listing items from the NDTV RSS feed; empty list if the feed is unusable"""
         try:
-            r = requests.get(self.base_url, headers=headers, timeout=10)
+            items = self.feeds.read(self.feed_url, max_items=max_articles)
+        except Exception as e:
+            print(f"⚠️  NDTV feed failed, falling back to the listing page: {e}")
+            return []
+
+        print(f"📡 NDTV feed returned {len(items)} items")
+        listed = []
+        for item in items:
+            listed.append({
+                'title': item['title'],
+                'url': item['url'],
+                'description': item['description'],
+                'source': 'NDTV',
+                'category': 'General',
+                'publishedDate': item['publishedDate'] or datetime.utcnow().isoformat(),
+                'scrapedAt': datetime.utcnow().isoformat(),
+                'content': item['description'],
+                'image': item['image']
+            })
+        return listed
+
+    def list_from_page(self, max_articles):
+        """Listing items from https://www.ndtv.com/latest (requests, Selenium fallback)"""
+        try:
+            r = self.http.get(self.base_url)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = make_soup(r.text, LISTING_STRAINER)
         except Exception as e:
             print(f"⚠️  Listing page requests failed, will try Selenium fallback: {e}")
-            # Try a short-lived selenium render
+            # Try a selenium render with a pooled browser
             try:
-                driver = self.setup_driver()
-                driver.get(self.base_url)
-                time.sleep(2)
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
+                with self.browsers.driver() as driver:
+                    driver.get(self.base_url)
+                    time.sleep(2)
+                    page_source = driver.page_source
+                soup = make_soup(page_source, LISTING_STRAINER)
             except Exception as se:
                 print(f"❌ Selenium fallback also failed for listing page: {se}")
-                return articles
-            finally:
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
+                return []
 
         # Find article containers - multiple fallbacks based on NDTV structure
-        article_elements = soup.select('li.NwsLstPg-a-li, div.NwsLstPg-a, div.NwsLstPg_txt-wrp, div.news_Itm, article')
+        article_elements = soup.select(LISTING_SELECTOR)
 
         print(f"🔎 NDTV selector matched {len(article_elements)} elements")
         if article_elements:
             sample = article_elements[0]
             print(f"   Sample text: {sample.get_text(' ', strip=True)[:200]}")
 
+        listed = []
         for idx, article_el in enumerate(article_elements[:max_articles]):
             try:
                 article_data = self.extract_article_data(article_el)
                 if article_data:
-                    # Fetch the full article (requests first, selenium fallback inside)
-                    try:
-                        full = self.fetch_full_article(article_data['url'])
-                        if full:
-                            article_data.update(full)
-                    except Exception as fe:
-                        print(f"⚠️  Failed to fetch full article for {article_data.get('url')}: {fe}")
-
-                    articles.append(article_data)
-                    print(f"✅ Scraped: {article_data.get('title','')[:50]}...")
+                    listed.append(article_data)
             except Exception as e:
                 print(f"❌ Error extracting article {idx}: {str(e)}")
                 continue
-
-        print(f"✅ Total articles scraped from NDTV: {len(articles)}")
-        return articles
+        return listed
     
     def extract_article_data(self, article_element):
         """Extract data from article element"""
@@ -197,45 +210,52 @@ class NDTVScraper:
 
         Returns a dict with keys: content, author (optional), publishedDate (ISO string optional)
         """
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        paragraphs = []
-        author = None
-        pubdate = None
+        r = None
 
         # Try requests first
         try:
-            r = requests.get(url, headers=headers, timeout=timeout)
+            r = self.http.get(url, timeout=timeout, extract_version=ARTICLE_EXTRACT_VERSION)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, 'html.parser')
+            if r.cached_extract:
+                # 304 Not Modified: reuse what we parsed out of this page last time
+                return r.cached_extract
+            soup = make_soup(r.text, ARTICLE_STRAINER)
         except Exception:
-            # fallback to selenium rendering using a short-lived driver
-            driver = None
+            r = None
+            # fallback to selenium rendering using a pooled browser
             try:
-                driver = self.setup_driver()
-                driver.get(url)
-                time.sleep(1.0)
-                # Attempt to close typical NDTV overlays/popups that block content
-                try:
-                    # remove elements by role=dialog or known classes
-                    driver.execute_script("""
-                        document.querySelectorAll('[role="dialog"], .npop-frm, .gpt-passback, .bod_crd-j, .bod_glr').forEach(e => e.remove());
-                        var btns = Array.from(document.querySelectorAll('button'))
-                            .filter(b => /not now|notnow|no thanks|not now/i.test(b.innerText));
-                        if(btns.length) btns[0].click();
-                    """)
-                except Exception:
-                    pass
-                time.sleep(1.0)
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
+                with self.browsers.driver() as driver:
+                    driver.get(url)
+                    time.sleep(1.0)
+                    # Attempt to close typical NDTV overlays/popups that block content
+                    try:
+                        # remove elements by role=dialog or known classes
+                        driver.execute_script("""
+                            document.querySelectorAll('[role="dialog"], .npop-frm, .gpt-passback, .bod_crd-j, .bod_glr').forEach(e => e.remove());
+                            var btns = Array.from(document.querySelectorAll('button'))
+                                .filter(b => /not now|notnow|no thanks|not now/i.test(b.innerText));
+                            if(btns.length) btns[0].click();
+                        """)
+                    except Exception:
+                        pass
+                    time.sleep(1.0)
+                    page_source = driver.page_source
+                soup = make_soup(page_source, ARTICLE_STRAINER)
             except Exception as e:
                 print(f"❌ fetch_full_article selenium fallback failed: {e}")
                 return {}
-            finally:
-                try:
-                    if driver:
-                        driver.quit()
-                except Exception:
-                    pass
+
+        result = self.extract_full_article(soup)
+        if r is not None:
+            self.http.remember_extract(url, result, ARTICLE_EXTRACT_VERSION)
+
+        return result
+
+    def extract_full_article(self, soup):
+        """Extract content, author and published date from a parsed article page"""
+        paragraphs = []
+        author = None
+        pubdate = None
 
         # Try NDTV article body selectors observed in DevTools
         body_selectors = [
@@ -299,3 +319,4 @@ if __name__ == "__main__":
     articles = scraper.scrape_articles(max_articles=10)
     for article in articles:
         print(f"\n{article['title']}\n{article['url']}\n")
+    get_browser_pool().close()
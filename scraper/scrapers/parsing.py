@@ -0,0 +1,60 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+# SCRAPER_HTML_PARSER=html.parser forces the pure-Python parser
+HTML_PARSER = os.getenv('SCRAPER_HTML_PARSER', DEFAULT_PARSER)
+
+
+def make_soup(markup, parse_only=None):
+    """Parse markup with the fastest available parser.
+
+    parse_only is a SoupStrainer (see strainer()) restricting the tree to the
+    regions an extractor reads; everything else (scripts, styles, navigation,
+    ads) is skipped instead of being turned into Tag objects.
+    """
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=parse_only)
+
+
+def _classes(attrs):
+    value = attrs.get('class') or ''
+    if isinstance(value, str):
+        return set(value.split())
+    return set(value)
+
+
+def strainer(tags=(), classes=None, ids=None, attr_values=None):
+    """Build a SoupStrainer keeping top-level elements that match any rule.
+
+    tags: tag names kept outright.
+    classes / ids: {tag name or None: set of values}; None matches any tag.
+    attr_values: {tag name: {attribute: set of values}}.
+
+    A kept element keeps its whole subtree, so CSS selectors and find_all()
+    calls built from the same rules return exactly what they would on the
+    full document.
+    """
+    tags = set(tags)
+    classes = classes or {}
+    ids = ids or {}
+    attr_values = attr_values or {}
+
+    def keep(name, attrs):
+        if name in tags:
+            return True
+        for tag in (name, None):
+            if tag in classes and _classes(attrs) & classes[tag]:
+                return True
+            if tag in ids and attrs.get('id') in ids[tag]:
+                return True
+        for attr, values in attr_values.get(name, {}).items():
+            if attrs.get(attr) in values:
+                return True
+        return False
+
+    return SoupStrainer(keep)
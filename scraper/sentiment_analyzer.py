@@ -1,59 +1,388 @@
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import multiprocessing
+import os
 import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import time
+import heapq
+import nltk_snapshot
+from keyword_stats import DocumentFrequencyStore
+from sentiment_cache import SentimentCache, cache_enabled
 
-class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize NLTK sentiment analyzer"""
-        # Download required NLTK data
+# Bump whenever scores or keywords would change for the same text, so cached
+# and stored results from an older analyzer aren't mixed with new ones
+ANALYZER_VERSION = 'vader-1'
+
+# clean_text in one pass: URLs and punctuation become spaces, then whitespace
+# runs are collapsed by split()/join()
+CLEAN_PATTERN = re.compile(r'http\S+|www\S+|https\S+|[^\w\s]')
+
+# On cleaned text (letters, digits, _ and single spaces) word_tokenize only
+# differs from str.split() by splitting these words in two; every half is
+# 3 letters or shorter, so none of them can be a keyword
+SPLIT_CONTRACTIONS = frozenset({'cannot', 'gimme', 'gonna', 'gotta', 'lemme', 'wanna'})
+
+# Only these fields are sent to worker processes
+TEXT_FIELDS = ('title', 'description', 'content')
+
+# Cache kind for an article's candidate keyword counts (keyword_terms)
+TERMS_KIND = 'keyword-terms'
+
+# Paragraph mode: scraped bodies separate paragraphs with blank lines
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+# Paragraph mode: how much each segment counts per scored word
+SEGMENT_WEIGHTS = {'headline': 3.0, 'lead': 2.0, 'body': 1.0}
+
+# Paragraph mode: raw characters read per budgeted token, so a paragraph with
+# no breaks is never cleaned in full (URLs and punctuation make raw text longer)
+MAX_CHARS_PER_TOKEN = 20
+
+# Analyzer owned by each worker process, built once by _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(backend, mode, token_budget, paragraph_scores, keyword_ranking, update_keyword_stats):
+    """Load the VADER lexicon and stopwords once per worker process"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(workers=1, use_cache=False, backend=backend, mode=mode,
+                                         token_budget=token_budget, paragraph_scores=paragraph_scores,
+                                         keyword_ranking=keyword_ranking, update_keyword_stats=update_keyword_stats,
+                                         service_url='', worker=True)
+    _worker_analyzer.warm_up()
+
+
+def _analyze_chunk(texts):
+    """Score a chunk of {field: text} dicts in a worker process.
+
+    Returns one (analysis, error) pair per input, in order; a failing article
+    gets (None, message) instead of failing the whole chunk. With TF-IDF
+    keywords each analysis also carries the article's 'terms' for the
+    parent's document frequency store; the worker's read-only copy of that
+    store is reloaded first whenever the parent has saved a newer one.
+    """
+    if _worker_analyzer.keyword_stats:
+        _worker_analyzer.keyword_stats.refresh()
+    if _worker_analyzer.batch_scorer and _worker_analyzer.mode == 'document':
+        return _worker_analyzer._vectorized_analyze(texts)
+    results = []
+    for fields in texts:
         try:
-            nltk.data.find('vader_lexicon')
-        except LookupError:
-            print("📦 Downloading NLTK data...")
-            nltk.download('vader_lexicon', quiet=True)
-            nltk.download('punkt', quiet=True)
-            nltk.download('stopwords', quiet=True)
+            analyzed = _worker_analyzer.analyze_article(dict(fields))
+            analysis = {'sentiment': analyzed['sentiment'], 'keywords': analyzed['keywords']}
+            results.append((_worker_analyzer._with_terms(analysis), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+class PreparedText:
+    def __init__(self, cleaned, tokens):
+        """Cleaned text and its whitespace tokens, shared by scoring and keyword extraction"""
+        self.cleaned = cleaned
+        self.tokens = tokens
+
+
+class SentimentAnalyzer:
+    def __init__(self, workers=None, chunk_size=None, use_cache=None, backend=None,
+                 mode=None, token_budget=None, paragraph_scores=None, keyword_ranking=None,
+                 update_keyword_stats=True, service_url=None, worker=False):
+        """Initialize NLTK sentiment analyzer
+
+        With workers > 1 (SENTIMENT_WORKERS, 0 = one per CPU) batch_analyze
+        spreads articles over a process pool in chunks of chunk_size
+        (SENTIMENT_CHUNK_SIZE); the pool is started on first use.
+        Results are memoized in a SentimentCache unless SENTIMENT_CACHE=0.
+        backend='numpy' (SENTIMENT_BACKEND) makes batch_analyze score whole
+        batches with the vectorized BatchVaderScorer; it needs numpy.
+        
+        mode='paragraphs' (SENTIMENT_MODE) scores the headline, lead and
+        content paragraph by paragraph instead of as one string, stopping
+        after token_budget words (SENTIMENT_TOKEN_BUDGET, default 400), so
+        long-form articles cost no more than short ones; see
+        analyze_paragraphs. paragraph_scores (SENTIMENT_PARAGRAPH_SCORES=1)
+        also stores each paragraph's score.
+        
+        Keywords are ranked by TF-IDF against a DocumentFrequencyStore that
+        every analyzed article updates, unless keyword_ranking='frequency'
+        (KEYWORD_RANKING). Worker processes (worker=True) rank with the
+        store as last saved and send their terms back to the parent.
+        update_keyword_stats=False ranks without counting the articles in
+        (re-scoring articles that were already counted).
+        
+        Analyzed articles are tagged with analyzerVersion (self.version),
+        which changes with anything that changes scores or keywords.
+        
+        With service_url (SENTIMENT_SERVICE_URL) this is a client of a
+        sentiment_service: batches are scored by the service and NLTK is
+        only loaded if it can't be reached, in which case articles are
+        scored in-process for SENTIMENT_SERVICE_RETRY seconds (default 30)
+        before the service is tried again. No local cache is opened in
+        client mode unless use_cache=True.
+        
+        NLTK, the lexicon and the stopwords are loaded on first use (or by
+        warm_up()), from the prebuilt nltk_snapshot when there is one.
+        """
+        self._sia = None
+        self._stop_words = None
+        self._load_lock = threading.Lock()
+        self.load_time = None
+        self.loaded_from = None
+        
+        if workers is None:
+            workers = int(os.getenv('SENTIMENT_WORKERS', '1'))
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or int(os.getenv('SENTIMENT_CHUNK_SIZE', '4'))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
+        self.service_url = (os.getenv('SENTIMENT_SERVICE_URL', '') if service_url is None else service_url).rstrip('/')
+        self.service_timeout = float(os.getenv('SENTIMENT_SERVICE_TIMEOUT', '30'))
+        self.service_retry = float(os.getenv('SENTIMENT_SERVICE_RETRY', '30'))
+        self._service_session = None
+        self._service_retry_at = 0.0
+        self.service_stats = {'requests': 0, 'articles': 0, 'latency': 0.0, 'fallbacks': 0}
+        
+        if use_cache is None:
+            use_cache = cache_enabled() and not self.service_url
+        self.cache = SentimentCache(ANALYZER_VERSION) if use_cache else None
+        
+        self.backend = backend or os.getenv('SENTIMENT_BACKEND', 'nltk')
+        self._batch_scorer = None
+        
+        self.mode = mode or os.getenv('SENTIMENT_MODE', 'document')
+        self.token_budget = token_budget or int(os.getenv('SENTIMENT_TOKEN_BUDGET', '400'))
+        if paragraph_scores is None:
+            paragraph_scores = os.getenv('SENTIMENT_PARAGRAPH_SCORES', '0') == '1'
+        self.paragraph_scores = paragraph_scores
         
-        self.sia = SentimentIntensityAnalyzer()
-        self.stop_words = set(stopwords.words('english'))
+        self.keyword_ranking = keyword_ranking or os.getenv('KEYWORD_RANKING', 'tfidf')
+        self.keyword_stats = DocumentFrequencyStore(read_only=worker) if self.keyword_ranking == 'tfidf' else None
+        self.update_keyword_stats = update_keyword_stats
+        
+        version = [ANALYZER_VERSION]
+        if self.mode == 'paragraphs':
+            version.append(f'paragraphs-{self.token_budget}')
+        if self.keyword_stats:
+            version.append('tfidf')
+        self.version = '+'.join(version)
+    
+    def warm_up(self):
+        """Import NLTK and load the lexicon and stopwords now instead of on first use.
+        
+        A client of a reachable sentiment service loads nothing.
+        """
+        if self.service_url and self._service_ready():
+            self.loaded_from = 'service'
+            return
+        self._load()
+    
+    def _load(self):
+        if self._sia is not None:
+            return
+        with self._load_lock:
+            if self._sia is not None:
+                return
+            start = time.perf_counter()
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            from nltk.sentiment.vader import VaderConstants
+            
+            snapshot = nltk_snapshot.load()
+            if snapshot:
+                sia = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+                sia.lexicon_file = None
+                sia.lexicon = snapshot.lexicon
+                sia.constants = VaderConstants()
+                stop_words = snapshot.stopwords
+                self.loaded_from = 'snapshot'
+            else:
+                print("💡 No NLTK snapshot found, loading NLTK data (prebuild it with: python nltk_snapshot.py)")
+                from nltk.corpus import stopwords
+                nltk_snapshot.ensure_nltk_data()
+                sia = SentimentIntensityAnalyzer()
+                stop_words = set(stopwords.words('english'))
+                self.loaded_from = 'nltk'
+            
+            if self.backend == 'numpy':
+                try:
+                    from vader_batch import BatchVaderScorer
+                    self._batch_scorer = BatchVaderScorer(sia)
+                except ImportError:
+                    print("⚠️  numpy is not installed, using the NLTK sentiment backend")
+                    self.backend = 'nltk'
+            
+            self._stop_words = stop_words
+            self._sia = sia
+            self.load_time = time.perf_counter() - start
+    
+    @property
+    def sia(self):
+        self._load()
+        return self._sia
+    
+    @property
+    def stop_words(self):
+        self._load()
+        return self._stop_words
+    
+    @property
+    def batch_scorer(self):
+        self._load()
+        return self._batch_scorer
+    
+    def _session(self):
+        if self._service_session is None:
+            import requests
+            self._service_session = requests.Session()
+        return self._service_session
+    
+    def _service_failed(self, error):
+        self.service_stats['fallbacks'] += 1
+        self._service_retry_at = time.monotonic() + self.service_retry
+        print(f"⚠️  Sentiment service {self.service_url} unavailable ({str(error)}), "
+              f"scoring in-process for {self.service_retry:.0f}s")
+    
+    def _service_ready(self):
+        """Whether the sentiment service answers its health check (and isn't in its retry pause)"""
+        if time.monotonic() < self._service_retry_at:
+            return False
+        try:
+            response = self._session().get(f"{self.service_url}/health", timeout=min(self.service_timeout, 5))
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            self._service_failed(e)
+            return False
+    
+    def _remote_analyze(self, articles):
+        """(analysis, error) pairs from the sentiment service, or None if it failed"""
+        start = time.perf_counter()
+        try:
+            response = self._session().post(
+                f"{self.service_url}/analyze",
+                json={'articles': [{field: article.get(field) or '' for field in TEXT_FIELDS} for article in articles]},
+                timeout=self.service_timeout,
+            )
+            response.raise_for_status()
+            results = [tuple(pair) for pair in response.json()['results']]
+            if len(results) != len(articles):
+                raise ValueError(f"{len(results)} results for {len(articles)} articles")
+        except Exception as e:
+            self._service_failed(e)
+            return None
+        self.service_stats['requests'] += 1
+        self.service_stats['articles'] += len(articles)
+        self.service_stats['latency'] += time.perf_counter() - start
+        return results
     
     def clean_text(self, text):
         """Clean text for better sentiment analysis"""
         if not text:
             return ""
         
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        
-        # Remove special characters and extra spaces
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        # Remove URLs, special characters and extra spaces
+        return ' '.join(CLEAN_PATTERN.sub(' ', text).split())
     
-    def extract_keywords(self, text, top_n=5):
+    def prepare_text(self, text):
+        """Clean and tokenize text once for both analyze_sentiment and extract_keywords"""
+        cleaned = self.clean_text(text)
+        return PreparedText(cleaned, cleaned.split())
+    
+    def extract_keywords(self, text, top_n=5, prepared=None):
         """Extract key words from text"""
         try:
-            text = self.clean_text(text)
-            tokens = word_tokenize(text.lower())
-            
-            # Filter out stopwords and short words
-            keywords = [word for word in tokens 
-                       if word not in self.stop_words 
-                       and len(word) > 3 
-                       and word.isalpha()]
-            
-            # Get frequency distribution
-            from collections import Counter
-            freq = Counter(keywords)
-            
-            return [word for word, _ in freq.most_common(top_n)]
+            prepared = prepared or self.prepare_text(text)
+            return self.rank_keywords(self.keyword_terms(prepared), top_n)
         except:
             return []
     
-    def analyze_sentiment(self, text):
+    def _count_terms(self, prepared):
+        """Candidate keywords of a prepared text and how often each occurs"""
+        # Filter out stopwords and short words
+        keywords = []
+        for token in prepared.tokens:
+            word = token.lower()
+            if (len(word) > 3 and word.isalpha()
+                    and word not in self.stop_words and word not in SPLIT_CONTRACTIONS):
+                keywords.append(word)
+        return Counter(keywords)
+    
+    def keyword_terms(self, prepared):
+        """_count_terms through the cache.
+        
+        The cache keeps the term counts rather than ranked keywords: they
+        don't depend on the keyword stats, so a cached article is still ranked
+        (and counted) against the document frequencies of the moment.
+        """
+        if self.cache:
+            cached = self.cache.get(TERMS_KIND, prepared.cleaned)
+            if cached is not None:
+                return Counter(cached)
+        terms = self._count_terms(prepared)
+        if self.cache:
+            self.cache.put(TERMS_KIND, prepared.cleaned, terms)
+        return terms
+    
+    def rank_keywords(self, terms, top_n=5):
+        """The top_n keywords of one article's term counts.
+        
+        With TF-IDF the article is ranked against the stats so far and then
+        counted in (unless update_keyword_stats is off), cached or not.
+        """
+        if not self.keyword_stats:
+            return [word for word, _ in terms.most_common(top_n)]
+        idf = self.keyword_stats.idf
+        ranked = heapq.nlargest(top_n, terms.items(), key=lambda item: item[1] * idf(item[0]))
+        if self.update_keyword_stats:
+            self.keyword_stats.update(terms)
+        return [word for word, _ in ranked]
+    
+    def count_keyword_terms(self, articles):
+        """Count articles that are not analyzed (near-duplicates reusing an analysis) into the keyword stats"""
+        if not (self.keyword_stats and self.update_keyword_stats):
+            return
+        for article in articles:
+            try:
+                self.keyword_stats.update(self.keyword_terms(self.prepare_text(self.text_to_analyze(article))))
+            except Exception as e:
+                print(f"⚠️  Could not count keywords of {article.get('url', 'an article')}: {str(e)}")
+    
+    def polarity_scores(self, prepared):
+        """SentimentIntensityAnalyzer.polarity_scores on already tokenized, cleaned text.
+        
+        Cleaned text has no punctuation, so VADER's own tokenization reduces
+        to the tokens longer than one character; this skips re-tokenizing and
+        replaces its per-word list.index() lookup (quadratic on long articles)
+        with a first-occurrence map that returns the same positions.
+        """
+        from nltk.sentiment.vader import SentiText
+        sia = self.sia
+        constants = sia.constants
+        sentitext = SentiText.__new__(SentiText)
+        sentitext.text = prepared.cleaned
+        sentitext.words_and_emoticons = words = [token for token in prepared.tokens if len(token) > 1]
+        sentitext.is_cap_diff = sentitext.allcap_differential(words)
+        
+        first_index = {}
+        for i, item in enumerate(words):
+            first_index.setdefault(item, i)
+        
+        sentiments = []
+        for item in words:
+            i = first_index[item]
+            lowered = item.lower()
+            if (i < len(words) - 1 and lowered == "kind" and words[i + 1].lower() == "of") \
+                    or lowered in constants.BOOSTER_DICT:
+                sentiments.append(0)
+                continue
+            sentiments = sia.sentiment_valence(0, sentitext, item, i, sentiments)
+        
+        sentiments = sia._but_check(words, sentiments)
+        return sia.score_valence(sentiments, prepared.cleaned)
+    
+    def analyze_sentiment(self, text, prepared=None):
         """
         Analyze sentiment of text using NLTK VADER
         Returns sentiment score and label
@@ -69,11 +398,22 @@ class SentimentAnalyzer:
             }
         
         # Clean text
-        cleaned_text = self.clean_text(text)
+        prepared = prepared or self.prepare_text(text)
+        cleaned_text = prepared.cleaned
         
-        # Get sentiment scores
-        scores = self.sia.polarity_scores(cleaned_text)
+        if self.cache:
+            cached = self.cache.get('sentiment', cleaned_text)
+            if cached is not None:
+                return cached
         
+        # Get sentiment scores
+        sentiment = self.sentiment_from_scores(self.polarity_scores(prepared))
+        if self.cache:
+            self.cache.put('sentiment', cleaned_text, sentiment)
+        return sentiment
+    
+    def sentiment_from_scores(self, scores):
+        """Label and round VADER's scores"""
         # Determine label based on compound score
         compound = scores['compound']
         if compound >= 0.05:
@@ -92,18 +432,129 @@ class SentimentAnalyzer:
             'neutral': round(scores['neu'], 4)
         }
     
+    def text_to_analyze(self, article):
+        """Combine title, description and content for analysis"""
+        return f"{article.get('title', '')} {article.get('description', '')} {article.get('content', '')}"
+    
+    def iter_segments(self, article):
+        """Yield (kind, raw text) for the headline, the lead and each content paragraph, lazily"""
+        yield 'headline', article.get('title') or ''
+        yield 'lead', article.get('description') or ''
+        
+        content = article.get('content') or ''
+        kind, start = 'lead', 0
+        for match in PARAGRAPH_BREAK.finditer(content):
+            yield kind, content[start:match.start()]
+            kind, start = 'body', match.end()
+        yield kind, content[start:]
+    
+    def budgeted_segments(self, article):
+        """Cleaned (kind, PreparedText) segments up to token_budget tokens, and whether any text was left out.
+        
+        Segments are read and cleaned in order until the budget is spent, so
+        the rest of a long body is never touched; a segment repeating an
+        earlier one (content that is just the description) is skipped.
+        """
+        segments, seen, used, truncated = [], set(), 0, False
+        for kind, raw in self.iter_segments(article):
+            if used >= self.token_budget:
+                if raw.strip():
+                    truncated = True
+                    break
+                continue
+            
+            remaining = self.token_budget - used
+            limit = remaining * MAX_CHARS_PER_TOKEN
+            prepared = self.prepare_text(raw[:limit])
+            tokens = prepared.tokens
+            clipped = len(raw) > limit
+            if clipped:
+                tokens = tokens[:-1]  # the last word may have been cut in half
+            if len(tokens) > remaining:
+                tokens, clipped = tokens[:remaining], True
+            if clipped:
+                prepared = PreparedText(' '.join(tokens), tokens)
+            
+            if tokens and prepared.cleaned not in seen:
+                seen.add(prepared.cleaned)
+                segments.append((kind, prepared))
+                used += len(tokens)
+            if clipped:
+                truncated = True
+                break
+        return segments, truncated
+    
+    def analyze_paragraphs(self, article):
+        """Sentiment and keywords of an article from its budgeted segments.
+        
+        Each segment is scored on its own and the scores are averaged,
+        weighted by SEGMENT_WEIGHTS times the segment's scored word count.
+        The sentiment dict has the usual fields plus 'tokens' (words scored),
+        'truncated' and, with paragraph_scores, a 'paragraphs' list.
+        Keywords come from the same budgeted text.
+        """
+        segments, truncated = self.budgeted_segments(article)
+        prepared = PreparedText(' '.join(p.cleaned for _, p in segments),
+                                [token for _, p in segments for token in p.tokens])
+        keywords = self.extract_keywords(None, prepared=prepared)
+        
+        kind = f'sentiment:paragraphs:{self.token_budget}'
+        key = '\n'.join(f'{segment} {p.cleaned}' for segment, p in segments)
+        sentiment = self.cache.get(kind, key) if self.cache else None
+        if sentiment is None:
+            sentiment = self._score_segments(segments)
+            sentiment['tokens'] = len(prepared.tokens)
+            sentiment['truncated'] = truncated
+            if self.cache:
+                self.cache.put(kind, key, sentiment)
+        
+        if not self.paragraph_scores:
+            sentiment.pop('paragraphs', None)
+        return sentiment, keywords
+    
+    def _score_segments(self, segments):
+        """Weighted average of the segments' VADER scores, plus each segment's score"""
+        words = [[token for token in p.tokens if len(token) > 1] for _, p in segments]
+        if self.batch_scorer and segments:
+            scores = self.batch_scorer.score(words, [p.cleaned for _, p in segments])
+        else:
+            scores = [self.polarity_scores(p) for _, p in segments]
+        
+        totals = {'compound': 0.0, 'pos': 0.0, 'neg': 0.0, 'neu': 0.0}
+        total_weight = 0.0
+        paragraphs = []
+        for (segment, _), segment_words, score in zip(segments, words, scores):
+            weight = SEGMENT_WEIGHTS[segment] * len(segment_words)
+            total_weight += weight
+            for name in totals:
+                totals[name] += score[name] * weight
+            paragraphs.append({'kind': segment, 'score': round(score['compound'], 4),
+                               'tokens': len(segment_words)})
+        
+        if total_weight:
+            totals = {name: value / total_weight for name, value in totals.items()}
+        sentiment = self.sentiment_from_scores(totals)
+        sentiment['paragraphs'] = paragraphs
+        return sentiment
+    
     def analyze_article(self, article):
         """
         Analyze an article and return it with sentiment data
         """
-        # Combine title and description for analysis
-        text_to_analyze = f"{article.get('title', '')} {article.get('description', '')} {article.get('content', '')}"
+        article['analyzerVersion'] = self.version
+        if self.mode == 'paragraphs':
+            article['sentiment'], article['keywords'] = self.analyze_paragraphs(article)
+            return article
+        
+        text_to_analyze = self.text_to_analyze(article)
+        
+        prepared = self.prepare_text(text_to_analyze)
         
         # Get sentiment
-        sentiment = self.analyze_sentiment(text_to_analyze)
+        sentiment = self.analyze_sentiment(text_to_analyze, prepared)
         
         # Extract keywords
-        keywords = self.extract_keywords(text_to_analyze)
+        keywords = self.extract_keywords(text_to_analyze, prepared=prepared)
         
         # Add sentiment and keywords to article
         article['sentiment'] = sentiment
@@ -111,27 +562,203 @@ class SentimentAnalyzer:
         
         return article
     
-    def batch_analyze(self, articles):
+    def batch_analyze(self, articles, verbose=True):
         """
         Analyze sentiment for multiple articles
+        (verbose=False only prints errors)
         """
-        print(f"🔍 Analyzing sentiment for {len(articles)} articles...")
+        if verbose:
+            print(f"🔍 Analyzing sentiment for {len(articles)} articles...")
+        
+        try:
+            if self.service_url and articles and time.monotonic() >= self._service_retry_at:
+                results = self._remote_analyze(articles)
+                if results is not None:
+                    return self._apply_results(articles, results, verbose)
+            
+            if self.workers > 1 and len(articles) > self.chunk_size:
+                try:
+                    return self._parallel_analyze(articles, verbose)
+                except BrokenProcessPool as e:
+                    print(f"⚠️  Sentiment worker pool failed ({str(e)}), analyzing in-process")
+                    self._stop_pool()
+            
+            if self.batch_scorer and self.mode == 'document':
+                return self._apply_results(articles, self._vectorized_analyze(articles), verbose)
+            
+            analyzed_articles = []
+            for idx, article in enumerate(articles):
+                try:
+                    analyzed_article = self.analyze_article(article)
+                    analyzed_articles.append(analyzed_article)
+                    
+                    sentiment = analyzed_article['sentiment']
+                    if verbose:
+                        print(f"✅ [{idx+1}] {sentiment['label'].upper()} ({sentiment['score']:.2f}): {article['title'][:50]}...")
+                    
+                except Exception as e:
+                    print(f"❌ Error analyzing article {idx}: {str(e)}")
+                    # Add article without sentiment
+                    analyzed_articles.append(article)
+            
+            return analyzed_articles
+        finally:
+            if self.cache:
+                self.cache.flush()
+            if self.keyword_stats:
+                self.keyword_stats.save()
+    
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a process that is running scraper threads can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.backend, self.mode, self.token_budget, self.paragraph_scores,
+                              self.keyword_ranking, self.update_keyword_stats),
+                )
+            return self._pool
+    
+    def _cached_analysis(self, cleaned_text):
+        """Sentiment and keywords for cleaned_text if its sentiment and terms are cached, else None"""
+        sentiment = self.cache.get('sentiment', cleaned_text)
+        if sentiment is None:
+            return None
+        terms = self.cache.get(TERMS_KIND, cleaned_text)
+        if terms is None:
+            return None
+        return {'sentiment': sentiment, 'keywords': self.rank_keywords(Counter(terms))}
+    
+    def _parallel_analyze(self, articles, verbose=True):
+        """batch_analyze on the process pool; results keep the input order.
+        
+        The cache is only read and written here, in the parent process; the
+        workers just score the articles that missed it. Paragraph mode
+        skips the cache here, since its keys need the segments cleaned first.
+        """
+        results = [None] * len(articles)
+        cleaned = {}
+        use_cache = self.cache and self.mode == 'document'
+        for idx, article in enumerate(articles):
+            if use_cache:
+                cleaned[idx] = self.clean_text(self.text_to_analyze(article))
+                analysis = self._cached_analysis(cleaned[idx])
+                if analysis is not None:
+                    results[idx] = (analysis, None)
+        
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        texts = [{field: articles[idx].get(field, '') for field in TEXT_FIELDS} for idx in pending]
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        
+        scored = []
+        for chunk_results in self._get_pool().map(_analyze_chunk, chunks):
+            scored.extend(chunk_results)
         
-        analyzed_articles = []
+        for idx, (analysis, error) in zip(pending, scored):
+            results[idx] = (analysis, error)
+            for terms in (analysis or {}).pop('terms', None) or []:
+                self.keyword_stats.update(terms)
+            if use_cache and error is None:
+                self.cache.put('sentiment', cleaned[idx], analysis['sentiment'])
+                self.cache.put(TERMS_KIND, cleaned[idx],
+                               self._count_terms(PreparedText(cleaned[idx], cleaned[idx].split())))
+        
+        return self._apply_results(articles, results, verbose)
+    
+    def _vectorized_analyze(self, articles):
+        """Score a batch with the BatchVaderScorer; one (analysis, error) pair per article"""
+        results = [None] * len(articles)
+        prepared = {}
         for idx, article in enumerate(articles):
             try:
-                analyzed_article = self.analyze_article(article)
-                analyzed_articles.append(analyzed_article)
-                
-                sentiment = analyzed_article['sentiment']
-                print(f"✅ [{idx+1}] {sentiment['label'].upper()} ({sentiment['score']:.2f}): {article['title'][:50]}...")
-                
+                prepared[idx] = self.prepare_text(self.text_to_analyze(article))
+            except Exception as e:
+                results[idx] = (None, str(e))
+        
+        sentiments = {}
+        for idx, text in prepared.items():
+            cached = self.cache.get('sentiment', text.cleaned) if self.cache else None
+            if cached is not None:
+                sentiments[idx] = cached
+        pending = [idx for idx in prepared if idx not in sentiments]
+        
+        try:
+            scores = self.batch_scorer.score(
+                [[token for token in prepared[idx].tokens if len(token) > 1] for idx in pending],
+                [prepared[idx].cleaned for idx in pending],
+            )
+        except Exception as e:
+            print(f"⚠️  Vectorized scoring failed ({str(e)}), scoring articles one by one")
+            scores = [None] * len(pending)
+        
+        for idx, score in zip(pending, scores):
+            try:
+                sentiments[idx] = self.sentiment_from_scores(score or self.polarity_scores(prepared[idx]))
+                if self.cache:
+                    self.cache.put('sentiment', prepared[idx].cleaned, sentiments[idx])
             except Exception as e:
-                print(f"❌ Error analyzing article {idx}: {str(e)}")
-                # Add article without sentiment
-                analyzed_articles.append(article)
+                results[idx] = (None, str(e))
         
-        return analyzed_articles
+        for idx, sentiment in sentiments.items():
+            keywords = self.extract_keywords(None, prepared=prepared[idx])
+            results[idx] = (self._with_terms({'sentiment': sentiment, 'keywords': keywords}), None)
+        return results
+    
+    def _with_terms(self, analysis):
+        """In a worker process, attach the terms the keyword stats queued for this article"""
+        if self.keyword_stats and self.keyword_stats.read_only:
+            analysis['terms'] = self.keyword_stats.take_pending()
+        return analysis
+    
+    def _apply_results(self, articles, results, verbose=True):
+        """Merge (analysis, error) pairs into the articles, reporting each one"""
+        for idx, (article, (analysis, error)) in enumerate(zip(articles, results)):
+            if error is not None:
+                print(f"❌ Error analyzing article {idx}: {error}")
+                continue
+            article.update(analysis)
+            if not analysis.get('analyzerVersion'):
+                article['analyzerVersion'] = self.version
+            if not verbose:
+                continue
+            sentiment = article['sentiment']
+            print(f"✅ [{idx+1}] {sentiment['label'].upper()} ({sentiment['score']:.2f}): {article['title'][:50]}...")
+        
+        return articles
+    
+    def reset_stats(self):
+        if self.cache:
+            self.cache.reset_stats()
+        self.service_stats = {'requests': 0, 'articles': 0, 'latency': 0.0, 'fallbacks': 0}
+    
+    def report(self):
+        """Print sentiment cache hit rates and sentiment service use"""
+        if self.cache:
+            self.cache.report()
+        stats = self.service_stats
+        if stats['requests'] or stats['fallbacks']:
+            latency = stats['latency'] / stats['requests'] * 1000 if stats['requests'] else 0.0
+            print(f"🛰️  Sentiment service: {stats['articles']} articles in {stats['requests']} requests "
+                  f"({latency:.1f} ms avg), {stats['fallbacks']} fallbacks to in-process scoring")
+    
+    def _stop_pool(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def close(self):
+        """Stop the worker processes, save the keyword statistics and close the cache"""
+        self._stop_pool()
+        if self._service_session is not None:
+            self._service_session.close()
+        if self.keyword_stats:
+            self.keyword_stats.save()
+        if self.cache:
+            self.cache.close()
+            self.cache = None
 
 # Test the analyzer
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'sentiment_cache.sqlite3')
+
+
+def cache_enabled():
+    """The sentiment cache is used unless SENTIMENT_CACHE=0"""
+    return os.getenv('SENTIMENT_CACHE', '1') != '0'
+
+
+class SentimentCache:
+    def __init__(self, version, path=None, max_entries=None):
+        """On-disk memo of analyzer results keyed by a hash of the cleaned text.
+
+        Keys are 16-byte BLAKE2b digests of (version, kind, text), so bumping
+        the analyzer version invalidates every old result without a migration,
+        and values are compact JSON. Entries are evicted least-recently-used
+        once there are more than max_entries (SENTIMENT_CACHE_MAX_ENTRIES,
+        default 50000). Writes are committed by flush().
+        """
+        self.version = version
+        self.path = path or os.getenv('SENTIMENT_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries or int(os.getenv('SENTIMENT_CACHE_MAX_ENTRIES', '50000'))
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key BLOB PRIMARY KEY,
+                value TEXT NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.conn.commit()
+        self.count = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {}
+        self.evictions = 0
+
+    def _key(self, kind, text):
+        data = f"{self.version}\0{kind}\0{text}".encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _record(self, kind, hit):
+        counts = self.stats.setdefault(kind, {'hits': 0, 'misses': 0})
+        counts['hits' if hit else 'misses'] += 1
+
+    def get(self, kind, text):
+        """Return the stored result for (kind, text), or None"""
+        key = self._key(kind, text)
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            self._record(kind, row is not None)
+            if row is None:
+                return None
+            self.conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, kind, text, value):
+        key = self._key(kind, text)
+        with self._lock:
+            exists = self.conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value, separators=(',', ':')), time.time()),
+            )
+            if not exists:
+                self.count += 1
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries beyond max_entries (lock held)"""
+        excess = self.count - self.max_entries
+        if excess <= 0:
+            return
+        # Evict an extra 10% so eviction doesn't run on every insert once full
+        excess += self.max_entries // 10
+        deleted = self.conn.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+        ).rowcount
+        self.count -= deleted
+        self.evictions += deleted
+
+    def flush(self):
+        """Commit pending results and last-used times"""
+        with self._lock:
+            self.conn.commit()
+
+    def report(self):
+        """Print per-kind hit rates since the last reset_stats()"""
+        if not self.stats:
+            return
+        parts = []
+        for kind, counts in sorted(self.stats.items()):
+            total = counts['hits'] + counts['misses']
+            parts.append(f"{kind} {counts['hits']}/{total} hits ({counts['hits'] / total:.0%})")
+        print(f"🧠 Sentiment cache: {', '.join(parts)}, {self.evictions} evictions, {self.count} entries")
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,228 @@
+"""Shared, warm sentiment analysis service for several scraper processes on one node.
+
+Usage (from the scraper/ directory):
+    python sentiment_service.py                          # http://127.0.0.1:8765
+    python sentiment_service.py --port 9000 --window-ms 20 --max-batch 128
+
+Then start the scrapers with SENTIMENT_SERVICE_URL=http://127.0.0.1:8765.
+Their SentimentAnalyzer sends the title/description/content of each batch
+to the service instead of loading NLTK itself, and falls back to scoring
+in-process while the service is unreachable.
+
+The service runs one SentimentAnalyzer (configured by the usual SENTIMENT_*
+and KEYWORD_* variables, with its cache and keyword statistics). Requests
+arriving within window_ms of each other are merged into one batch_analyze
+call of at most max_batch articles.
+
+    POST /analyze   {"articles": [{"title": ..., "description": ..., "content": ...}, ...]}
+                    -> {"results": [[analysis or null, error or null], ...], "version": ...}
+    GET  /metrics   request/batch counters, batch sizes and latency percentiles
+    GET  /health    {"ok": true, "version": ...}
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from sentiment_analyzer import SentimentAnalyzer, TEXT_FIELDS
+
+DEFAULT_PORT = 8765
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class _Request:
+    def __init__(self, articles):
+        self.articles = articles
+        self.results = None
+        self.received = time.perf_counter()
+        self.done = threading.Event()
+
+
+class SentimentService(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, analyzer=None, host='127.0.0.1', port=None, window_ms=None, max_batch=None):
+        """Localhost HTTP server scoring requests in time-window batches with one warm analyzer.
+
+        Handler threads only queue requests; a single batcher thread waits
+        window_ms (SENTIMENT_SERVICE_WINDOW_MS, default 10) after the first
+        queued request for more to arrive, up to max_batch articles
+        (SENTIMENT_SERVICE_MAX_BATCH, default 64), and scores them together.
+        """
+        if port is None:
+            port = int(os.getenv('SENTIMENT_SERVICE_PORT', str(DEFAULT_PORT)))
+        super().__init__((host, port), _ServiceHandler)
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.window = (window_ms if window_ms is not None
+                       else float(os.getenv('SENTIMENT_SERVICE_WINDOW_MS', '10'))) / 1000
+        self.max_batch = max_batch or int(os.getenv('SENTIMENT_SERVICE_MAX_BATCH', '64'))
+        self.requests = queue.Queue()
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'articles': 0, 'batches': 0, 'errors': 0, 'max_batch_size': 0}
+        # Most recent request latencies (seconds) and batch sizes, for percentiles
+        self.latencies = deque(maxlen=2000)
+        self.batch_sizes = deque(maxlen=2000)
+        self._batcher = threading.Thread(target=self._run_batches, name='sentiment-batcher', daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Warm the analyzer, then serve in a background thread"""
+        self.analyzer.warm_up()
+        self._batcher.start()
+        thread = threading.Thread(target=self.serve_forever, name='sentiment-service', daemon=True)
+        thread.start()
+        return thread
+
+    def submit(self, articles):
+        """Queue a request's articles and wait for their (analysis, error) pairs"""
+        request = _Request(articles)
+        self.requests.put(request)
+        request.done.wait()
+        latency = time.perf_counter() - request.received
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['articles'] += len(articles)
+            self.latencies.append(latency)
+        return request.results
+
+    def _run_batches(self):
+        while True:
+            pending = [self.requests.get()]
+            size = len(pending[0].articles)
+            deadline = time.perf_counter() + self.window
+            while size < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(request)
+                size += len(request.articles)
+            self._score(pending, size)
+
+    def _score(self, pending, size):
+        articles = [dict(article) for request in pending for article in request.articles]
+        try:
+            self.analyzer.batch_analyze(articles, verbose=False)
+            results = []
+            for article in articles:
+                if 'sentiment' in article:
+                    results.append(({'sentiment': article['sentiment'], 'keywords': article.get('keywords', []),
+                                     'analyzerVersion': article.get('analyzerVersion')}, None))
+                else:
+                    results.append((None, 'analysis failed'))
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            results = [(None, str(e))] * len(articles)
+
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['max_batch_size'] = max(self.stats['max_batch_size'], size)
+            self.batch_sizes.append(size)
+        offset = 0
+        for request in pending:
+            request.results = results[offset:offset + len(request.articles)]
+            offset += len(request.articles)
+            request.done.set()
+
+    def metrics(self):
+        with self._lock:
+            latencies = list(self.latencies)
+            sizes = list(self.batch_sizes)
+            metrics = dict(self.stats)
+        metrics.update({
+            'version': self.analyzer.version,
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'queued': self.requests.qsize(),
+            'window_ms': self.window * 1000,
+            'mean_batch_size': round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+            'latency_ms': {name: round(percentile(latencies, fraction) * 1000, 2)
+                           for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))},
+        })
+        return metrics
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.metrics())
+        elif self.path == '/health':
+            self._send_json(200, {'ok': True, 'version': self.server.analyzer.version})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/analyze':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            articles = [{field: str(article.get(field) or '') for field in TEXT_FIELDS}
+                        for article in payload['articles']]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send_json(400, {'error': f'bad request: {e}'})
+            return
+        results = self.server.submit(articles) if articles else []
+        self._send_json(200, {'results': results, 'version': self.server.analyzer.version})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=os.getenv('SENTIMENT_SERVICE_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--window-ms', type=float, default=None, help='batching window after the first request')
+    parser.add_argument('--max-batch', type=int, default=None, help='most articles scored in one batch')
+    args = parser.parse_args()
+
+    # The service itself must score in-process, never call another service
+    analyzer = SentimentAnalyzer(service_url='')
+    server = SentimentService(analyzer, host=args.host, port=args.port,
+                              window_ms=args.window_ms, max_batch=args.max_batch)
+    server.start()
+    print(f"🛰️  Sentiment service ({analyzer.version}) listening on {server.url} "
+          f"(export SENTIMENT_SERVICE_URL={server.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n⏹️  Sentiment service stopped")
+    finally:
+        server.shutdown()
+        server.server_close()
+        analyzer.close()
+
+
+if __name__ == "__main__":
+    main()
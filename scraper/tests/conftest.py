@@ -0,0 +1,27 @@
+"""Shared fixtures for the scraper tests.
+
+Run from the scraper/ directory with the NLTK data installed
+(vader_lexicon and stopwords, as the scraper itself needs):
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Never read or write the local caches and keyword statistics of real runs
+os.environ['SENTIMENT_CACHE'] = '0'
+os.environ['KEYWORD_DF_PATH'] = ''
+
+from sentiment_analyzer import SentimentAnalyzer
+
+
+@pytest.fixture(scope='session')
+def analyzer():
+    """In-process analyzer with plain frequency keywords, so results don't depend on earlier articles"""
+    analyzer = SentimentAnalyzer(workers=1, use_cache=False, backend='nltk',
+                                 keyword_ranking='frequency', service_url='')
+    analyzer.warm_up()
+    yield analyzer
+    analyzer.close()
@@ -0,0 +1,88 @@
+"""Shared preprocessing (PreparedText) and the pre-tokenized polarity_scores.
+
+Every text has its cleaned form, keywords and VADER scores pinned, so a change
+to clean_text, the keyword filter or the lexicon shows up here. The scores
+must also stay equal to NLTK's own polarity_scores on the cleaned text, which
+is what analyze_article computed before the text was tokenized only once.
+"""
+import pytest
+
+CASES = [
+    ("This is wonderful news! Amazing breakthrough in technology.",
+     "This is wonderful news Amazing breakthrough in technology",
+     ['wonderful', 'news', 'amazing', 'breakthrough', 'technology'],
+     {'neg': 0.0, 'neu': 0.444, 'pos': 0.556, 'compound': 0.8176}),
+    ("Terrible disaster strikes the city, causing massive damage.",
+     "Terrible disaster strikes the city causing massive damage",
+     ['terrible', 'disaster', 'strikes', 'city', 'causing'],
+     {'neg': 0.763, 'neu': 0.237, 'pos': 0.0, 'compound': -0.9169}),
+    ("The meeting was held yesterday to discuss the budget.",
+     "The meeting was held yesterday to discuss the budget",
+     ['meeting', 'held', 'yesterday', 'discuss', 'budget'],
+     {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}),
+    ("We cannot accept this. They're gonna win, gotta see it, wanna go? Gimme a break, lemme think.",
+     "We cannot accept this They re gonna win gotta see it wanna go Gimme a break lemme think",
+     ['accept', 'break', 'think'],
+     {'neg': 0.104, 'neu': 0.715, 'pos': 0.181, 'compound': 0.3851}),
+    ("Read more at https://www.bbc.com/news/articles/c123?at=rss or www.ndtv.com/latest...http://x.y",
+     "Read more at or",
+     ['read'],
+     {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}),
+    ("It was kind of good, kind of bad; VERY good, very GOOD, extremely bad but not terrible.",
+     "It was kind of good kind of bad VERY good very GOOD extremely bad but not terrible",
+     ['good', 'kind', 'extremely', 'terrible'],
+     {'neg': 0.177, 'neu': 0.434, 'pos': 0.389, 'compound': 0.6556}),
+    ("good good good bad good bad bad not good never bad",
+     "good good good bad good bad bad not good never bad",
+     ['good', 'never'],
+     {'neg': 0.459, 'neu': 0.066, 'pos': 0.475, 'compound': -0.128}),
+    ("Ünïcödé café naïve résumé — “quoted” ‘text’ İstanbul straße ﬁnance",
+     "Ünïcödé café naïve résumé quoted text İstanbul straße ﬁnance",
+     ['ünïcödé', 'café', 'naïve', 'résumé', 'quoted'],
+     {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}),
+    ("snake_case words_with_underscores and 123 numbers 4th 2024-01-01 $100 50%",
+     "snake_case words_with_underscores and 123 numbers 4th 2024 01 01 100 50",
+     ['numbers'],
+     {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}),
+    ("The minister said: 'no comment'. Without doubt, the plan isn't perfect... but it works!!!",
+     "The minister said no comment Without doubt the plan isn t perfect but it works",
+     ['minister', 'said', 'comment', 'without', 'doubt'],
+     {'neg': 0.097, 'neu': 0.666, 'pos': 0.237, 'compound': 0.3193}),
+    ("   ", "", [], {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}),
+    ("a b c d e f", "a b c d e f", [], {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}),
+]
+
+
+@pytest.mark.parametrize('text, cleaned, keywords, scores', CASES)
+def test_prepared_text(analyzer, text, cleaned, keywords, scores):
+    prepared = analyzer.prepare_text(text)
+    assert prepared.cleaned == cleaned
+    assert prepared.tokens == cleaned.split()
+    assert analyzer.extract_keywords(text, prepared=prepared) == keywords
+    assert analyzer.polarity_scores(prepared) == scores
+
+
+@pytest.mark.parametrize('text', [case[0] for case in CASES])
+def test_polarity_scores_match_nltk(analyzer, text):
+    prepared = analyzer.prepare_text(text)
+    assert analyzer.polarity_scores(prepared) == analyzer.sia.polarity_scores(prepared.cleaned)
+
+
+def test_repeated_words_score_at_first_position(analyzer):
+    # VADER looks each word up by its first occurrence; the first-occurrence map must do the same
+    text = ' '.join(case[0] for case in CASES) * 3
+    prepared = analyzer.prepare_text(text)
+    assert analyzer.polarity_scores(prepared) == analyzer.sia.polarity_scores(prepared.cleaned)
+
+
+def test_analyze_sentiment_labels(analyzer):
+    assert analyzer.analyze_sentiment(CASES[0][0])['label'] == 'positive'
+    assert analyzer.analyze_sentiment(CASES[1][0])['label'] == 'negative'
+    assert analyzer.analyze_sentiment(CASES[2][0])['label'] == 'neutral'
+
+
+def test_empty_text(analyzer):
+    assert analyzer.prepare_text('').cleaned == ''
+    assert analyzer.prepare_text(None).tokens == []
+    assert analyzer.extract_keywords('') == []
+    assert analyzer.analyze_sentiment('')['label'] == 'neutral'
@@ -0,0 +1,161 @@
+"""Per-source counters (article_stats) through explicit deletes and TTL expiry.
+
+delete_old_articles subtracts exactly what it deletes; articles the TTL index
+removes are subtracted by expire_counters from the hourly rollups, with the
+expiry marker's credit covering an hour that was already split by a delete.
+After each step the counters must equal what the stored articles add up to.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from db_handler import DatabaseHandler, floor_hour
+
+SOURCES = ('BBC', 'NDTV')
+# (label, score); None is an article that was stored without a sentiment
+SENTIMENTS = (('positive', 0.5), ('negative', -0.25), ('neutral', 0.0), None, ('positive', 0.75))
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.delenv('ARTICLE_RETENTION_DAYS', raising=False)
+    db = DatabaseHandler(db_name='test_counters', client=mongomock.MongoClient())
+    yield db
+    db.close_connection()
+
+
+def make_articles(times):
+    articles = []
+    for i, scraped_at in enumerate(times):
+        article = {'url': f'https://example.com/{i}', 'title': f'Article {i}',
+                   'source': SOURCES[i % len(SOURCES)], 'scrapedAt': scraped_at}
+        sentiment = SENTIMENTS[i % len(SENTIMENTS)]
+        if sentiment:
+            article['sentiment'] = {'label': sentiment[0], 'score': sentiment[1]}
+        articles.append(article)
+    return articles
+
+
+def article_times(now, days, dense_around=()):
+    """One article every 50 minutes over the last `days` days, plus one every
+    7 minutes for two hours either side of each dense_around time (never
+    within 3 minutes of it), so the hour holding that time is split"""
+    times = [now - timedelta(minutes=50 * i) for i in range(1, int(days * 24 * 60 / 50))]
+    for moment in dense_around:
+        times += [moment + timedelta(minutes=7 * k + 3.5) for k in range(-18, 17)]
+    return times
+
+
+def counters(db):
+    """{source: (count, scoreSum, {label: (count, scoreSum)})}, leaving out emptied counters"""
+    result = {}
+    for doc in db.stats.find():
+        labels = {label: (c['count'], c['scoreSum']) for label, c in (doc.get('labels') or {}).items() if c['count']}
+        if doc['count'] or labels:
+            result[doc['_id']] = (doc['count'], doc['scoreSum'], labels)
+    return result
+
+
+def expected_counters(db):
+    """The same shape, added up from the stored articles"""
+    result = {}
+    for article in db.articles.find():
+        count, score_sum, labels = result.get(article['source'], (0, 0.0, {}))
+        sentiment = article.get('sentiment') or {}
+        score = sentiment.get('score') or 0.0
+        if sentiment.get('label'):
+            label_count, label_sum = labels.get(sentiment['label'], (0, 0.0))
+            labels[sentiment['label']] = (label_count + 1, label_sum + score)
+        result[article['source']] = (count + 1, score_sum + score, labels)
+    return result
+
+
+def enable_retention(db, days=30):
+    """Turn the TTL index on, which pins the expiry marker at the oldest stored
+    article; mongomock never deletes anything itself, the tests do that"""
+    db.retention_days = days
+    db.setup_retention()
+
+
+def days_until(now, cutoff):
+    """delete_old_articles(days) argument whose cutoff is `cutoff`"""
+    return (now - cutoff).total_seconds() / 86400
+
+
+def assert_exact(db):
+    assert counters(db) == expected_counters(db)
+
+
+def stored_on_both_sides(db, cutoff):
+    hour = floor_hour(cutoff)
+    before = db.articles.count_documents({'scrapedAt': {'$gte': hour, '$lt': cutoff}})
+    after = db.articles.count_documents({'scrapedAt': {'$gte': cutoff, '$lt': hour + timedelta(hours=1)}})
+    return before > 0 and after > 0
+
+
+def test_insert_counts_every_article(db):
+    db.insert_articles(make_articles(article_times(datetime.utcnow(), 3)))
+    assert_exact(db)
+
+
+def test_delete_old_articles_then_ttl(db):
+    now = datetime.utcnow()
+    delete_cutoff = floor_hour(now - timedelta(days=10)) + timedelta(minutes=30)
+    db.insert_articles(make_articles(article_times(now, 20, dense_around=[delete_cutoff])))
+    assert stored_on_both_sides(db, delete_cutoff)
+    enable_retention(db)
+
+    hour = floor_hour(delete_cutoff)
+    bucket = sum(doc['count'] for doc in db.rollups.find({'resolution': 'hour', 'start': hour}))
+    assert db.delete_old_articles(days_until(datetime.utcnow(), delete_cutoff)) > 0
+    # The cutoff hour is split: part of its bucket is gone, part still counted
+    left = db.articles.count_documents({'scrapedAt': {'$gte': hour, '$lt': hour + timedelta(hours=1)}})
+    assert 0 < left < bucket
+    assert_exact(db)
+
+    # The TTL index then removes everything up to a later hour
+    until = floor_hour(now - timedelta(days=6))
+    db.articles.delete_many({'scrapedAt': {'$lt': until}})
+    db.expire_counters(until=until)
+    assert_exact(db)
+
+
+def test_ttl_split_hour_then_delete_old_articles(db):
+    now = datetime.utcnow()
+    ttl_cutoff = floor_hour(now - timedelta(days=12)) + timedelta(minutes=25)
+    db.insert_articles(make_articles(article_times(now, 20, dense_around=[ttl_cutoff])))
+    assert stored_on_both_sides(db, ttl_cutoff)
+    enable_retention(db)
+
+    # The TTL monitor deletes part of an hour; only whole hours are expired,
+    # so the counters still hold the articles deleted from that hour
+    split = db.articles.count_documents({'scrapedAt': {'$gte': floor_hour(ttl_cutoff), '$lt': ttl_cutoff}})
+    db.articles.delete_many({'scrapedAt': {'$lt': ttl_cutoff}})
+    db.expire_counters(until=floor_hour(ttl_cutoff))
+    counted = sum(count for count, _, _ in counters(db).values())
+    assert counted == db.articles.count_documents({}) + split
+
+    # Once the TTL monitor is past the whole hour, the rest of its bucket goes too
+    next_hour = floor_hour(ttl_cutoff) + timedelta(hours=1)
+    db.articles.delete_many({'scrapedAt': {'$lt': next_hour}})
+    db.expire_counters(until=next_hour)
+    assert_exact(db)
+
+    db.delete_old_articles(8)
+    assert_exact(db)
+
+    until = floor_hour(now - timedelta(days=5))
+    db.articles.delete_many({'scrapedAt': {'$lt': until}})
+    db.expire_counters(until=until)
+    assert_exact(db)
+
+
+def test_rebuild_stats_matches(db):
+    now = datetime.utcnow()
+    db.insert_articles(make_articles(article_times(now, 10)))
+    db.delete_old_articles(4)
+    before = counters(db)
+    db.rebuild_stats()
+    assert counters(db) == before == expected_counters(db)
@@ -0,0 +1,87 @@
+"""BatchVaderScorer conformance: the vectorized scores equal NLTK's VADER.
+
+Each text exercises one of the rules the scorer reimplements as array
+operations (negation, boosters, "never so", "least", "but", "kind of",
+idioms, ALL CAPS, repeated words) and has its expected scores pinned.
+"""
+import pytest
+
+pytest.importorskip('numpy')
+
+from tests.test_preprocessing import CASES as PREPROCESSING_CASES
+from vader_batch import BatchVaderScorer
+
+CASES = [
+    ("The results were not good at all",
+     {'neg': 0.286, 'neu': 0.714, 'pos': 0.0, 'compound': -0.3412}),
+    ("The food was never so bad and the service was extremely slow",
+     {'neg': 0.362, 'neu': 0.638, 'pos': 0.0, 'compound': -0.804}),
+    ("It is the least helpful thing but the staff were very kind",
+     {'neg': 0.1, 'neu': 0.599, 'pos': 0.302, 'compound': 0.6568}),
+    ("The new policy is kind of disappointing and sort of confusing",
+     {'neg': 0.387, 'neu': 0.613, 'pos': 0.0, 'compound': -0.6894}),
+    ("That movie was the bomb and the soundtrack was to die for",
+     {'neg': 0.218, 'neu': 0.559, 'pos': 0.223, 'compound': 0.0258}),
+    ("Yeah right that plan will work",
+     {'neg': 0.0, 'neu': 0.694, 'pos': 0.306, 'compound': 0.296}),
+    ("The team did not cut the mustard this season",
+     {'neg': 0.0, 'neu': 0.727, 'pos': 0.273, 'compound': 0.4588}),
+    ("GREAT news for investors but TERRIBLE for the rest of us",
+     {'neg': 0.306, 'neu': 0.524, 'pos': 0.17, 'compound': -0.516}),
+    ("Prices barely rose and growth was slightly positive",
+     {'neg': 0.0, 'neu': 0.515, 'pos': 0.485, 'compound': 0.6852}),
+    ("without doubt the best and the worst of times best best worst",
+     {'neg': 0.693, 'neu': 0.227, 'pos': 0.08, 'compound': -0.9531}),
+    ("He isnt happy and she dont care",
+     {'neg': 0.529, 'neu': 0.471, 'pos': 0.0, 'compound': -0.6834}),
+    ("No no no this is not acceptable",
+     {'neg': 0.741, 'neu': 0.259, 'pos': 0.0, 'compound': -0.7623}),
+    ("The ceremony was held at the town hall on Monday",
+     {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}),
+]
+
+# Same tolerance as benchmarks/bench_vader.py; VADER rounds to 4 decimals
+TOLERANCE = 1e-3
+
+
+@pytest.fixture(scope='module')
+def scorer(analyzer):
+    return BatchVaderScorer(analyzer.sia)
+
+
+def score(analyzer, scorer, texts):
+    prepared = [analyzer.prepare_text(text) for text in texts]
+    return prepared, scorer.score([[t for t in p.tokens if len(t) > 1] for p in prepared],
+                                  [p.cleaned for p in prepared])
+
+
+def assert_close(got, expected):
+    assert set(got) >= set(expected)
+    for key, value in expected.items():
+        assert got[key] == pytest.approx(value, abs=TOLERANCE), key
+
+
+def test_rule_cases(analyzer, scorer):
+    _, scores = score(analyzer, scorer, [text for text, _ in CASES])
+    for (text, expected), got in zip(CASES, scores):
+        assert_close(got, expected)
+
+
+def test_matches_nltk(analyzer, scorer):
+    texts = [text for text, _ in CASES] + [case[0] for case in PREPROCESSING_CASES]
+    # The whole set again as one long document, for repeated words across rules
+    texts.append(' '.join(texts))
+    prepared, scores = score(analyzer, scorer, texts)
+    for p, got in zip(prepared, scores):
+        assert_close(got, analyzer.sia.polarity_scores(p.cleaned))
+
+
+def test_batch_order_does_not_matter(analyzer, scorer):
+    texts = [text for text, _ in CASES]
+    _, forward = score(analyzer, scorer, texts)
+    _, backward = score(analyzer, scorer, texts[::-1])
+    assert forward == backward[::-1]
+
+
+def test_empty_batch(scorer):
+    assert list(scorer.score([], [])) == []
@@ -0,0 +1,242 @@
+import math
+import numpy as np
+from nltk.sentiment.vader import SentiText
+
+
+def make_sentitext(text, words):
+    """A VADER SentiText for already tokenized text, without re-tokenizing it"""
+    sentitext = SentiText.__new__(SentiText)
+    sentitext.text = text
+    sentitext.words_and_emoticons = words
+    sentitext.is_cap_diff = sentitext.allcap_differential(words)
+    return sentitext
+
+
+class BatchVaderScorer:
+    # Features kept per vocabulary entry (raw token string, case preserved)
+    FEATURES = (
+        'in_lexicon', 'is_booster', 'is_upper', 'negated', 'is_never', 'is_so_this',
+        'is_kind', 'is_of', 'is_least', 'is_at_very', 'is_but', 'idiom_word',
+    )
+
+    def __init__(self, sia, max_vocab=200000):
+        """Scores many tokenized documents at once with VADER's rules as NumPy array operations.
+
+        Tokens are mapped to integer IDs in a vocabulary that stores each
+        token's lexicon valence, booster scalar and the flags VADER's rules
+        test; a batch is encoded into flat ID/position arrays and every rule
+        (caps emphasis, boosters and dampeners, negation, "never so/this",
+        "least", "but") becomes a masked array update.
+
+        Two parts of VADER are not vectorized and are taken from sia itself
+        for the positions they apply to: the idiom/booster-bigram check (only
+        positions whose neighbourhood has two adjacent idiom words) and the
+        lexicon lookup quirk where a repeated word is always scored at its
+        first position in the document, which is reproduced exactly.
+        """
+        self.sia = sia
+        self.constants = sia.constants
+        self.max_vocab = max_vocab
+        self.idiom_words = {
+            word
+            for phrase in list(self.constants.SPECIAL_CASE_IDIOMS) + list(self.constants.BOOSTER_DICT)
+            if ' ' in phrase
+            for word in phrase.split()
+        }
+        self._reset_vocab()
+
+    def _reset_vocab(self):
+        self.vocab = {}
+        self.valence = []
+        self.booster = []
+        self.flags = {name: [] for name in self.FEATURES}
+        self._arrays = None
+
+    def _add_token(self, token):
+        lexicon = self.sia.lexicon
+        boosters = self.constants.BOOSTER_DICT
+        lower = token.lower()
+        self.vocab[token] = len(self.vocab)
+        self.valence.append(lexicon.get(lower, 0.0))
+        self.booster.append(boosters.get(lower, 0.0))
+        values = {
+            'in_lexicon': lower in lexicon,
+            'is_booster': lower in boosters,
+            'is_upper': token.isupper(),
+            'negated': self.constants.negated([token]),
+            'is_never': token == 'never',
+            'is_so_this': token in ('so', 'this'),
+            'is_kind': lower == 'kind',
+            'is_of': lower == 'of',
+            'is_least': lower == 'least',
+            'is_at_very': lower in ('at', 'very'),
+            'is_but': lower == 'but',
+            'idiom_word': token in self.idiom_words,
+        }
+        for name in self.FEATURES:
+            self.flags[name].append(values[name])
+        self._arrays = None
+
+    def _encode(self, documents):
+        """Flat token IDs, document index and in-document position for a batch"""
+        if len(self.vocab) > self.max_vocab:
+            self._reset_vocab()
+        ids, doc_index, lengths = [], [], []
+        for d, words in enumerate(documents):
+            for token in words:
+                if token not in self.vocab:
+                    self._add_token(token)
+                ids.append(self.vocab[token])
+            doc_index.extend([d] * len(words))
+            lengths.append(len(words))
+
+        if self._arrays is None:
+            self._arrays = {name: np.array(values, dtype=bool) for name, values in self.flags.items()}
+            self._arrays['valence'] = np.array(self.valence, dtype=float)
+            self._arrays['booster'] = np.array(self.booster, dtype=float)
+
+        ids = np.array(ids, dtype=np.int64)
+        doc_index = np.array(doc_index, dtype=np.int64)
+        lengths = np.array(lengths, dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else lengths
+        position = np.arange(len(ids)) - starts[doc_index] if len(ids) else ids
+        return ids, doc_index, position, lengths
+
+    def score(self, documents, texts=None):
+        """polarity_scores for each tokenized document (a list of words longer than one character).
+
+        texts are the documents' text, only used for VADER's '!'/'?' emphasis
+        (always zero for cleaned text). Returns one {'neg', 'neu', 'pos',
+        'compound'} dict per document, like polarity_scores.
+        """
+        documents = [list(words) for words in documents]
+        texts = texts or [' '.join(words) for words in documents]
+        ids, doc, pos, lengths = self._encode(documents)
+        n_docs = len(documents)
+        if not len(ids):
+            return [self.sia.score_valence([], text) for text in texts]
+
+        a = self._arrays
+        length = lengths[doc]
+        feature = {name: values[ids] for name, values in a.items()}
+
+        def at(offset, name):
+            """Feature of the token offset positions away, and whether that position exists"""
+            target = pos + offset
+            valid = (target >= 0) & (target < length)
+            index = np.clip(np.arange(len(ids)) + offset, 0, len(ids) - 1)
+            return np.where(valid, a[name][ids[index]], False if a[name].dtype == bool else 0.0), valid
+
+        # ALL CAPS emphasis only counts when some, but not all, words are caps
+        caps = np.bincount(doc, weights=feature['is_upper'], minlength=n_docs)
+        cap_diff = ((caps > 0) & (caps < lengths))[doc]
+
+        next_of, _ = at(1, 'is_of')
+        neutral = feature['is_booster'] | (feature['is_kind'] & next_of)
+        scored = feature['in_lexicon'] & ~neutral
+
+        v = feature['valence'].copy()
+        emphasis = feature['is_upper'] & cap_diff
+        v = np.where(emphasis, np.where(v > 0, v + self.constants.C_INCR, v - self.constants.C_INCR), v)
+
+        fallback = np.zeros(len(ids), dtype=bool)
+        for start_i, damp in ((0, 1.0), (1, 0.95), (2, 0.9)):
+            offset = -(start_i + 1)
+            prev_in_lexicon, valid = at(offset, 'in_lexicon')
+            applies = valid & ~prev_in_lexicon
+
+            # Booster/dampener before the word (scalar_inc_dec)
+            booster, _ = at(offset, 'booster')
+            is_booster, _ = at(offset, 'is_booster')
+            prev_upper, _ = at(offset, 'is_upper')
+            scalar = np.where(v < 0, -booster, booster)
+            caps_boost = is_booster & prev_upper & cap_diff
+            scalar = np.where(caps_boost, np.where(v > 0, scalar + self.constants.C_INCR,
+                                                   scalar - self.constants.C_INCR), scalar)
+            v = np.where(applies, v + scalar * damp, v)
+
+            # Negation and "never so/this" (_never_check)
+            negated, _ = at(offset, 'negated')
+            if start_i == 0:
+                factor = np.where(negated, self.constants.N_SCALAR, 1.0)
+            elif start_i == 1:
+                never2, _ = at(-2, 'is_never')
+                so1, _ = at(-1, 'is_so_this')
+                factor = np.where(never2 & so1, 1.5, np.where(negated, self.constants.N_SCALAR, 1.0))
+            else:
+                never3, _ = at(-3, 'is_never')
+                so2, _ = at(-2, 'is_so_this')
+                so1, _ = at(-1, 'is_so_this')
+                factor = np.where((never3 & so2) | so1, 1.25, np.where(negated, self.constants.N_SCALAR, 1.0))
+                # _idioms_check needs two adjacent idiom words among positions -3..+2
+                pair = np.zeros(len(ids), dtype=bool)
+                for k in range(-3, 2):
+                    first, _ = at(k, 'idiom_word')
+                    second, _ = at(k + 1, 'idiom_word')
+                    pair |= first & second
+                fallback = applies & pair
+            v = np.where(applies, v * factor, v)
+
+        # "least" before the word (_least_check)
+        prev_least, _ = at(-1, 'is_least')
+        prev_in_lexicon, _ = at(-1, 'in_lexicon')
+        before_at_very, has_two_before = at(-2, 'is_at_very')
+        least = prev_least & ~prev_in_lexicon & ~(has_two_before & before_at_very)
+        v = np.where(least, v * self.constants.N_SCALAR, v)
+
+        v = np.where(scored, v, 0.0)
+        for flat in np.flatnonzero(scored & fallback):
+            d = doc[flat]
+            words = documents[d]
+            i = int(pos[flat])
+            v[flat] = self.sia.sentiment_valence(0, make_sentitext(texts[d], words), words[i], i, [])[0]
+
+        # VADER looks each word up with list.index(), i.e. at its first position in the document
+        _, first, inverse = np.unique(doc * len(self.vocab) + ids, return_index=True, return_inverse=True)
+        sentiments = v[first[inverse.reshape(-1)]]
+
+        # "but": halve everything before the first one, boost everything after it (_but_check)
+        but_pos = np.full(n_docs, -1, dtype=np.int64)
+        buts = np.flatnonzero(feature['is_but'])
+        if len(buts):
+            but_docs = doc[buts]
+            first_but = np.unique(but_docs, return_index=True)[1]
+            but_pos[but_docs[first_but]] = pos[buts[first_but]]
+        has_but = but_pos[doc] >= 0
+        sentiments = np.where(has_but & (pos < but_pos[doc]), sentiments * 0.5, sentiments)
+        sentiments = np.where(has_but & (pos > but_pos[doc]), sentiments * 1.5, sentiments)
+
+        totals = np.bincount(doc, weights=sentiments, minlength=n_docs)
+        pos_sums = np.bincount(doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_docs)
+        neg_sums = np.bincount(doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_docs)
+        neu_counts = np.bincount(doc, weights=(sentiments == 0), minlength=n_docs)
+
+        results = []
+        for d in range(n_docs):
+            if not lengths[d]:
+                results.append(self.sia.score_valence([], texts[d]))
+                continue
+            results.append(self._finish(float(totals[d]), float(pos_sums[d]), float(neg_sums[d]),
+                                        float(neu_counts[d]), texts[d]))
+        return results
+
+    def _finish(self, sum_s, pos_sum, neg_sum, neu_count, text):
+        """The tail of score_valence, from the per-document sums"""
+        amplifier = self.sia._punctuation_emphasis(sum_s, text)
+        if sum_s > 0:
+            sum_s += amplifier
+        elif sum_s < 0:
+            sum_s -= amplifier
+        compound = self.constants.normalize(sum_s)
+
+        if pos_sum > math.fabs(neg_sum):
+            pos_sum += amplifier
+        elif pos_sum < math.fabs(neg_sum):
+            neg_sum -= amplifier
+        total = pos_sum + math.fabs(neg_sum) + neu_count
+        return {
+            "neg": round(math.fabs(neg_sum / total), 3),
+            "neu": round(math.fabs(neu_count / total), 3),
+            "pos": round(math.fabs(pos_sum / total), 3),
+            "compound": round(compound, 4),
+        }